@@ -0,0 +1,87 @@
+""" Result cache benchmark.
+
+Measures handling of a batch of calls to a read method with repeated
+params, without cache, with results cached in TTLCache and with encoded
+results cached in EncodedResultCache and SQLiteCache, and with identical
+calls deduplicated by the manager.
+
+Usage: python benchmarks/bench_cache.py [batch_size]
+
+"""
+from __future__ import print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from jsonrpc.cache import EncodedResultCache, SQLiteCache, TTLCache  # noqa
+from jsonrpc.dispatcher import Dispatcher  # noqa
+from jsonrpc.jsonrpc2 import JSONRPC20Request  # noqa
+from jsonrpc.manager import JSONRPCResponseManager  # noqa
+
+# Reference data, which is read by many clients.
+COUNTRIES = [
+    {"code": "C{0:03d}".format(i), "name": "Country {0}".format(i),
+     "population": i * 1000, "tags": ["a", "b", "c"]}
+    for i in range(50)
+]
+
+
+def get_countries(region):
+    return [dict(country, region=region) for country in COUNTRIES]
+
+
+def make_batch(size):
+    return JSONRPC20Request.from_data([
+        {"jsonrpc": "2.0", "method": "countries", "params": [i % 10],
+         "id": i}
+        for i in range(size)
+    ])
+
+
+def make_dispatcher(cache=None, idempotent=False):
+    dispatcher = Dispatcher()
+    dispatcher.add_method(get_countries, name="countries", cache=cache,
+                          idempotent=idempotent)
+    return dispatcher
+
+
+def handle(batch, dispatcher, **kwargs):
+    return JSONRPCResponseManager.handle_request(
+        batch, dispatcher, **kwargs).encode()
+
+
+def report(name, func, size, repeat=5, number=10):
+    best = min(timeit.repeat(func, repeat=repeat, number=number)) / number
+    print("{0:<32} {1:>10.1f} ms/batch {2:>8.3f} us/element".format(
+        name, best * 1e3, best * 1e6 / size))
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    batch = make_batch(size)
+    print("Batch of {0} calls, 10 distinct params".format(size))
+    report("not cached", lambda: handle(batch, make_dispatcher()), size)
+    report("TTLCache", lambda: handle(
+        batch, make_dispatcher(TTLCache(maxsize=100, ttl=60))), size)
+    report("EncodedResultCache", lambda: handle(
+        batch, make_dispatcher(EncodedResultCache(ttl=60))), size)
+
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "cache.db")
+        report("SQLiteCache", lambda: handle(
+            batch, make_dispatcher(SQLiteCache(path, ttl=60))), size)
+    finally:
+        shutil.rmtree(directory)
+
+    report("deduplicate", lambda: handle(
+        batch, make_dispatcher(idempotent=True), deduplicate=True), size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+""" Params coercion benchmark.
+
+Measures per call cost of converting params according to annotations
+(Dispatcher.add_method(coerce=True)) on top of dispatching the same request
+without coercion.
+
+Usage: python benchmarks/bench_coercion.py [batch_size]
+
+"""
+from __future__ import print_function
+
+import datetime
+import decimal
+import os
+import sys
+import timeit
+import uuid
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from jsonrpc.coercion import compile_coercer  # noqa
+from jsonrpc.dispatcher import Dispatcher  # noqa
+from jsonrpc.jsonrpc2 import JSONRPC20Request  # noqa
+from jsonrpc.manager import JSONRPCResponseManager  # noqa
+
+
+def book(day: datetime.date, amount: decimal.Decimal, guest: uuid.UUID,
+         rooms: List[int]):
+    return None
+
+
+PARAMS = ["2020-01-02", "9.99", "12345678-1234-5678-1234-567812345678",
+          [1, 2, 3]]
+
+
+def make_batch(method, size):
+    return JSONRPC20Request.from_data([
+        {"jsonrpc": "2.0", "method": method, "params": PARAMS, "id": i}
+        for i in range(size)
+    ])
+
+
+def report(name, func, size, repeat=5, number=10):
+    best = min(timeit.repeat(func, repeat=repeat, number=number)) / number
+    print("{0:<32} {1:>10.1f} ms/batch {2:>8.3f} us/element".format(
+        name, best * 1e3, best * 1e6 / size))
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    dispatcher = Dispatcher()
+    dispatcher.add_method(book, name="raw")
+    dispatcher.add_method(book, name="coerced", coerce=True)
+    raw, coerced = make_batch("raw", size), make_batch("coerced", size)
+    coerce = compile_coercer(book)
+    args = tuple(PARAMS)
+
+    print("book(date, Decimal, UUID, List[int]), {0} calls".format(size))
+    report("converters only", lambda: [
+        coerce(args, {}) for _ in range(size)], size)
+    report("handle_request, no coercion", lambda: JSONRPCResponseManager.
+           handle_request(raw, dispatcher), size)
+    report("handle_request, coercion", lambda: JSONRPCResponseManager.
+           handle_request(coerced, dispatcher), size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+""" Response manager benchmark.
+
+Measures per response cost of creating responses in
+JSONRPCResponseManager, which uses unchecked factories
+(JSONRPCBaseResponse._from_result/_from_error), and compares it with creating
+the same responses through validating constructor.
+
+Usage: python benchmarks/bench_manager.py [batch_size]
+
+"""
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from jsonrpc.exceptions import JSONRPCServerError  # noqa
+from jsonrpc.jsonrpc2 import JSONRPC20Request, JSONRPC20Response  # noqa
+from jsonrpc.manager import JSONRPCResponseManager  # noqa
+
+DISPATCHER = {"add": lambda a, b: a + b}
+
+
+def make_batch(size):
+    return JSONRPC20Request.from_data([
+        {"jsonrpc": "2.0", "method": "add", "params": [i, i + 1], "id": i}
+        for i in range(size)
+    ])
+
+
+def validating_results(size):
+    for i in range(size):
+        JSONRPC20Response(result=i, _id=i)
+
+
+def trusted_results(size):
+    for i in range(size):
+        JSONRPC20Response._from_result(i, i)
+
+
+def validating_errors(size):
+    error = JSONRPCServerError(data="data")._data
+    for i in range(size):
+        JSONRPC20Response(error=error, _id=i)
+
+
+def trusted_errors(size):
+    error = JSONRPCServerError(data="data")._data
+    for i in range(size):
+        JSONRPC20Response._from_error(error, i)
+
+
+def report(name, func, size, repeat=5, number=10):
+    best = min(timeit.repeat(func, repeat=repeat, number=number)) / number
+    print("{0:<32} {1:>10.1f} ms/batch {2:>8.3f} us/element".format(
+        name, best * 1e3, best * 1e6 / size))
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    batch = make_batch(size)
+    print("JSONRPC20Response, {0} responses".format(size))
+    report("result: validating constructor",
+           lambda: validating_results(size), size)
+    report("result: trusted factory", lambda: trusted_results(size), size)
+    report("error: validating constructor",
+           lambda: validating_errors(size), size)
+    report("error: trusted factory", lambda: trusted_errors(size), size)
+    report("handle_request(batch)", lambda: JSONRPCResponseManager.
+           handle_request(batch, DISPATCHER), size)
+
+
+if __name__ == "__main__":
+    main()
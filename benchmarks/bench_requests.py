@@ -0,0 +1,56 @@
+""" Request parsing benchmark.
+
+Measures per element cost of JSONRPC20Request.from_data on large batches and
+compares it with creating the same requests through validating constructor.
+
+Usage: python benchmarks/bench_requests.py [batch_size]
+
+"""
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from jsonrpc.jsonrpc2 import JSONRPC20Request  # noqa
+
+
+def make_batch(size):
+    return [
+        {"jsonrpc": "2.0", "method": "add", "params": [i, i + 1], "id": i}
+        for i in range(size)
+    ]
+
+
+def from_data(batch):
+    return JSONRPC20Request.from_data(batch)
+
+
+def from_constructor(batch):
+    return [
+        JSONRPC20Request(
+            method=d["method"], params=d.get("params"), _id=d.get("id"),
+            is_notification="id" not in d)
+        for d in batch
+    ]
+
+
+def report(name, func, batch, repeat=5, number=10):
+    best = min(timeit.repeat(lambda: func(batch), repeat=repeat,
+                             number=number)) / number
+    print("{0:<24} {1:>10.1f} ms/batch {2:>8.3f} us/element".format(
+        name, best * 1e3, best * 1e6 / len(batch)))
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    batch = make_batch(size)
+    print("JSONRPC20Request, batch of {0} elements".format(size))
+    report("from_data", from_data, batch)
+    report("validating constructor", from_constructor, batch)
+
+
+if __name__ == "__main__":
+    main()
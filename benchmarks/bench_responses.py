@@ -0,0 +1,52 @@
+""" Response serialization benchmark.
+
+Compares encoding of a batch response by splicing precomputed message parts
+(JSONRPC20BatchResponse.encode) with encoding the list of response dicts and
+with streaming encoder (JSONRPC20BatchResponse.iter_bytes).
+
+Usage: python benchmarks/bench_responses.py [batch_size]
+
+"""
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from jsonrpc.codec import CODECS, get_codec  # noqa
+from jsonrpc.jsonrpc2 import JSONRPC20BatchResponse, JSONRPC20Response  # noqa
+
+
+def make_batch(size):
+    return JSONRPC20BatchResponse(*[
+        JSONRPC20Response(result={"value": i, "name": "item"}, _id=i)
+        for i in range(size)
+    ])
+
+
+def report(name, func, size, repeat=5, number=10):
+    best = min(timeit.repeat(func, repeat=repeat, number=number)) / number
+    print("{0:<32} {1:>10.1f} ms/batch {2:>8.3f} us/element".format(
+        name, best * 1e3, best * 1e6 / size))
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    batch = make_batch(size)
+    print("JSONRPC20BatchResponse, batch of {0} elements".format(size))
+    for name in sorted(CODECS):
+        codec = get_codec(name)
+        if codec.name != name:
+            continue
+        report("{0}: dumps_bytes(data)".format(name),
+               lambda: codec.dumps_bytes(batch.data), size)
+        report("{0}: encode()".format(name),
+               lambda: batch.encode(codec), size)
+        report("{0}: iter_bytes()".format(name),
+               lambda: b"".join(batch.iter_bytes(codec)), size)
+
+
+if __name__ == "__main__":
+    main()
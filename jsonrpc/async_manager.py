@@ -0,0 +1,251 @@
+""" JSON-RPC response manager for asyncio applications.
+
+Python 3.5+ only, module is not imported by :mod:`jsonrpc` package and
+should be imported directly:
+
+    >>> from jsonrpc.async_manager import AsyncJSONRPCResponseManager
+
+.. versionadded: 1.16.0
+
+"""
+import asyncio
+import functools
+import inspect
+
+from .base import NOT_SET
+from .exceptions import (
+    JSONRPCInvalidParams,
+    JSONRPCMethodNotFound,
+    JSONRPCRequestTimeout,
+)
+from .jsonrpc2 import JSONRPC20BatchRequest
+from .manager import JSONRPCResponseManager
+
+
+class _MethodTimeoutError(Exception):
+
+    """ asyncio.TimeoutError raised by the method, not by wait_for."""
+
+    def __init__(self, error):
+        super(_MethodTimeoutError, self).__init__(error)
+        self.error = error
+
+
+async def _guard_timeout(awaitable):
+    try:
+        return await awaitable
+    except asyncio.TimeoutError as e:
+        raise _MethodTimeoutError(e)
+
+
+class AsyncJSONRPCResponseManager(object):
+
+    """ JSON-RPC response manager, which awaits coroutine methods.
+
+    Coroutine functions (``async def``) registered in the dispatcher are
+    awaited, plain functions are called in the executor of the method (see
+    :mod:`jsonrpc.executors`), otherwise inline or, if ``executor`` is
+    given, in the executor, so they do not block the event loop. Members of
+    a batch request are executed concurrently, every member gets its own
+    response or error, as with
+    :class:`~jsonrpc.manager.JSONRPCResponseManager`.
+
+    Methods with context argument get a copy of the context, concurrently
+    executed members of a batch do not share it.
+
+    :param executor: :class:`concurrent.futures.Executor` to call plain
+        functions in, they are called inline by default.
+
+    """
+
+    MANAGER_CLASS = JSONRPCResponseManager
+
+    @classmethod
+    async def handle(cls, request_str, dispatcher, context=None, codec=None,
+                     executor=None, deadline=None, deduplicate=False):
+        manager = cls.MANAGER_CLASS
+        codec = manager._get_codec(dispatcher, codec)
+        request, response = manager._parse_request(request_str, codec)
+        if request is None:
+            return response
+
+        return await cls.handle_request(
+            request, dispatcher, context, codec=codec, executor=executor,
+            deadline=deadline, deduplicate=deduplicate)
+
+    @classmethod
+    async def handle_bytes(cls, request_bytes, dispatcher, context=None,
+                           codec=None, executor=None, deadline=None,
+                           deduplicate=False):
+        """ Handle binary request, return binary response.
+
+        :return bytes: utf-8 encoded response, empty for notifications.
+
+        """
+        codec = cls.MANAGER_CLASS._get_codec(dispatcher, codec)
+        response = await cls.handle(
+            request_bytes, dispatcher, context, codec=codec,
+            executor=executor, deadline=deadline, deduplicate=deduplicate)
+        if response is None:
+            return b""
+        return response.encode(codec)
+
+    @classmethod
+    async def handle_request(cls, request, dispatcher, context=None,
+                             codec=None, executor=None, deadline=None,
+                             deduplicate=False):
+        """ Handle request data.
+
+        Coroutine methods, which do not complete within their timeout or
+        before the ``deadline``, are cancelled. Calls in executors are not
+        waited for after that. Request timeout error is returned in both
+        cases, requests received after the deadline are not executed.
+
+        :param request: parsed request.
+        :param jsonrpc.dispatcher.Dispatcher dispatcher:
+        :param float deadline: time (as returned by :func:`time.time`) to
+            respond before.
+        :param bool deduplicate: execute identical calls of idempotent
+            methods in a batch once.
+
+        """
+        manager = cls.MANAGER_CLASS
+        codec = manager._get_codec(dispatcher, codec)
+        serialize = codec.dumps
+        dispatcher_plans = manager._get_dispatcher_plans(dispatcher)
+        plans = dict()
+
+        if isinstance(request, JSONRPC20BatchRequest):
+            calls = rs = request.requests
+            duplicates = None
+            if deduplicate:
+                rs, duplicates = manager._deduplicate(calls, dispatcher)
+            responses = await asyncio.gather(*[
+                cls._get_response(r, dispatcher, dispatcher_plans, plans,
+                                  context, serialize, executor, deadline)
+                for r in rs
+            ])
+            if duplicates:
+                responses = manager._copy_responses(
+                    calls, responses, duplicates)
+        else:
+            responses = [await cls._get_response(
+                request, dispatcher, dispatcher_plans, plans, context,
+                serialize, executor, deadline)]
+
+        return manager._join_responses(request, responses, codec)
+
+    @classmethod
+    async def _get_response(cls, request, dispatcher, dispatcher_plans,
+                            plans, context, serialize, executor,
+                            deadline=None):
+        """ Response to a single JSON-RPC Request, None for notifications."""
+        manager = cls.MANAGER_CLASS
+        try:
+            plan = manager._get_plan(
+                dispatcher, request.method, dispatcher_plans, plans)
+        except KeyError:
+            return manager._make_response(
+                request, serialize, error=JSONRPCMethodNotFound.cached_data())
+
+        cache_key = manager._get_cache_key(plan, request)
+        if cache_key is not None:
+            result = plan.cache.get(cache_key)
+            if result is not NOT_SET:
+                return manager._make_response(
+                    request, serialize, result=result)
+
+        flight_key = manager._get_flight_key(plan, request)
+        if flight_key is None:
+            return await cls._execute(
+                request, plan, cache_key, context, serialize, executor,
+                deadline)
+
+        response = await plan.single_flight.do_async(
+            flight_key, cls._execute, request, plan, cache_key, context,
+            serialize, executor, deadline)
+        return manager._copy_response(response, request)
+
+    @classmethod
+    async def _execute(cls, request, plan, cache_key, context, serialize,
+                       executor, deadline=None):
+        """ Response to the request, method is called."""
+        manager = cls.MANAGER_CLASS
+        timeout = manager._get_timeout(plan, deadline)
+        if timeout is not None and timeout <= 0:
+            return manager._make_response(
+                request, serialize, error=JSONRPCRequestTimeout.cached_data())
+
+        if plan.context_arg and context is not None:
+            context = dict(context)
+
+        try:
+            args, kwargs = plan.bind(request, context)
+        except (TypeError, ValueError) as e:
+            return manager._make_response(
+                request, serialize, error=JSONRPCInvalidParams(
+                    data=manager._get_params_error_data(e))._data)
+
+        bulkhead = plan.bulkhead
+        if bulkhead is not None:
+            waiter = bulkhead.acquire_async(asyncio.get_event_loop())
+            if waiter is None:
+                return manager._make_response(
+                    request, serialize, error=bulkhead.error)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                bulkhead.cancel(waiter)
+                raise
+
+        future = None
+        try:
+            if plan.is_coroutine:
+                awaitable = plan.method(*args, **kwargs)
+            else:
+                if plan.executor is not None:
+                    future = plan.executor.submit(
+                        plan.method, *args, **kwargs)
+                elif executor is not None:
+                    future = executor.submit(
+                        functools.partial(plan.method, *args, **kwargs))
+                awaitable = asyncio.wrap_future(future) \
+                    if future is not None else plan.method(*args, **kwargs)
+
+            # E.g. method returns a future or is a partial of a coroutine.
+            if inspect.isawaitable(awaitable):
+                if timeout is None:
+                    result = await awaitable
+                else:
+                    result = await asyncio.wait_for(
+                        _guard_timeout(awaitable), timeout)
+            else:
+                result = awaitable
+        except _MethodTimeoutError as e:
+            return manager._make_response(
+                request, serialize,
+                error=manager._get_exception_error(e.error, request, plan))
+        except asyncio.TimeoutError as e:
+            if timeout is None:
+                # Raised by the method itself.
+                return manager._make_response(
+                    request, serialize,
+                    error=manager._get_exception_error(e, request, plan))
+            if future is not None and not future.cancel() and \
+                    bulkhead is not None:
+                # Abandoned call keeps its slot until it is finished.
+                bulkhead.release_when_done(future)
+                bulkhead = None
+            return manager._make_response(
+                request, serialize, error=JSONRPCRequestTimeout.cached_data())
+        except Exception as e:
+            return manager._make_response(
+                request, serialize,
+                error=manager._get_exception_error(e, request, plan))
+        finally:
+            if bulkhead is not None:
+                bulkhead.release()
+
+        if cache_key is not None:
+            plan.cache.set(cache_key, result)
+        return manager._make_response(request, serialize, result=result)
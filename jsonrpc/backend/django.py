@@ -8,15 +8,27 @@ except ImportError:
     from django.urls import re_path as url  # Django >=4.0
     
 from django.conf import settings
-from django.http import HttpResponse, HttpResponseNotAllowed
+from django.http import (
+    HttpResponse,
+    HttpResponseNotAllowed,
+    StreamingHttpResponse,
+)
 import json
 import logging
 import time
 
-from ..exceptions import JSONRPCInvalidRequestException
+from ..exceptions import (
+    JSONRPCInvalidRequestException,
+    JSONRPCServerBusy,
+)
 from ..jsonrpc import JSONRPCRequest
+from ..jsonrpc2 import JSONRPC20BatchResponse, JSONRPC20Response
 from ..manager import JSONRPCResponseManager
-from ..utils import DatetimeDecimalEncoder
+from ..notifications import NotificationQueueFull
+from ..utils import (
+    DatetimeDecimalEncoder,
+    get_datetime_decimal_codec,
+)
 from ..dispatcher import Dispatcher
 
 
@@ -29,9 +41,16 @@ def response_serialize(obj):
 
 
 class JSONRPCAPI(object):
-    def __init__(self, dispatcher=None):
+    def __init__(self, dispatcher=None, codec=None, notifications=None,
+                 deduplicate=False):
         self.dispatcher = dispatcher if dispatcher is not None \
             else Dispatcher()
+        self.codec = codec
+        self._resolved_codec = None
+        # NotificationQueue to execute notifications in background.
+        self.notifications = notifications
+        # Execute identical calls of idempotent methods in a batch once.
+        self.deduplicate = deduplicate
 
     @property
     def urls(self):
@@ -60,26 +79,50 @@ class JSONRPCAPI(object):
         if request.method != "POST":
             return HttpResponseNotAllowed(["POST"])
 
-        request_str = request.body.decode('utf8')
+        codec = self._get_codec()
+        request_bytes = request.body
         try:
-            jsonrpc_request = JSONRPCRequest.from_json(request_str)
+            jsonrpc_request = JSONRPCRequest.from_data(
+                codec.loads(request_bytes))
         except (TypeError, ValueError, JSONRPCInvalidRequestException):
             response = JSONRPCResponseManager.handle(
-                request_str, self.dispatcher)
+                request_bytes, self.dispatcher, codec=codec)
         else:
             requests = getattr(jsonrpc_request, 'requests', [jsonrpc_request])
             for jsonrpc_req in requests:
                 inject_request(jsonrpc_req)
 
-            response = JSONRPCResponseManager.handle_request(
-                jsonrpc_request, self.dispatcher)
-
-        if response:
-            response.serialize = response_serialize
-            response = response.json
-
+            try:
+                response = JSONRPCResponseManager.handle_request(
+                    jsonrpc_request, self.dispatcher, codec=codec,
+                    notifications=self.notifications,
+                    deduplicate=self.deduplicate)
+            except NotificationQueueFull:
+                response = JSONRPC20Response._from_error(
+                    JSONRPCServerBusy.cached_data())
+                return HttpResponse(
+                    response.encode(codec), status=503,
+                    content_type="application/json")
+
+        if response is None and self.notifications is not None:
+            return HttpResponse(status=204)
+        if isinstance(response, JSONRPC20BatchResponse):
+            # Large batches are streamed, output is never built in memory.
+            return StreamingHttpResponse(
+                response.iter_bytes(codec), content_type="application/json")
+        response = response.encode(codec) if response else b""
         return HttpResponse(response, content_type="application/json")
 
+    def _get_codec(self):
+        codec = self.codec if self.codec is not None \
+            else getattr(self.dispatcher, "codec", None)
+        # Resolved codec is reused while the configured one is the same.
+        resolved = self._resolved_codec
+        if resolved is None or resolved[0] is not codec:
+            resolved = self._resolved_codec = \
+                codec, get_datetime_decimal_codec(codec)
+        return resolved[1]
+
     def jsonrpc_map(self, request):
         """ Map of json-rpc available calls.
 
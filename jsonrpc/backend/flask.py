@@ -1,17 +1,17 @@
 from __future__ import absolute_import
 
 import copy
-import json
 import logging
 import time
 from uuid import uuid4
 
 from flask import Blueprint, request, Response
 
-from ..exceptions import JSONRPCInvalidRequestException
-from ..jsonrpc import JSONRPCRequest
+from ..exceptions import JSONRPCServerBusy
+from ..jsonrpc2 import JSONRPC20BatchResponse, JSONRPC20Response
 from ..manager import JSONRPCResponseManager
-from ..utils import DatetimeDecimalEncoder
+from ..notifications import NotificationQueueFull
+from ..utils import get_datetime_decimal_codec
 from ..dispatcher import Dispatcher
 
 
@@ -19,18 +19,30 @@ logger = logging.getLogger(__name__)
 
 
 class JSONRPCAPI(object):
-    def __init__(self, dispatcher=None, check_content_type=True):
+    def __init__(self, dispatcher=None, check_content_type=True, codec=None,
+                 notifications=None, deduplicate=False):
         """
 
         :param dispatcher: methods dispatcher
         :param check_content_type: if True - content-type must be
             "application/json"
+        :param codec: json codec name or instance, dispatcher's codec is
+            used by default
+        :param notifications: NotificationQueue to execute notifications
+            in background, response without content (204) is returned
+            before they are executed
+        :param deduplicate: execute identical calls of idempotent methods
+            in a batch once
         :return:
 
         """
         self.dispatcher = dispatcher if dispatcher is not None \
             else Dispatcher()
         self.check_content_type = check_content_type
+        self.codec = codec
+        self._resolved_codec = None
+        self.notifications = notifications
+        self.deduplicate = deduplicate
 
     def as_blueprint(self, name=None):
         blueprint = Blueprint(name if name else str(uuid4()), __name__)
@@ -44,20 +56,25 @@ class JSONRPCAPI(object):
         return self.jsonrpc
 
     def jsonrpc(self):
-        request_str = self._get_request_str()
+        codec = self._get_codec()
         try:
-            jsonrpc_request = JSONRPCRequest.from_json(request_str)
-        except (TypeError, ValueError, JSONRPCInvalidRequestException):
             response = JSONRPCResponseManager.handle(
-                request_str, self.dispatcher)
-        else:
-            response = JSONRPCResponseManager.handle_request(
-                jsonrpc_request, self.dispatcher)
-
-        if response:
-            response.serialize = self._serialize
-            response = response.json
-
+                self._get_request_str(), self.dispatcher, codec=codec,
+                notifications=self.notifications,
+                deduplicate=self.deduplicate)
+        except NotificationQueueFull:
+            response = JSONRPC20Response._from_error(
+                JSONRPCServerBusy.cached_data())
+            return Response(response.encode(codec), status=503,
+                            content_type="application/json")
+
+        if response is None and self.notifications is not None:
+            return Response(status=204)
+        if isinstance(response, JSONRPC20BatchResponse):
+            # Large batches are streamed, output is never built in memory.
+            return Response(response.iter_bytes(codec),
+                            content_type="application/json")
+        response = response.encode(codec) if response else b""
         return Response(response, content_type="application/json")
 
     def jsonrpc_map(self):
@@ -77,9 +94,15 @@ class JSONRPCAPI(object):
             return request.data
         return list(request.form.keys())[0]
 
-    @staticmethod
-    def _serialize(s):
-        return json.dumps(s, cls=DatetimeDecimalEncoder)
+    def _get_codec(self):
+        codec = self.codec if self.codec is not None \
+            else getattr(self.dispatcher, "codec", None)
+        # Resolved codec is reused while the configured one is the same.
+        resolved = self._resolved_codec
+        if resolved is None or resolved[0] is not codec:
+            resolved = self._resolved_codec = \
+                codec, get_datetime_decimal_codec(codec)
+        return resolved[1]
 
 
 api = JSONRPCAPI()
@@ -1,13 +1,25 @@
+from .codec import get_codec
 from .utils import JSONSerializable
 
+# Marks response result which was not set, None is a valid result value.
+NOT_SET = object()
+
 
 class JSONRPCBaseRequest(JSONSerializable):
 
-    """ Base class for JSON-RPC 1.0 and JSON-RPC 2.0 requests."""
+    """ Base class for JSON-RPC 1.0 and JSON-RPC 2.0 requests.
+
+    Requests store their fields in slots and build message dict (`data`)
+    only when it is requested, e.g. for serialization.
+
+    """
+
+    __slots__ = (
+        "_method", "_params", "_id_value", "is_notification", "_serialize",
+    )
 
     def __init__(self, method=None, params=None, _id=None,
                  is_notification=None):
-        self.data = dict()
         self.method = method
         self.params = params
         self._id = _id
@@ -15,14 +27,37 @@ class JSONRPCBaseRequest(JSONSerializable):
 
     @property
     def data(self):
-        return self._data
+        # Message format is defined by protocol version specific subclasses.
+        return {}
 
     @data.setter
     def data(self, value):
         if not isinstance(value, dict):
             raise ValueError("data should be dict")
 
-        self._data = value
+    @property
+    def method(self):
+        return self._method
+
+    @method.setter
+    def method(self, value):
+        self._method = value
+
+    @property
+    def params(self):
+        return self._params
+
+    @params.setter
+    def params(self, value):
+        self._params = value
+
+    @property
+    def _id(self):
+        return self._id_value
+
+    @_id.setter
+    def _id(self, value):
+        self._id_value = value
 
     @property
     def args(self):
@@ -31,7 +66,8 @@ class JSONRPCBaseRequest(JSONSerializable):
         :return tuple args: method position arguments.
 
         """
-        return tuple(self.params) if isinstance(self.params, list) else ()
+        params = self._params
+        return tuple(params) if isinstance(params, list) else ()
 
     @property
     def kwargs(self):
@@ -40,7 +76,19 @@ class JSONRPCBaseRequest(JSONSerializable):
         :return dict kwargs: method named arguments.
 
         """
-        return self.params if isinstance(self.params, dict) else {}
+        params = self._params
+        return params if isinstance(params, dict) else {}
+
+    @property
+    def serialize(self):
+        try:
+            return self._serialize
+        except AttributeError:
+            return JSONSerializable.serialize
+
+    @serialize.setter
+    def serialize(self, value):
+        self._serialize = value
 
     @property
     def json(self):
@@ -49,10 +97,18 @@ class JSONRPCBaseRequest(JSONSerializable):
 
 class JSONRPCBaseResponse(JSONSerializable):
 
-    """ Base class for JSON-RPC 1.0 and JSON-RPC 2.0 responses."""
+    """ Base class for JSON-RPC 1.0 and JSON-RPC 2.0 responses.
+
+    Responses store their fields in slots and build message dict (`data`)
+    only when it is requested, e.g. for serialization.
+
+    """
+
+    __slots__ = ("_result", "_error", "_id_value", "request", "_serialize")
 
     def __init__(self, **kwargs):
-        self.data = dict()
+        self._result = NOT_SET
+        self._error = None
 
         try:
             self.result = kwargs['result']
@@ -71,17 +127,107 @@ class JSONRPCBaseResponse(JSONSerializable):
 
         self.request = None  # type: JSONRPCBaseRequest
 
+    @classmethod
+    def _from_result(cls, result, _id=None):
+        """ Create response from trusted values.
+
+        Property setters are skipped, id is expected to be taken from a valid
+        request. Used by :class:`~jsonrpc.manager.JSONRPCResponseManager`,
+        responses created by users are validated by constructor.
+
+        """
+        response = cls.__new__(cls)
+        response._result = result
+        response._error = None
+        response._id_value = _id
+        response.request = None
+        return response
+
+    @classmethod
+    def _from_error(cls, error, _id=None):
+        """ Create error response from trusted values.
+
+        Property setters are skipped, error is expected to be valid, e.g.
+        :meth:`~jsonrpc.exceptions.JSONRPCError.cached_data` or data of
+        :class:`~jsonrpc.exceptions.JSONRPCError` instance.
+
+        """
+        response = cls.__new__(cls)
+        response._result = NOT_SET
+        response._error = error
+        response._id_value = _id
+        response.request = None
+        return response
+
     @property
     def data(self):
-        return self._data
+        # Message format is defined by protocol version specific subclasses.
+        return {}
 
     @data.setter
     def data(self, value):
         if not isinstance(value, dict):
             raise ValueError("data should be dict")
 
-        self._data = value
+    @property
+    def result(self):
+        result = self._result
+        return None if result is NOT_SET else result
+
+    @result.setter
+    def result(self, value):
+        self._result = value
+
+    @property
+    def error(self):
+        return self._error
+
+    @error.setter
+    def error(self, value):
+        self._error = value
+
+    @property
+    def _id(self):
+        return self._id_value
+
+    @_id.setter
+    def _id(self, value):
+        self._id_value = value
+
+    @property
+    def serialize(self):
+        try:
+            return self._serialize
+        except AttributeError:
+            return JSONSerializable.serialize
+
+    @serialize.setter
+    def serialize(self, value):
+        self._serialize = value
 
     @property
     def json(self):
         return self.serialize(self.data)
+
+    def encode(self, codec=None):
+        """ Serialize response to utf-8 encoded json bytes.
+
+        :param codec: codec name or instance, default codec if not set.
+        :return bytes:
+
+        .. versionadded: 1.16.0
+
+        """
+        return self._encode(get_codec(codec).dumps_bytes)
+
+    def _encode(self, dumps_bytes):
+        return dumps_bytes(self.data)
+
+    def _has_encoded_parts(self):
+        """ Whether response carries already encoded json.
+
+        Such responses are not serialized as a part of a bigger structure,
+        their encoded parts are spliced into output instead.
+
+        """
+        return False
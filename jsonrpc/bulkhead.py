@@ -0,0 +1,154 @@
+""" Concurrency limits of methods.
+
+Methods added with ``Dispatcher.add_method(max_concurrency=N, max_queue=M)``
+are executed by at most N threads or tasks at a time, at most M more calls
+wait for a free slot. Other calls are rejected at once with Server busy
+error (or error given with ``busy_error``), so a slow method does not take
+every worker of the server.
+
+.. versionadded: 1.16.0
+
+"""
+import collections
+import threading
+
+from .exceptions import JSONRPCError, JSONRPCErrorData, JSONRPCServerBusy
+
+
+def _set_result(future):
+    # Waiter could be cancelled before loop runs the callback.
+    if not future.done():
+        future.set_result(True)
+
+
+class Bulkhead(object):
+
+    """ Semaphore with bounded queue, shared by threads and asyncio tasks.
+
+    Slot is handed over by :meth:`release` directly to the first waiter, so
+    waiters are served in order of arrival.
+
+    :param int max_concurrency: number of calls executed at the same time.
+    :param int max_queue: number of calls waiting for a slot.
+    :param error: :class:`~jsonrpc.exceptions.JSONRPCError` class or
+        instance to reject calls with, defaults to
+        :class:`~jsonrpc.exceptions.JSONRPCServerBusy`.
+
+    """
+
+    def __init__(self, max_concurrency, max_queue=0, error=None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency should be positive")
+        if max_queue < 0:
+            raise ValueError("max_queue should not be negative")
+
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.error = self._get_error_data(error)
+        self.running = 0
+        self.rejected = 0
+        self._waiters = collections.deque()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_error_data(error):
+        if error is None:
+            return JSONRPCServerBusy.cached_data()
+        if isinstance(error, type) and issubclass(error, JSONRPCError):
+            return error.cached_data()
+        if isinstance(error, JSONRPCError):
+            return JSONRPCErrorData(error._data)
+        raise ValueError("error should be JSONRPCError class or instance")
+
+    @property
+    def waiting(self):
+        """ Number of calls waiting for a slot."""
+        return len(self._waiters)
+
+    def _try_acquire(self, waiter, wake):
+        """ Take a free slot or enqueue waiter.
+
+        :return: True if slot is taken, False if call is rejected, None if
+            waiter is enqueued.
+
+        """
+        with self._lock:
+            if self.running < self.max_concurrency:
+                self.running += 1
+                return True
+            if len(self._waiters) >= self.max_queue:
+                self.rejected += 1
+                return False
+            self._waiters.append((waiter, wake))
+            return None
+
+    def acquire(self):
+        """ Take a slot, wait for it if queue is not full.
+
+        :return bool: False if call is rejected.
+
+        """
+        waiter = threading.Lock()
+        waiter.acquire()
+        acquired = self._try_acquire(waiter, waiter.release)
+        if acquired is None:
+            # Released by release() with the slot handed over.
+            waiter.acquire()
+            return True
+        return acquired
+
+    def acquire_async(self, loop):
+        """ Take a slot for asyncio task.
+
+        :return: future, which is done when slot is taken, or None if call
+            is rejected. If waiting task is cancelled, future should be
+            passed to :meth:`cancel`.
+
+        """
+        waiter = loop.create_future()
+        acquired = self._try_acquire(
+            waiter, lambda: loop.call_soon_threadsafe(_set_result, waiter))
+        if acquired is False:
+            return None
+        if acquired:
+            waiter.set_result(True)
+        return waiter
+
+    def cancel(self, waiter):
+        """ Stop waiting for a slot, release it if it is already taken."""
+        with self._lock:
+            for item in self._waiters:
+                if item[0] is waiter:
+                    self._waiters.remove(item)
+                    return
+        self.release()
+
+    def release(self):
+        """ Free the slot, hand it over to the first waiter if any."""
+        with self._lock:
+            if not self._waiters:
+                self.running -= 1
+                return
+            _, wake = self._waiters.popleft()
+        wake()
+
+    def release_when_done(self, future):
+        """ Free the slot when abandoned call in executor is finished.
+
+        :param concurrent.futures.Future future:
+
+        """
+        future.add_done_callback(lambda future: self.release())
+
+    def stats(self):
+        """ Counters of the bulkhead.
+
+        :return dict: running, waiting and rejected calls.
+
+        """
+        with self._lock:
+            return {
+                "running": self.running,
+                "waiting": len(self._waiters),
+                "rejected": self.rejected,
+            }
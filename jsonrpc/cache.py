@@ -0,0 +1,494 @@
+""" Memoization of method results.
+
+Methods added with ``Dispatcher.add_method(cache=TTLCache(maxsize, ttl))``
+are executed once for the same params during ``ttl`` seconds, later calls
+get the stored result. Results are stored by method name and canonical
+json encoding of params, errors are not stored. One cache could be shared
+by several methods.
+
+Context is not a part of the key, a result computed for one caller is
+returned to every caller with the same params. Methods with
+``context_arg`` could not be cached, ``add_method`` raises ValueError.
+
+Cache could be invalidated explicitly, for a single params or for all
+params of a method:
+
+    >>> dispatcher.invalidate("get_config", {"name": "timeout"})
+    >>> dispatcher.invalidate("get_config")
+
+:class:`EncodedResultCache` stores encoded results, cached response is
+built without serializing the result again. :class:`SQLiteCache` stores
+them in a file shared by all processes on the host, e.g. pre-fork server
+workers.
+
+.. versionadded: 1.16.0
+
+"""
+import collections
+import json
+import logging
+import os
+import threading
+import time
+
+from .base import NOT_SET
+from .codec import get_codec
+from .utils import RawJSON
+
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
+logger = logging.getLogger(__name__)
+
+# Time of cache entries, not affected by system clock changes if available.
+timer = getattr(time, "monotonic", time.time)
+
+
+def get_params_key(args, kwargs):
+    """ Canonical encoding of params, equal params have equal keys.
+
+    :param args: positional params.
+    :param dict kwargs: named params.
+    :return str: key or None if params could not be encoded, e.g. a
+        transport added not json object to params.
+
+    """
+    try:
+        return json.dumps([list(args), kwargs], sort_keys=True,
+                          separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _encode_result(codec, value):
+    """ Result as RawJSON, None if it could not be encoded."""
+    if isinstance(value, RawJSON):
+        return value
+    try:
+        return RawJSON(codec.dumps_bytes(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _split_params(params):
+    if isinstance(params, dict):
+        return (), params
+    return params or (), {}
+
+
+class BaseCache(object):
+
+    """ Interface of result caches used by the dispatcher.
+
+    Keys are (method name, params key) tuples, see :meth:`make_key`.
+    Subclasses implement storage: :meth:`get`, :meth:`set` and
+    :meth:`_delete`.
+
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(method, args, kwargs):
+        """ Key of the call.
+
+        :return tuple: (method, params key) or None if call is not
+            cacheable.
+
+        """
+        params_key = get_params_key(args, kwargs)
+        if params_key is None:
+            return None
+        return method, params_key
+
+    def get(self, key):
+        """ Stored result or NOT_SET, counts hits and misses."""
+        raise NotImplementedError()
+
+    def set(self, key, value):
+        """ Store the result."""
+        raise NotImplementedError()
+
+    def _delete(self, method, params_key=None):
+        """ Delete result of the call or all results of the method."""
+        raise NotImplementedError()
+
+    def invalidate(self, method, params=NOT_SET):
+        """ Delete stored results of the method.
+
+        :param str method: method name.
+        :param params: list or dict params of the call to delete result
+            of, None for call without params. Results for all params are
+            deleted if not given.
+
+        """
+        if params is NOT_SET:
+            self._delete(method)
+            return
+
+        params_key = get_params_key(*_split_params(params))
+        if params_key is not None:
+            self._delete(method, params_key)
+
+    def stats(self):
+        """ Counters of the cache.
+
+        :return dict: hits and misses.
+
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class TTLCache(BaseCache):
+
+    """ In-memory cache with time to live and LRU eviction.
+
+    :param int maxsize: number of stored results, least recently used
+        results are evicted.
+    :param float ttl: seconds to keep a result.
+
+    """
+
+    def __init__(self, maxsize=128, ttl=60):
+        if maxsize < 1:
+            raise ValueError("maxsize should be positive")
+        super(TTLCache, self).__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expiration time, value, size), in order of use.
+        self._data = collections.OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    @staticmethod
+    def _getsizeof(key, value):
+        """ Size of the entry, counted against maxsize."""
+        return 1
+
+    def get(self, key):
+        with self._lock:
+            try:
+                entry = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return NOT_SET
+
+            if entry[0] <= timer():
+                self._size -= entry[2]
+                self.misses += 1
+                return NOT_SET
+
+            # Move to the end, as the most recently used.
+            self._data[key] = entry
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        size = self._getsizeof(key, value)
+        with self._lock:
+            self._pop(key)
+            if size > self.maxsize:
+                return
+
+            self._data[key] = timer() + self.ttl, value, size
+            self._size += size
+            while self._size > self.maxsize:
+                self._size -= self._data.popitem(last=False)[1][2]
+
+    def _pop(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._size -= entry[2]
+
+    def _delete(self, method, params_key=None):
+        with self._lock:
+            if params_key is not None:
+                self._pop((method, params_key))
+                return
+
+            for key in [key for key in self._data if key[0] == method]:
+                self._pop(key)
+
+    def clear(self):
+        """ Delete all stored results."""
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+            }
+
+
+class EncodedResultCache(TTLCache):
+
+    """ In-memory cache of encoded results, bounded by their size in bytes.
+
+    Results are stored as :class:`~jsonrpc.utils.RawJSON`, so a cached
+    response is not serialized again: its bytes are spliced into the
+    response with the request id. Results which could not be encoded are
+    not stored.
+
+    >>> dispatcher.add_method(get_countries, cache=EncodedResultCache(
+    ...     maxbytes=64 * 1024 * 1024, ttl=300))
+
+    Codec should be able to encode method results, use the codec (or its
+    copy with the same ``default``) the transport serializes responses with.
+    Cached results are not re-encoded with the response codec.
+
+    :param int maxbytes: total size of stored results and their keys,
+        least recently used results are evicted. Results larger than that
+        are not stored.
+    :param float ttl: seconds to keep a result.
+    :param codec: codec name or instance to encode results with, default
+        codec if not set.
+
+    """
+
+    def __init__(self, maxbytes=16 * 1024 * 1024, ttl=60, codec=None):
+        super(EncodedResultCache, self).__init__(maxsize=maxbytes, ttl=ttl)
+        self.codec = get_codec(codec)
+
+    @property
+    def maxbytes(self):
+        return self.maxsize
+
+    @staticmethod
+    def _getsizeof(key, value):
+        method, params_key = key
+        return len(value.encoded) + len(method) + len(params_key)
+
+    def set(self, key, value):
+        value = _encode_result(self.codec, value)
+        if value is not None:
+            super(EncodedResultCache, self).set(key, value)
+
+    def stats(self):
+        """ Counters of the cache.
+
+        :return dict: hits, misses, size and bytes of stored entries.
+
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "bytes": self._size,
+            }
+
+
+class SQLiteCache(BaseCache):
+
+    """ Cache of encoded results in SQLite database shared by processes.
+
+    In-process caches of pre-fork server workers are filled separately,
+    each gets a share of hits and keeps its own copy of results. Workers
+    on the same host could use one database file instead:
+
+    >>> cache = SQLiteCache("/var/tmp/jsonrpc-cache.db", maxbytes=2 ** 28)
+    >>> dispatcher.add_method(get_countries, cache=cache)
+
+    Database is in WAL mode: reads are not blocked by writes and do not
+    write themselves, so entries are evicted in order of expiration, not of
+    use. Results are stored encoded, as in :class:`EncodedResultCache`.
+    Database errors, e.g. lock timeout, are logged and treated as misses.
+
+    Every thread and process opens own connection, so the cache could be
+    created before workers are forked.
+
+    :param str path: database file, created if it does not exist.
+    :param int maxbytes: total size of stored results and their keys.
+    :param float ttl: seconds to keep a result.
+    :param codec: codec name or instance to encode results with, default
+        codec if not set.
+    :param float timeout: seconds to wait for a database lock.
+
+    """
+
+    def __init__(self, path, maxbytes=64 * 1024 * 1024, ttl=60, codec=None,
+                 timeout=1.0):
+        if sqlite3 is None:
+            raise ValueError("sqlite3 module is not available")
+        if maxbytes < 1:
+            raise ValueError("maxbytes should be positive")
+        super(SQLiteCache, self).__init__()
+        self.path = path
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self.codec = get_codec(codec)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._transaction(self._create_tables)
+
+    @staticmethod
+    def _create_tables(connection):
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS jsonrpc_cache ("
+            "method TEXT NOT NULL, params TEXT NOT NULL, value BLOB NOT NULL,"
+            " expires REAL NOT NULL, size INTEGER NOT NULL,"
+            " PRIMARY KEY (method, params))")
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS jsonrpc_cache_expires"
+            " ON jsonrpc_cache (expires)")
+        # Total size of entries, kept by triggers, so writes do not sum
+        # the whole table.
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS jsonrpc_cache_size ("
+            "id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL)")
+        connection.execute(
+            "INSERT OR IGNORE INTO jsonrpc_cache_size (id, bytes)"
+            " SELECT 0, COALESCE(SUM(size), 0) FROM jsonrpc_cache")
+        connection.execute(
+            "CREATE TRIGGER IF NOT EXISTS jsonrpc_cache_insert"
+            " AFTER INSERT ON jsonrpc_cache BEGIN"
+            " UPDATE jsonrpc_cache_size SET bytes = bytes + NEW.size; END")
+        connection.execute(
+            "CREATE TRIGGER IF NOT EXISTS jsonrpc_cache_delete"
+            " AFTER DELETE ON jsonrpc_cache BEGIN"
+            " UPDATE jsonrpc_cache_size SET bytes = bytes - OLD.size; END")
+
+    def _transaction(self, func, *args):
+        """ Call func(connection, *args) in a write transaction.
+
+        Write lock is taken at once, so data read in the transaction is not
+        changed by other writers until commit.
+
+        """
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            func(connection, *args)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _connect(self):
+        """ Connection of current thread and process."""
+        local = self._local
+        pid = os.getpid()
+        if getattr(local, "pid", None) != pid:
+            # Connections should not be used after fork.
+            local.connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None)
+            local.connection.execute("PRAGMA journal_mode=WAL")
+            local.connection.execute("PRAGMA synchronous=NORMAL")
+            local.pid = pid
+        return local.connection
+
+    def _execute(self, sql, params=()):
+        return self._connect().execute(sql, params)
+
+    def __len__(self):
+        return self._execute(
+            "SELECT COUNT(*) FROM jsonrpc_cache").fetchone()[0]
+
+    def get(self, key):
+        method, params_key = key
+        try:
+            row = self._execute(
+                "SELECT value FROM jsonrpc_cache"
+                " WHERE method = ? AND params = ? AND expires > ?",
+                (method, params_key, time.time())).fetchone()
+        except sqlite3.Error:
+            logger.exception("Cache read failed")
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return NOT_SET
+        self.hits += 1
+        return RawJSON(row[0])
+
+    def set(self, key, value):
+        value = _encode_result(self.codec, value)
+        if value is None:
+            return
+
+        method, params_key = key
+        size = len(value.encoded) + len(method) + len(params_key)
+        if size > self.maxbytes:
+            return
+
+        try:
+            self._transaction(
+                self._insert, method, params_key, value.encoded, size)
+        except sqlite3.Error:
+            logger.exception("Cache write failed")
+
+    def _insert(self, connection, method, params_key, encoded, size):
+        now = time.time()
+        connection.execute(
+            "DELETE FROM jsonrpc_cache WHERE expires <= ?", (now,))
+        # Not REPLACE, it does not fire delete trigger.
+        connection.execute(
+            "DELETE FROM jsonrpc_cache WHERE method = ? AND params = ?",
+            (method, params_key))
+        connection.execute(
+            "INSERT INTO jsonrpc_cache (method, params, value, expires, size)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (method, params_key, sqlite3.Binary(encoded), now + self.ttl,
+             size))
+
+        excess = connection.execute(
+            "SELECT bytes FROM jsonrpc_cache_size").fetchone()[0] - \
+            self.maxbytes
+        if excess > 0:
+            self._evict(connection, excess)
+
+    @staticmethod
+    def _evict(connection, excess):
+        """ Delete entries expiring first until excess bytes are freed."""
+        rowids = []
+        for rowid, size in connection.execute(
+                "SELECT rowid, size FROM jsonrpc_cache ORDER BY expires"):
+            rowids.append((rowid,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany(
+            "DELETE FROM jsonrpc_cache WHERE rowid = ?", rowids)
+
+    def _delete(self, method, params_key=None):
+        if params_key is None:
+            self._execute(
+                "DELETE FROM jsonrpc_cache WHERE method = ?", (method,))
+        else:
+            self._execute(
+                "DELETE FROM jsonrpc_cache WHERE method = ? AND params = ?",
+                (method, params_key))
+
+    def clear(self):
+        """ Delete all stored results."""
+        self._execute("DELETE FROM jsonrpc_cache")
+
+    def stats(self):
+        """ Counters of the cache.
+
+        Hits and misses are counted by the process, size and bytes are of
+        the shared database.
+
+        :return dict: hits, misses, size and bytes of stored entries.
+
+        """
+        size, total = self._execute(
+            "SELECT (SELECT COUNT(*) FROM jsonrpc_cache), bytes"
+            " FROM jsonrpc_cache_size").fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": size,
+            "bytes": total,
+        }
@@ -0,0 +1,236 @@
+""" JSON codecs.
+
+Codec is a pair of functions used to parse incoming messages and to encode
+outgoing ones. Standard library :mod:`json` is always available; faster
+third-party libraries (orjson, ujson, rapidjson) are used if installed.
+
+Codecs are selected by name, either globally with :func:`set_default_codec`
+or per :class:`~jsonrpc.dispatcher.Dispatcher` / backend. If requested library
+is not installed, :func:`get_codec` falls back to the standard library.
+
+>>> from jsonrpc.codec import get_codec
+>>> get_codec("orjson").dumps({"jsonrpc": "2.0"})
+'{"jsonrpc":"2.0"}'
+
+.. versionadded: 1.16.0
+
+"""
+import codecs
+import copy
+import json
+import logging
+import sys
+
+from . import six
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import rapidjson
+except ImportError:
+    rapidjson = None
+
+logger = logging.getLogger(__name__)
+
+BINARY_TYPES = (bytes, bytearray, memoryview)
+
+
+class JSONCodec(object):
+
+    """ Standard library json codec.
+
+    Subclasses override :meth:`loads`, :meth:`dumps` and :meth:`dumps_bytes`
+    to use other json libraries.
+
+    Parameters
+    ----------
+    default : callable, optional
+        Function called for objects which could not be serialized otherwise.
+        It should return a serializable version of an object or raise
+        TypeError, see :func:`json.dumps`.
+
+    """
+
+    name = "json"
+    available = True
+
+    def __init__(self, default=None):
+        self.default = default
+
+    def __repr__(self):
+        return "<{0} {1}>".format(self.__class__.__name__, self.name)
+
+    @property
+    def default(self):
+        return self._default
+
+    @default.setter
+    def default(self, value):
+        self._default = value
+        # json.dumps with any keyword argument builds new encoder every call.
+        self._encoder = json.JSONEncoder(default=value)
+
+    def with_default(self, default):
+        """ Copy of the codec with a different `default` function.
+
+        :return JSONCodec:
+
+        """
+        codec = copy.copy(self)
+        codec.default = default
+        return codec
+
+    def loads(self, s):
+        """ Parse json from str, bytes, bytearray or memoryview."""
+        if isinstance(s, BINARY_TYPES) and (
+                isinstance(s, memoryview) or sys.version_info < (3, 6)):
+            s = codecs.decode(s, "utf-8")
+        return json.loads(s)
+
+    def dumps(self, obj):
+        """ Serialize object to json str."""
+        return self._encoder.encode(obj)
+
+    def dumps_bytes(self, obj):
+        """ Serialize object to utf-8 encoded json bytes."""
+        return self.dumps(obj).encode("utf-8")
+
+
+class OrjsonCodec(JSONCodec):
+
+    """ orjson codec, https://github.com/ijl/orjson.
+
+    orjson works with bytes natively, so :meth:`dumps_bytes` does not copy
+    the output and :meth:`loads` accepts binary input as is.
+
+    """
+
+    name = "orjson"
+    available = orjson is not None
+
+    def loads(self, s):
+        return orjson.loads(s)
+
+    def dumps(self, obj):
+        return orjson.dumps(obj, default=self.default).decode("utf-8")
+
+    def dumps_bytes(self, obj):
+        return orjson.dumps(obj, default=self.default)
+
+
+class UjsonCodec(JSONCodec):
+
+    """ ujson codec, https://github.com/ultrajson/ultrajson."""
+
+    name = "ujson"
+    available = ujson is not None
+
+    def loads(self, s):
+        if isinstance(s, (bytearray, memoryview)):
+            s = bytes(s)
+        return ujson.loads(s)
+
+    def dumps(self, obj):
+        if self.default is None:
+            return ujson.dumps(obj)
+        return ujson.dumps(obj, default=self.default)
+
+
+class RapidjsonCodec(JSONCodec):
+
+    """ python-rapidjson codec, https://github.com/python-rapidjson."""
+
+    name = "rapidjson"
+    available = rapidjson is not None
+
+    def loads(self, s):
+        if isinstance(s, (bytearray, memoryview)):
+            s = bytes(s)
+        return rapidjson.loads(s)
+
+    def dumps(self, obj):
+        return rapidjson.dumps(obj, default=self.default)
+
+
+CODECS = dict((c.name, c) for c in [
+    JSONCodec, OrjsonCodec, UjsonCodec, RapidjsonCodec,
+])
+
+_instances = dict()
+_default_codec = JSONCodec()
+
+
+def register_codec(codec_class):
+    """ Register codec class under its `name`.
+
+    :param type codec_class: :class:`JSONCodec` subclass.
+
+    """
+    CODECS[codec_class.name] = codec_class
+    _instances.pop(codec_class.name, None)
+    return codec_class
+
+
+def get_codec(codec=None):
+    """ Get codec instance.
+
+    :param codec: codec name, instance or None for default codec.
+    :return JSONCodec:
+
+    If codec library is not installed, standard library codec is returned.
+
+    """
+    if codec is None:
+        return _default_codec
+
+    if isinstance(codec, JSONCodec):
+        return codec
+
+    if not isinstance(codec, six.string_types):
+        raise ValueError("codec should be a name or JSONCodec instance")
+
+    try:
+        return _instances[codec]
+    except KeyError:
+        pass
+
+    try:
+        codec_class = CODECS[codec]
+    except KeyError:
+        raise ValueError("Unknown codec {0}".format(codec))
+
+    if not codec_class.available:
+        logger.warning(
+            "Codec {0} is not installed, fall back to json".format(codec))
+        codec_class = JSONCodec
+
+    instance = _instances[codec] = codec_class()
+    return instance
+
+
+def set_default_codec(codec):
+    """ Set codec used when no codec is specified explicitly.
+
+    :param codec: codec name or instance.
+
+    """
+    global _default_codec
+    _default_codec = get_codec(codec) if codec is not None else JSONCodec()
+
+
+def loads(s):
+    """ Parse json with default codec."""
+    return _default_codec.loads(s)
+
+
+def dumps(obj):
+    """ Serialize object to json str with default codec."""
+    return _default_codec.dumps(obj)
@@ -0,0 +1,276 @@
+""" Conversion of method params according to type annotations.
+
+Methods added with ``Dispatcher.add_method(coerce=True)`` get their params
+converted from json values to annotated types before the call, e.g. ISO
+formatted string to :class:`datetime.date`. Annotations are read and
+converters are built once, when method is added.
+
+Supported annotations: int, float, decimal.Decimal, datetime.datetime,
+datetime.date, uuid.UUID, List[X], Dict[str, X] and Optional[X] of them.
+Parameters with other annotations are passed as is.
+
+.. versionadded: 1.16.0
+
+"""
+import datetime
+import decimal
+import inspect
+import sys
+import types
+import uuid
+
+from . import six
+
+try:
+    import typing
+except ImportError:
+    typing = None
+
+_NoneType = type(None)
+# Type of "X | None" annotations, python 3.10+.
+_UnionType = getattr(types, "UnionType", None)
+
+
+class CoercionError(ValueError):
+
+    """ Parameter value could not be converted to annotated type."""
+
+    pass
+
+
+def _to_int(value):
+    if isinstance(value, bool):
+        raise TypeError("expected integer, got bool")
+    if isinstance(value, six.integer_types):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, six.string_types):
+        return int(value)
+    raise TypeError("expected integer, got {0}".format(
+        type(value).__name__))
+
+
+def _to_float(value):
+    if isinstance(value, bool):
+        raise TypeError("expected number, got bool")
+    if isinstance(value, (float, six.string_types) + six.integer_types):
+        return float(value)
+    raise TypeError("expected number, got {0}".format(type(value).__name__))
+
+
+def _to_decimal(value):
+    if isinstance(value, decimal.Decimal):
+        return value
+    if isinstance(value, bool):
+        raise TypeError("expected number, got bool")
+    if isinstance(value, float):
+        # repr is the shortest string which is parsed to the same float,
+        # decimal is built from it instead of the exact binary value.
+        return decimal.Decimal(repr(value))
+    if isinstance(value, six.string_types + six.integer_types):
+        try:
+            return decimal.Decimal(value)
+        except decimal.InvalidOperation:
+            raise ValueError("invalid decimal {0!r}".format(value))
+    raise TypeError("expected number, got {0}".format(type(value).__name__))
+
+
+def _check_string(value, type_name):
+    if not isinstance(value, six.string_types):
+        raise TypeError("expected {0} string, got {1}".format(
+            type_name, type(value).__name__))
+
+
+if sys.version_info >= (3, 7):
+    def _parse_datetime(value):
+        if value.endswith(("Z", "z")):
+            value = value[:-1] + "+00:00"
+        return datetime.datetime.fromisoformat(value)
+
+    _parse_date = datetime.date.fromisoformat
+else:
+    DATETIME_FORMATS = (
+        "%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S.%f",
+        "%Y-%m-%d %H:%M:%S", "%Y-%m-%d",
+    )
+
+    def _parse_datetime(value):
+        for datetime_format in DATETIME_FORMATS:
+            try:
+                return datetime.datetime.strptime(value, datetime_format)
+            except ValueError:
+                pass
+        raise ValueError("invalid isoformat string: {0!r}".format(value))
+
+    def _parse_date(value):
+        return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _to_datetime(value):
+    if isinstance(value, datetime.datetime):
+        return value
+    _check_string(value, "datetime")
+    return _parse_datetime(value)
+
+
+def _to_date(value):
+    if isinstance(value, datetime.date) and \
+            not isinstance(value, datetime.datetime):
+        return value
+    _check_string(value, "date")
+    return _parse_date(value)
+
+
+def _to_uuid(value):
+    if isinstance(value, uuid.UUID):
+        return value
+    _check_string(value, "uuid")
+    return uuid.UUID(value)
+
+
+CONVERTERS = {
+    int: _to_int,
+    float: _to_float,
+    decimal.Decimal: _to_decimal,
+    datetime.datetime: _to_datetime,
+    datetime.date: _to_date,
+    uuid.UUID: _to_uuid,
+}
+
+
+def _get_origin(annotation):
+    """ Generic type of parametrized annotation, e.g. list for List[int]."""
+    origin = getattr(annotation, "__origin__", None)
+    if typing is not None:
+        # Python 3.5 and 3.6 report typing generics as origin.
+        origin = {
+            getattr(typing, "List", None): list,
+            getattr(typing, "Dict", None): dict,
+        }.get(origin, origin)
+    return origin
+
+
+def compile_converter(annotation):
+    """ Build converter of a json value to annotated type.
+
+    :return function: value -> converted value, raises TypeError or
+        ValueError; None if annotation is not supported.
+
+    """
+    try:
+        converter = CONVERTERS.get(annotation)
+    except TypeError:
+        # Annotation is not hashable.
+        return None
+    if converter is not None:
+        return converter
+
+    origin = _get_origin(annotation)
+    args = getattr(annotation, "__args__", None) or ()
+
+    if origin is list and len(args) == 1:
+        item = compile_converter(args[0])
+        if item is None:
+            return None
+
+        def convert_list(value):
+            if not isinstance(value, list):
+                raise TypeError("expected array, got {0}".format(
+                    type(value).__name__))
+            return [item(v) for v in value]
+
+        return convert_list
+
+    if origin is dict and len(args) == 2:
+        item = compile_converter(args[1])
+        if item is None:
+            return None
+
+        def convert_dict(value):
+            if not isinstance(value, dict):
+                raise TypeError("expected object, got {0}".format(
+                    type(value).__name__))
+            return dict((k, item(v)) for k, v in value.items())
+
+        return convert_dict
+
+    is_union = typing is not None and origin is typing.Union or \
+        _UnionType is not None and isinstance(annotation, _UnionType)
+    if is_union:
+        members = [arg for arg in args if arg is not _NoneType]
+        if len(members) == 1 and len(args) == 2:
+            item = compile_converter(members[0])
+            if item is None:
+                return None
+
+            def convert_optional(value):
+                return None if value is None else item(value)
+
+            return convert_optional
+
+    return None
+
+
+def _get_annotations(func):
+    try:
+        return typing.get_type_hints(func)
+    except Exception:
+        # String annotations, which could not be evaluated.
+        return getattr(func, "__annotations__", {})
+
+
+def compile_coercer(func):
+    """ Build converter of method params according to its annotations.
+
+    :return function: (tuple args, dict kwargs) -> (args, kwargs) with
+        converted values, raises :class:`CoercionError`; None if there are
+        no params to convert.
+
+    """
+    if sys.version_info < (3, 3) or typing is None:
+        return None
+
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return None
+
+    annotations = _get_annotations(func)
+    positional = []
+    keyword = []
+    for index, parameter in enumerate(parameters):
+        converter = compile_converter(annotations.get(parameter.name))
+        if converter is None:
+            continue
+        if parameter.kind in (parameter.POSITIONAL_ONLY,
+                              parameter.POSITIONAL_OR_KEYWORD):
+            positional.append((index, parameter.name, converter))
+        elif parameter.kind == parameter.KEYWORD_ONLY:
+            keyword.append((parameter.name, converter))
+
+    if not positional and not keyword:
+        return None
+
+    def coerce(args, kwargs):
+        args_count = len(args)
+        # Request params are not modified.
+        args = list(args)
+        kwargs = dict(kwargs)
+        name = None
+        try:
+            for index, name, converter in positional:
+                if index < args_count:
+                    args[index] = converter(args[index])
+                elif name in kwargs:
+                    kwargs[name] = converter(kwargs[name])
+
+            for name, converter in keyword:
+                if name in kwargs:
+                    kwargs[name] = converter(kwargs[name])
+        except (TypeError, ValueError) as e:
+            raise CoercionError("Parameter '{0}': {1}".format(name, e))
+
+        return args, kwargs
+
+    return coerce
@@ -4,23 +4,217 @@ For usage examples see :meth:`Dispatcher.add_method`
 
 """
 import functools
+import inspect
 try:
     from collections.abc import MutableMapping
 except ImportError:
     from collections import MutableMapping
 
+from .base import NOT_SET
+from .bulkhead import Bulkhead
+from .coercion import compile_coercer
+from .executors import (
+    INLINE,
+    THREAD,
+    ProcessPoolExecutor,
+    check_picklable,
+    get_executor,
+)
+from .schema import compile_schema
+from .singleflight import SingleFlight
+from .utils import compile_params_checker
+
+# inspect.iscoroutinefunction is available in python 3.5+.
+_is_coroutine_function = getattr(
+    inspect, "iscoroutinefunction", lambda func: False)
+
+
+class MethodPlan(object):
+
+    """ Everything needed to call a method, prepared when method is added.
+
+    Dispatcher keeps one plan per method name, so
+    :class:`~jsonrpc.manager.JSONRPCResponseManager` finds the method and all
+    its options with a single lookup. Per method options are added to the
+    plan.
+
+    :param callable method: method to call.
+    :param str context_arg: name of the argument receiving context.
+    :param bool coerce: convert params to annotated types.
+    :param dict params_schema: JSON Schema to validate params with.
+    :param bool check_params: check params with compiled signature checker
+        before the call.
+    :param executor: executor to call method in, see
+        :mod:`jsonrpc.executors`.
+    :param int max_concurrency: limit of concurrent calls, see
+        :mod:`jsonrpc.bulkhead`.
+    :param int max_queue: limit of calls waiting for max_concurrency.
+    :param busy_error: error to reject calls over the limits with.
+    :param float timeout: seconds to wait for the result. Plain functions
+        with timeout are called in the shared thread pool, unless executor
+        is given.
+    :param cache: :class:`~jsonrpc.cache.BaseCache` to store results in,
+        not allowed with context_arg.
+    :param bool idempotent: calls with the same params have the same result
+        and no other effect, so identical calls could be executed once.
+    :param bool single_flight: concurrent calls with the same params wait
+        for the first one, see :mod:`jsonrpc.singleflight`. Not allowed
+        with context_arg.
+
+    .. versionadded: 1.16.0
+
+    """
+
+    __slots__ = (
+        "method", "context_arg", "check_params", "coerce_params",
+        "validate_params", "bind", "is_coroutine", "executor", "bulkhead",
+        "timeout", "cache", "idempotent", "single_flight",
+    )
+
+    def __init__(self, method, context_arg=None, coerce=False,
+                 params_schema=None, check_params=True, executor=None,
+                 max_concurrency=None, max_queue=0, busy_error=None,
+                 timeout=None, cache=None, idempotent=False,
+                 single_flight=False):
+        if cache is not None and context_arg is not None:
+            # Cache key does not include the context, one caller's result
+            # would be returned to others.
+            raise ValueError("cache could not be used with context_arg")
+        if single_flight and context_arg is not None:
+            # Followers get the response built with leader's context.
+            raise ValueError(
+                "single_flight could not be used with context_arg")
+
+        self.method = method
+        self.context_arg = context_arg
+        # Method signature is inspected once, params of every call are
+        # checked by compiled checker.
+        self.check_params = compile_params_checker(method) \
+            if check_params else None
+        self.coerce_params = compile_coercer(method) if coerce else None
+        self.validate_params = compile_schema(params_schema) \
+            if params_schema is not None else None
+        self.bind = self._compile_bind()
+        self.is_coroutine = _is_coroutine_function(method)
+        self.timeout = timeout
+        if timeout is not None and not self.is_coroutine and \
+                executor in (None, INLINE):
+            # Call, which is waited for with timeout, should not block the
+            # waiting thread.
+            executor = THREAD
+        self.executor = get_executor(executor)
+        if self.executor is not None and ProcessPoolExecutor is not None \
+                and isinstance(self.executor.executor, ProcessPoolExecutor):
+            check_picklable(method)
+        self.bulkhead = Bulkhead(max_concurrency, max_queue, busy_error) \
+            if max_concurrency is not None else None
+        self.cache = cache
+        self.idempotent = idempotent
+        self.single_flight = SingleFlight() if single_flight else None
+
+    def set_context_arg(self, context_arg):
+        """ Change name of the argument receiving context, None disables
+        the context.
+
+        """
+        if context_arg is not None and (
+                self.cache is not None or self.single_flight is not None):
+            raise ValueError(
+                "cache and single_flight could not be used with context_arg")
+
+        self.context_arg = context_arg
+        self.bind = self._compile_bind()
+
+    def _compile_bind(self):
+        """ Build function of request and context, which returns method's
+        (args, kwargs). Only enabled steps are included.
+
+        Function raises TypeError or ValueError for invalid params only, it
+        does not call the method.
+
+        """
+        context_arg = self.context_arg
+        check = self.check_params
+        coerce = self.coerce_params
+        validate = self.validate_params
+
+        if not (context_arg or check or coerce or validate):
+            return lambda request, context: (request.args, request.kwargs)
+
+        def bind(request, context):
+            if validate is not None:
+                # Omitted params are validated as empty object.
+                params = request.params
+                validate(params if params is not None else {})
+
+            args, kwargs = request.args, request.kwargs
+            if context_arg and context is not None:
+                context["request"] = request
+                kwargs[context_arg] = context
+
+            if check is not None:
+                message = check(args, kwargs)
+                if message is not None:
+                    raise TypeError(message)
+
+            if coerce is not None:
+                args, kwargs = coerce(args, kwargs)
+
+            return args, kwargs
+
+        return bind
+
+
+class _ContextArgs(MutableMapping):
+
+    """ Names of context arguments by method name, changes are applied to
+    the plans of the methods.
+
+    """
+
+    def __init__(self, plan_for_method):
+        self._plans = plan_for_method
+
+    def __getitem__(self, key):
+        context_arg = self._plans[key].context_arg
+        if not context_arg:
+            raise KeyError(key)
+        return context_arg
+
+    def __setitem__(self, key, value):
+        self._plans[key].set_context_arg(value)
+
+    def __delitem__(self, key):
+        self[key]
+        self._plans[key].set_context_arg(None)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __iter__(self):
+        return iter([
+            name for name, plan in list(self._plans.items())
+            if plan.context_arg
+        ])
+
+    def __repr__(self):
+        return repr(dict(self))
+
 
 class Dispatcher(MutableMapping):
 
     """ Dictionary like object which maps method_name to method."""
 
-    def __init__(self, prototype=None):
+    def __init__(self, prototype=None, codec=None):
         """ Build method dispatcher.
 
         Parameters
         ----------
         prototype : object or dict, optional
             Initial method mapping.
+        codec : str or jsonrpc.codec.JSONCodec, optional
+            JSON codec used by JSONRPCResponseManager for this dispatcher,
+            e.g. "orjson". Default codec is used if not specified.
 
         Examples
         --------
@@ -32,20 +226,39 @@ class Dispatcher(MutableMapping):
 
         """
         self.method_map = dict()
-        self.context_arg_for_method = dict()
+        self.plan_for_method = dict()
+        self.codec = codec
 
         if prototype is not None:
             self.build_method_map(prototype)
 
+    @property
+    def context_arg_for_method(self):
+        """ Names of context arguments of methods added with context_arg.
+
+        Mapping is a view of the plans: method has to be added before its
+        context argument is set.
+
+        :return MutableMapping: method name -> argument name.
+
+        """
+        return _ContextArgs(self.plan_for_method)
+
+    @context_arg_for_method.setter
+    def context_arg_for_method(self, value):
+        context_args = self.context_arg_for_method
+        context_args.clear()
+        context_args.update(value)
+
     def __getitem__(self, key):
         return self.method_map[key]
 
     def __setitem__(self, key, value):
-        self.method_map[key] = value
+        self.add_plan(key, MethodPlan(value))
 
     def __delitem__(self, key):
         del self.method_map[key]
-        self.context_arg_for_method.pop(key, None)
+        self.plan_for_method.pop(key, None)
 
     def __len__(self):
         return len(self.method_map)
@@ -69,7 +282,10 @@ class Dispatcher(MutableMapping):
             prefix += '.'
         self.build_method_map(dict, prefix)
 
-    def add_method(self, f=None, name=None, context_arg=None):
+    def add_method(self, f=None, name=None, context_arg=None, coerce=False,
+                   params_schema=None, executor=None, max_concurrency=None,
+                   max_queue=0, busy_error=None, timeout=None, cache=None,
+                   idempotent=False, single_flight=False):
         """ Add a method to the dispatcher.
 
         Parameters
@@ -81,6 +297,40 @@ class Dispatcher(MutableMapping):
         context_arg : str, optional
             Name to specify the function's argument which will receive
             context data
+        coerce : bool, optional
+            Convert params to types from the function's annotations, see
+            :mod:`jsonrpc.coercion` (the default is False)
+        params_schema : dict, optional
+            JSON Schema to validate params with before the call, see
+            :mod:`jsonrpc.schema`
+        executor : str or concurrent.futures.Executor, optional
+            Where to call the function: "inline", "thread", "process" or
+            in the given executor, see :mod:`jsonrpc.executors` (the
+            default is "inline")
+        max_concurrency : int, optional
+            Number of calls executed at the same time, other calls wait or
+            are rejected, see :mod:`jsonrpc.bulkhead`
+        max_queue : int, optional
+            Number of calls waiting for max_concurrency limit, other calls
+            are rejected (the default is 0)
+        busy_error : JSONRPCError class or instance, optional
+            Error to reject calls with (the default is JSONRPCServerBusy)
+        timeout : float, optional
+            Seconds to wait for the result, Request timeout error is
+            returned after that. Plain functions with timeout are called in
+            the shared thread pool, unless executor is given
+        cache : jsonrpc.cache.BaseCache, optional
+            Cache to store results in, method is called once for the same
+            params while result is stored, see :mod:`jsonrpc.cache`. Not
+            allowed with context_arg
+        idempotent : bool, optional
+            Calls with the same params have the same result and no other
+            effect, identical calls in a batch are executed once if the
+            manager deduplicates them (the default is False)
+        single_flight : bool, optional
+            Concurrent calls with the same params wait for the first one
+            and get its result or error, see :mod:`jsonrpc.singleflight`.
+            Not allowed with context_arg (the default is False)
 
         Notes
         -----
@@ -115,17 +365,93 @@ class Dispatcher(MutableMapping):
             def mymethod(context):
                 print(context)
 
+        Or use as a decorator that validates params with JSON Schema
+        >>> d = Dispatcher()
+        >>> @d.add_method(params_schema={
+                "type": "object", "required": ["a"],
+                "properties": {"a": {"type": "integer"}}})
+            def mymethod(a):
+                return a
+
+        Or use as a decorator that converts params to annotated types
+        >>> d = Dispatcher()
+        >>> @d.add_method(coerce=True)
+            def mymethod(day: datetime.date):
+                return day.weekday()
+
+        Or add a CPU-heavy function, which is called in the process pool
+        >>> d = Dispatcher()
+        >>> d.add_method(math.factorial, executor="process")
+
+        Or store results of a method for 10 seconds
+        >>> d = Dispatcher()
+        >>> @d.add_method(cache=TTLCache(maxsize=1024, ttl=10))
+            def get_config(name):
+                return db.get_config(name)
+
+        Or execute an expensive method once for concurrent identical calls
+        >>> d = Dispatcher()
+        >>> @d.add_method(single_flight=True, timeout=10)
+            def get_report(day):
+                return db.build_report(day)
+
+        Or limit number of concurrent calls of a slow method
+        >>> d = Dispatcher()
+        >>> @d.add_method(max_concurrency=4, max_queue=16)
+            def report(day):
+                return db.build_report(day)
+
         """
-        if (name or context_arg) and not f:
+        if f is None:
             return functools.partial(self.add_method, name=name,
-                                     context_arg=context_arg)
-
-        name = name or f.__name__
-        self.method_map[name] = f
-        if context_arg:
-            self.context_arg_for_method[name] = context_arg
+                                     context_arg=context_arg, coerce=coerce,
+                                     params_schema=params_schema,
+                                     executor=executor,
+                                     max_concurrency=max_concurrency,
+                                     max_queue=max_queue,
+                                     busy_error=busy_error,
+                                     timeout=timeout, cache=cache,
+                                     idempotent=idempotent,
+                                     single_flight=single_flight)
+
+        self.add_plan(name or f.__name__, MethodPlan(
+            f, context_arg=context_arg, coerce=coerce,
+            params_schema=params_schema, executor=executor,
+            max_concurrency=max_concurrency, max_queue=max_queue,
+            busy_error=busy_error, timeout=timeout, cache=cache,
+            idempotent=idempotent, single_flight=single_flight))
         return f
 
+    def add_plan(self, name, plan):
+        """ Add a method with its call plan.
+
+        Parameters
+        ----------
+        name : str
+            Name to register.
+        plan : MethodPlan
+            Method and its options.
+
+        """
+        self.method_map[name] = plan.method
+        self.plan_for_method[name] = plan
+
+    def invalidate(self, name, params=NOT_SET):
+        """ Delete cached results of a method.
+
+        Parameters
+        ----------
+        name : str
+            Name of the method.
+        params : list or dict, optional
+            Params of the call to delete result of, results for all params
+            are deleted by default.
+
+        """
+        plan = self.plan_for_method.get(name)
+        if plan is not None and plan.cache is not None:
+            plan.cache.invalidate(name, params)
+
     def build_method_map(self, prototype, prefix=''):
         """ Add prototype methods to the dispatcher.
 
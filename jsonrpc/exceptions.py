@@ -1,7 +1,41 @@
 """ JSON-RPC Exceptions."""
-from . import six
 import json
 
+from . import six
+from .codec import dumps, loads
+
+_cached_errors = dict()
+
+
+class JSONRPCErrorData(dict):
+
+    """ Read-only error object with its json encoded in advance.
+
+    Instances are shared between responses (see
+    :meth:`JSONRPCError.cached_data`), so they could not be modified.
+    Response encoder inserts :attr:`encoded` instead of serializing the dict.
+
+    .. versionadded: 1.16.0
+
+    """
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, *args, **kwargs):
+        super(JSONRPCErrorData, self).__init__(*args, **kwargs)
+        self.encoded = json.dumps(
+            self, separators=(",", ":")).encode("utf-8")
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Error data is read-only")
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        # Copies are regular dicts, which could be modified.
+        return dict, (dict(self),)
+
 
 class JSONRPCError(object):
 
@@ -34,8 +68,8 @@ class JSONRPCError(object):
 
     """
 
-    serialize = staticmethod(json.dumps)
-    deserialize = staticmethod(json.loads)
+    serialize = staticmethod(dumps)
+    deserialize = staticmethod(loads)
 
     def __init__(self, code=None, message=None, data=None):
         self._data = dict()
@@ -84,6 +118,25 @@ class JSONRPCError(object):
     def json(self):
         return self.serialize(self._data)
 
+    @classmethod
+    def cached_data(cls):
+        """ Shared error object of error class with constant code and message.
+
+        Standard errors (parse error, invalid request, method not found, ...)
+        do not have data, so their error objects are created and encoded only
+        once.
+
+        :return JSONRPCErrorData:
+
+        .. versionadded: 1.16.0
+
+        """
+        try:
+            return _cached_errors[cls]
+        except KeyError:
+            data = _cached_errors[cls] = JSONRPCErrorData(cls()._data)
+            return data
+
 
 class JSONRPCParseError(JSONRPCError):
 
@@ -158,6 +211,34 @@ class JSONRPCServerError(JSONRPCError):
     MESSAGE = "Server error"
 
 
+class JSONRPCServerBusy(JSONRPCError):
+
+    """ Server busy.
+
+    Method is called by too many clients at the same time, call is rejected.
+
+    .. versionadded: 1.16.0
+
+    """
+
+    CODE = -32001
+    MESSAGE = "Server busy"
+
+
+class JSONRPCRequestTimeout(JSONRPCError):
+
+    """ Request timeout.
+
+    Method did not complete within its timeout or before request deadline.
+
+    .. versionadded: 1.16.0
+
+    """
+
+    CODE = -32002
+    MESSAGE = "Request timeout"
+
+
 class JSONRPCException(Exception):
 
     """ JSON-RPC Exception."""
@@ -0,0 +1,159 @@
+""" Executors to run methods in.
+
+Methods added with ``Dispatcher.add_method(executor=...)`` are called in
+the executor instead of the thread handling the request:
+
+* "inline" - called directly, the default;
+* "thread" - called in the shared thread pool;
+* "process" - called in the shared process pool, method and its params
+  should be picklable;
+* :class:`concurrent.futures.Executor` instance - called in it.
+
+Shared pools are created on first use. Every executor is wrapped with
+:class:`TrackedExecutor`, which counts calls submitted to it, see
+:func:`get_executor_stats`.
+
+.. versionadded: 1.16.0
+
+"""
+import pickle
+import threading
+
+try:
+    from concurrent.futures import (
+        ProcessPoolExecutor,
+        ThreadPoolExecutor,
+        TimeoutError as FuturesTimeoutError,
+    )
+except ImportError:
+    # Python 2 without futures backport.
+    ProcessPoolExecutor = ThreadPoolExecutor = FuturesTimeoutError = None
+
+INLINE = "inline"
+THREAD = "thread"
+PROCESS = "process"
+
+_lock = threading.Lock()
+_executors = dict()
+
+
+class TrackedExecutor(object):
+
+    """ Executor wrapper, which counts submitted calls.
+
+    :param executor: :class:`concurrent.futures.Executor` to submit calls to.
+    :param str name: name in :func:`get_executor_stats`.
+
+    """
+
+    def __init__(self, executor, name):
+        self.executor = executor
+        self.name = name
+        self.submitted = 0
+        self.completed = 0
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self):
+        """ Number of submitted calls, which are not completed yet."""
+        return self.submitted - self.completed
+
+    def _complete(self, future):
+        with self._lock:
+            self.completed += 1
+
+    def submit(self, fn, *args, **kwargs):
+        """ Submit call to the executor.
+
+        :return concurrent.futures.Future:
+
+        """
+        with self._lock:
+            self.submitted += 1
+        try:
+            future = self.executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._complete(None)
+            raise
+        future.add_done_callback(self._complete)
+        return future
+
+    def stats(self):
+        """ Counters of the executor.
+
+        :return dict: submitted, completed and queue_depth.
+
+        """
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "queue_depth": self.submitted - self.completed,
+            }
+
+
+def _create_executor(name):
+    if ThreadPoolExecutor is None:
+        raise ValueError(
+            "{0!r} executor requires concurrent.futures, install futures "
+            "package on python 2".format(name))
+    if name == THREAD:
+        return ThreadPoolExecutor()
+    return ProcessPoolExecutor()
+
+
+def get_executor(executor):
+    """ Tracked executor for add_method executor option.
+
+    :param executor: "inline", "thread", "process", executor instance or
+        None.
+    :return TrackedExecutor: None for inline execution.
+    :raises ValueError: unknown executor name.
+
+    """
+    if executor is None or executor == INLINE:
+        return None
+    if isinstance(executor, TrackedExecutor):
+        return executor
+    is_shared = executor in (THREAD, PROCESS)
+    if not is_shared and not callable(getattr(executor, "submit", None)):
+        raise ValueError("Unknown executor {0!r}".format(executor))
+
+    if is_shared:
+        name = executor
+    else:
+        # Tracked executor keeps reference to the instance, so its id is not
+        # reused while it is registered.
+        name = "{0}-{1:x}".format(executor.__class__.__name__, id(executor))
+
+    with _lock:
+        tracked = _executors.get(name)
+        if tracked is None:
+            tracked = _executors[name] = TrackedExecutor(
+                _create_executor(name) if is_shared else executor, name)
+        return tracked
+
+
+def get_executor_stats():
+    """ Counters of executors used by methods, for monitoring.
+
+    :return dict: executor name -> :meth:`TrackedExecutor.stats`.
+
+    """
+    with _lock:
+        executors = list(_executors.values())
+    return dict((tracked.name, tracked.stats()) for tracked in executors)
+
+
+def check_picklable(method):
+    """ Check that method could be sent to process pool.
+
+    :raises ValueError: method could not be pickled.
+
+    """
+    try:
+        pickle.dumps(method)
+    except Exception as e:
+        raise ValueError(
+            "Method {0!r} could not be pickled to run in process pool: "
+            "{1}".format(method, e))
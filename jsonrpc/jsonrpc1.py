@@ -1,7 +1,8 @@
 from . import six
 
-from .base import JSONRPCBaseRequest, JSONRPCBaseResponse
+from .base import NOT_SET, JSONRPCBaseRequest, JSONRPCBaseResponse
 from .exceptions import JSONRPCInvalidRequestException, JSONRPCError
+from .utils import RawJSON
 
 
 class JSONRPC10Request(JSONRPCBaseRequest):
@@ -23,59 +24,65 @@ class JSONRPC10Request(JSONRPCBaseRequest):
     REQUIRED_FIELDS = set(["method", "params", "id"])
     POSSIBLE_FIELDS = set(["method", "params", "id"])
 
+    __slots__ = ("_is_notification",)
+
     @property
     def data(self):
-        data = dict((k, v) for k, v in self._data.items())
-        data["id"] = None if self.is_notification else data["id"]
-        return data
+        return {
+            "method": self._method,
+            "params": self._params,
+            "id": None if self.is_notification else self._id_value,
+        }
 
     @data.setter
     def data(self, value):
         if not isinstance(value, dict):
             raise ValueError("data should be dict")
 
-        self._data = value
+        self._method = value.get("method")
+        self._params = value.get("params")
+        self._id_value = value.get("id")
 
     @property
     def method(self):
-        return self._data.get("method")
+        return self._method
 
     @method.setter
     def method(self, value):
         if not isinstance(value, six.string_types):
             raise ValueError("Method should be string")
 
-        self._data["method"] = str(value)
+        self._method = str(value)
 
     @property
     def params(self):
-        return self._data.get("params")
+        return self._params
 
     @params.setter
     def params(self, value):
         if not isinstance(value, (list, tuple)):
             raise ValueError("Incorrect params {0}".format(value))
 
-        self._data["params"] = list(value)
+        self._params = list(value)
 
     @property
     def _id(self):
-        return self._data.get("id")
+        return self._id_value
 
     @_id.setter
     def _id(self, value):
-        self._data["id"] = value
+        self._id_value = value
 
     @property
     def is_notification(self):
-        return self._data["id"] is None or self._is_notification
+        return self._id_value is None or self._is_notification
 
     @is_notification.setter
     def is_notification(self, value):
         if value is None:
-            value = self._id is None
+            value = self._id_value is None
 
-        if self._id is None and not value:
+        if self._id_value is None and not value:
             raise ValueError("Can not set attribute is_notification. " +
                              "Request id should not be None")
 
@@ -106,9 +113,18 @@ class JSONRPC10Response(JSONRPCBaseResponse):
 
     JSONRPC_VERSION = "1.0"
 
+    __slots__ = ()
+
     @property
     def data(self):
-        data = dict((k, v) for k, v in self._data.items())
+        data = {}
+        result = self._result
+        if result is not NOT_SET:
+            data["result"] = result.loads() if isinstance(result, RawJSON) \
+                else result
+        if self._error is not None:
+            data["error"] = self._error
+        data["id"] = self._id_value
         return data
 
     @data.setter
@@ -116,36 +132,38 @@ class JSONRPC10Response(JSONRPCBaseResponse):
         if not isinstance(value, dict):
             raise ValueError("data should be dict")
 
-        self._data = value
+        self._result = value.get("result", NOT_SET)
+        self._error = value.get("error")
+        self._id_value = value.get("id")
 
     @property
     def result(self):
-        return self._data.get("result")
+        result = self._result
+        return None if result is NOT_SET else result
 
     @result.setter
     def result(self, value):
         if self.error:
             raise ValueError("Either result or error should be used")
-        self._data["result"] = value
+        self._result = value
 
     @property
     def error(self):
-        return self._data.get("error")
+        return self._error
 
     @error.setter
     def error(self, value):
-        self._data.pop('value', None)
         if value:
-            self._data["error"] = value
+            self._error = value
             # Test error
             JSONRPCError(**value)
 
     @property
     def _id(self):
-        return self._data.get("id")
+        return self._id_value
 
     @_id.setter
     def _id(self, value):
         if value is None:
             raise ValueError("id could not be null for JSON-RPC1.0 Response")
-        self._data["id"] = value
+        self._id_value = value
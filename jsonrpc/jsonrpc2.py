@@ -1,8 +1,33 @@
 ﻿from . import six
-import json
 
-from .exceptions import JSONRPCError, JSONRPCInvalidRequestException
-from .base import JSONRPCBaseRequest, JSONRPCBaseResponse
+from .codec import dumps, get_codec
+from .exceptions import (
+    JSONRPCError,
+    JSONRPCErrorData,
+    JSONRPCInvalidRequestException,
+)
+from .base import NOT_SET, JSONRPCBaseRequest, JSONRPCBaseResponse
+from .utils import RawJSON
+
+RESERVED_METHOD_MESSAGE = (
+    "Method names that begin with the word rpc followed by a " +
+    "period character (U+002E or ASCII 46) are reserved for " +
+    "rpc-internal methods and extensions and MUST NOT be used " +
+    "for anything else.")
+
+_request_parsers = dict()
+
+# Constant parts of JSON-RPC 2.0 response. Response is serialized by joining
+# them with encoded result (or error) and id.
+RESULT_PREFIX = b'{"jsonrpc":"2.0","result":'
+ERROR_PREFIX = b'{"jsonrpc":"2.0","error":'
+ID_PREFIX = b',"id":'
+ID_NULL_SUFFIX = b',"id":null}'
+
+# Streaming batch response encoder yields chunks of at least ITER_CHUNK_SIZE
+# bytes, encoding up to ITER_GROUP_SIZE plain responses with one codec call.
+ITER_CHUNK_SIZE = 64 * 1024
+ITER_GROUP_SIZE = 256
 
 
 class JSONRPC20Request(JSONRPCBaseRequest):
@@ -46,13 +71,15 @@ class JSONRPC20Request(JSONRPCBaseRequest):
     REQUIRED_FIELDS = set(["jsonrpc", "method"])
     POSSIBLE_FIELDS = set(["jsonrpc", "method", "params", "id"])
 
+    __slots__ = ()
+
     @property
     def data(self):
-        data = dict(
-            (k, v) for k, v in self._data.items()
-            if not (k == "id" and self.is_notification)
-        )
-        data["jsonrpc"] = self.JSONRPC_VERSION
+        data = {"jsonrpc": self.JSONRPC_VERSION, "method": self._method}
+        if self._params is not None:
+            data["params"] = self._params
+        if not self.is_notification:
+            data["id"] = self._id_value
         return data
 
     @data.setter
@@ -60,11 +87,13 @@ class JSONRPC20Request(JSONRPCBaseRequest):
         if not isinstance(value, dict):
             raise ValueError("data should be dict")
 
-        self._data = value
+        self._method = value.get("method")
+        self._params = value.get("params")
+        self._id_value = value.get("id")
 
     @property
     def method(self):
-        return self._data.get("method")
+        return self._method
 
     @method.setter
     def method(self, value):
@@ -72,31 +101,24 @@ class JSONRPC20Request(JSONRPCBaseRequest):
             raise ValueError("Method should be string")
 
         if value.startswith("rpc."):
-            raise ValueError(
-                "Method names that begin with the word rpc followed by a " +
-                "period character (U+002E or ASCII 46) are reserved for " +
-                "rpc-internal methods and extensions and MUST NOT be used " +
-                "for anything else.")
+            raise ValueError(RESERVED_METHOD_MESSAGE)
 
-        self._data["method"] = str(value)
+        self._method = str(value)
 
     @property
     def params(self):
-        return self._data.get("params")
+        return self._params
 
     @params.setter
     def params(self, value):
         if value is not None and not isinstance(value, (list, tuple, dict)):
             raise ValueError("Incorrect params {0}".format(value))
 
-        value = list(value) if isinstance(value, tuple) else value
-
-        if value is not None:
-            self._data["params"] = value
+        self._params = list(value) if isinstance(value, tuple) else value
 
     @property
     def _id(self):
-        return self._data.get("id")
+        return self._id_value
 
     @_id.setter
     def _id(self, value):
@@ -104,7 +126,7 @@ class JSONRPC20Request(JSONRPCBaseRequest):
            not isinstance(value, six.string_types + six.integer_types):
             raise ValueError("id should be string or integer")
 
-        self._data["id"] = value
+        self._id_value = value
 
     @classmethod
     def from_json(cls, json_str):
@@ -119,27 +141,98 @@ class JSONRPC20Request(JSONRPCBaseRequest):
         if not data:
             raise JSONRPCInvalidRequestException("[] value is not accepted")
 
-        if not all(isinstance(d, dict) for d in data):
+        parse = get_request_parser(cls)
+        result = [parse(d) for d in data]
+        return JSONRPC20BatchRequest(*result) if is_batch else result[0]
+
+    @classmethod
+    def _from_validated(cls, method, params, _id, is_notification):
+        """ Create request from already validated values.
+
+        Property setters are skipped, values are expected to be checked by
+        :func:`compile_request_parser` parser.
+
+        """
+        request = cls.__new__(cls)
+        request._method = method
+        request._params = params
+        request._id_value = _id
+        request.is_notification = is_notification
+        return request
+
+
+def get_request_parser(cls):
+    """ Cached :func:`compile_request_parser` parser for request class.
+
+    .. versionadded: 1.16.0
+
+    """
+    try:
+        return _request_parsers[cls]
+    except KeyError:
+        parse = _request_parsers[cls] = compile_request_parser(cls)
+        return parse
+
+
+def compile_request_parser(cls):
+    """ Build single pass parser of request objects for request class.
+
+    Parser checks keys and value types of a parsed request object (dict) in
+    one pass and creates request object directly, without going through
+    validating property setters.
+
+    :param type cls: JSONRPC20Request class or subclass.
+    :return function: dict -> cls, raises JSONRPCInvalidRequestException.
+
+    .. versionadded: 1.16.0
+
+    """
+    required = tuple(cls.REQUIRED_FIELDS)
+    possible = frozenset(cls.POSSIBLE_FIELDS)
+    create = cls._from_validated
+    string_types = six.string_types
+    id_types = six.string_types + six.integer_types
+
+    def invalid_fields(d):
+        extra = set(d.keys()) - possible
+        missed = set(required) - set(d.keys())
+        msg = "Invalid request. Extra fields: {0}, Missed fields: {1}"
+        return JSONRPCInvalidRequestException(msg.format(extra, missed))
+
+    def parse(d):
+        if not isinstance(d, dict):
             raise JSONRPCInvalidRequestException(
                 "Each request should be an object (dict)")
 
-        result = []
-        for d in data:
-            if not cls.REQUIRED_FIELDS <= set(d.keys()) <= cls.POSSIBLE_FIELDS:
-                extra = set(d.keys()) - cls.POSSIBLE_FIELDS
-                missed = cls.REQUIRED_FIELDS - set(d.keys())
-                msg = "Invalid request. Extra fields: {0}, Missed fields: {1}"
-                raise JSONRPCInvalidRequestException(msg.format(extra, missed))
-
-            try:
-                result.append(JSONRPC20Request(
-                    method=d["method"], params=d.get("params"),
-                    _id=d.get("id"), is_notification="id" not in d,
-                ))
-            except ValueError as e:
-                raise JSONRPCInvalidRequestException(str(e))
+        if not possible.issuperset(d):
+            raise invalid_fields(d)
 
-        return JSONRPC20BatchRequest(*result) if is_batch else result[0]
+        for field in required:
+            if field not in d:
+                raise invalid_fields(d)
+
+        method = d["method"]
+        if not isinstance(method, string_types):
+            raise JSONRPCInvalidRequestException("Method should be string")
+
+        if method.startswith("rpc."):
+            raise JSONRPCInvalidRequestException(RESERVED_METHOD_MESSAGE)
+
+        params = d.get("params")
+        if params is not None and not isinstance(params, (list, dict)):
+            if not isinstance(params, tuple):
+                raise JSONRPCInvalidRequestException(
+                    "Incorrect params {0}".format(params))
+            params = list(params)
+
+        _id = d.get("id")
+        if _id is not None and not isinstance(_id, id_types):
+            raise JSONRPCInvalidRequestException(
+                "id should be string or integer")
+
+        return create(str(method), params, _id, "id" not in d)
+
+    return parse
 
 
 class JSONRPC20BatchRequest(object):
@@ -151,6 +244,7 @@ class JSONRPC20BatchRequest(object):
     """
 
     JSONRPC_VERSION = "2.0"
+    serialize = staticmethod(dumps)
 
     def __init__(self, *requests):
         self.requests = requests
@@ -161,7 +255,7 @@ class JSONRPC20BatchRequest(object):
 
     @property
     def json(self):
-        return json.dumps([r.data for r in self.requests])
+        return self.serialize([r.data for r in self.requests])
 
     def __iter__(self):
         return iter(self.requests)
@@ -200,43 +294,54 @@ class JSONRPC20Response(JSONRPCBaseResponse):
 
     JSONRPC_VERSION = "2.0"
 
+    __slots__ = ()
+
     @property
     def data(self):
-        data = dict((k, v) for k, v in self._data.items())
-        data["jsonrpc"] = self.JSONRPC_VERSION
+        data = {"jsonrpc": self.JSONRPC_VERSION}
+        result = self._result
+        if result is not NOT_SET:
+            data["result"] = result.loads() if isinstance(result, RawJSON) \
+                else result
+        if self._error is not None:
+            data["error"] = self._error
+        data["id"] = self._id_value
         return data
 
     @data.setter
     def data(self, value):
         if not isinstance(value, dict):
             raise ValueError("data should be dict")
-        self._data = value
+
+        self._result = value.get("result", NOT_SET)
+        self._error = value.get("error")
+        self._id_value = value.get("id")
 
     @property
     def result(self):
-        return self._data.get("result")
+        result = self._result
+        return None if result is NOT_SET else result
 
     @result.setter
     def result(self, value):
         if self.error:
             raise ValueError("Either result or error should be used")
-        self._data["result"] = value
+        self._result = value
 
     @property
     def error(self):
-        return self._data.get("error")
+        return self._error
 
     @error.setter
     def error(self, value):
-        self._data.pop('value', None)
         if value:
-            self._data["error"] = value
+            self._error = value
             # Test error
             JSONRPCError(**value)
 
     @property
     def _id(self):
-        return self._data.get("id")
+        return self._id_value
 
     @_id.setter
     def _id(self, value):
@@ -244,12 +349,58 @@ class JSONRPC20Response(JSONRPCBaseResponse):
            not isinstance(value, six.string_types + six.integer_types):
             raise ValueError("id should be string or integer")
 
-        self._data["id"] = value
+        self._id_value = value
+
+    def encode(self, codec=None):
+        """ Serialize response to utf-8 encoded json bytes.
+
+        Only result (or error) and id are encoded, the rest of the message
+        is precomputed. :class:`~jsonrpc.utils.RawJSON` result and
+        :class:`~jsonrpc.exceptions.JSONRPCErrorData` error are not encoded
+        either, they are inserted as is.
+
+        :param codec: codec name or instance, default codec if not set.
+        :return bytes:
+
+        .. versionadded: 1.16.0
+
+        """
+        return self._encode(get_codec(codec).dumps_bytes)
+
+    def _encode(self, dumps_bytes):
+        error = self._error
+        if error is not None:
+            prefix = ERROR_PREFIX
+            if type(error) is JSONRPCErrorData:
+                value = error.encoded
+            else:
+                value = dumps_bytes(error)
+        else:
+            result = self._result
+            prefix = RESULT_PREFIX
+            if isinstance(result, RawJSON):
+                value = result.encoded
+            else:
+                value = dumps_bytes(None if result is NOT_SET else result)
+
+        _id = self._id_value
+        if _id is None:
+            return b"".join((prefix, value, ID_NULL_SUFFIX))
+        elif type(_id) is int:
+            _id = str(_id).encode("ascii")
+        else:
+            _id = dumps_bytes(_id)
+        return b"".join((prefix, value, ID_PREFIX, _id, b"}"))
+
+    def _has_encoded_parts(self):
+        return isinstance(self._result, RawJSON) or \
+            type(self._error) is JSONRPCErrorData
 
 
 class JSONRPC20BatchResponse(object):
 
     JSONRPC_VERSION = "2.0"
+    serialize = staticmethod(dumps)
 
     def __init__(self, *responses):
         self.responses = responses
@@ -261,7 +412,105 @@ class JSONRPC20BatchResponse(object):
 
     @property
     def json(self):
-        return json.dumps(self.data)
+        return self.serialize(self.data)
+
+    def encode(self, codec=None):
+        """ Serialize responses to utf-8 encoded json array.
+
+        Responses with already encoded parts (see
+        :meth:`JSONRPC20Response.encode`) are encoded one by one and joined.
+        Runs of other responses are encoded with a single codec call, which
+        is faster for many small results than encoding them one by one.
+
+        :param codec: codec name or instance, default codec if not set.
+        :return bytes:
+
+        .. versionadded: 1.16.0
+
+        """
+        dumps_bytes = get_codec(codec).dumps_bytes
+        chunks = []
+        plain = []
+        for response in self.responses:
+            if response._has_encoded_parts():
+                if plain:
+                    chunks.append(dumps_bytes(plain)[1:-1])
+                    plain = []
+                chunks.append(response._encode(dumps_bytes))
+            else:
+                plain.append(response.data)
+
+        if not chunks:
+            return dumps_bytes(plain)
+
+        if plain:
+            chunks.append(dumps_bytes(plain)[1:-1])
+        return b"[" + b",".join(chunks) + b"]"
+
+    def iter_bytes(self, codec=None, chunk_size=ITER_CHUNK_SIZE):
+        """ Serialize responses to utf-8 encoded json array chunk by chunk.
+
+        Unlike :meth:`encode`, whole output is never held in memory: runs of
+        responses are encoded in groups of ``ITER_GROUP_SIZE`` elements and
+        yielded once at least ``chunk_size`` bytes are collected. Chunks
+        joined together are equal to :meth:`encode` output up to whitespace.
+
+        :param codec: codec name or instance, default codec if not set.
+        :param int chunk_size: minimal size of yielded chunk, last one could
+            be smaller.
+        :return iterator(bytes):
+
+        .. versionadded: 1.16.0
+
+        """
+        dumps_bytes = get_codec(codec).dumps_bytes
+        buffer = [b"["]
+        size = 1
+        separator = b""
+        plain = []
+        for response in self.responses:
+            if response._has_encoded_parts():
+                parts = [response._encode(dumps_bytes)]
+                if plain:
+                    parts.insert(0, dumps_bytes(plain)[1:-1])
+                    plain = []
+            elif len(plain) < ITER_GROUP_SIZE:
+                plain.append(response.data)
+                continue
+            else:
+                parts = [dumps_bytes(plain)[1:-1]]
+                plain = [response.data]
+
+            for part in parts:
+                buffer.append(separator)
+                buffer.append(part)
+                size += len(part) + 1
+                separator = b","
+
+            if size >= chunk_size:
+                yield b"".join(buffer)
+                buffer = []
+                size = 0
+
+        if plain:
+            buffer.append(separator)
+            buffer.append(dumps_bytes(plain)[1:-1])
+        buffer.append(b"]")
+        yield b"".join(buffer)
+
+    def iter_json(self, codec=None, chunk_size=ITER_CHUNK_SIZE):
+        """ Serialize responses to json array chunk by chunk.
+
+        Text version of :meth:`iter_bytes`, chunks are split between
+        elements, so every chunk is a valid utf-8 sequence.
+
+        :return iterator(str):
+
+        .. versionadded: 1.16.0
+
+        """
+        for chunk in self.iter_bytes(codec, chunk_size):
+            yield chunk.decode("utf-8")
 
     def __iter__(self):
         return iter(self.responses)
@@ -1,5 +1,12 @@
-import json
+import functools
 import logging
+import time
+
+from .base import NOT_SET
+from .cache import get_params_key
+from .codec import get_codec
+from .dispatcher import Dispatcher, MethodPlan
+from .executors import FuturesTimeoutError, ThreadPoolExecutor
 from .utils import is_invalid_params
 from .exceptions import (
     JSONRPCInvalidParams,
@@ -7,16 +14,22 @@ from .exceptions import (
     JSONRPCInvalidRequestException,
     JSONRPCMethodNotFound,
     JSONRPCParseError,
+    JSONRPCRequestTimeout,
     JSONRPCServerError,
     JSONRPCDispatchException,
 )
 from .jsonrpc1 import JSONRPC10Response
 from .jsonrpc2 import (
+    ITER_CHUNK_SIZE,
     JSONRPC20BatchRequest,
     JSONRPC20BatchResponse,
+    JSONRPC20Request,
     JSONRPC20Response,
+    get_request_parser,
 )
 from .jsonrpc import JSONRPCRequest
+from .schema import SchemaValidationError
+from .stream import JSONArrayStream
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +47,10 @@ class JSONRPCResponseManager(object):
 
     :param dict dispatcher: dict<function_name:function>.
 
+    :param codec: :class:`~jsonrpc.codec.JSONCodec` instance or codec name
+        used to parse request and serialize response. Defaults to
+        dispatcher's codec, if any, otherwise to default codec.
+
     """
 
     RESPONSE_CLASS_MAP = {
@@ -41,39 +58,382 @@ class JSONRPCResponseManager(object):
         "2.0": JSONRPC20Response,
     }
 
-    @classmethod
-    def handle(cls, request_str, dispatcher, context=None):
-        if isinstance(request_str, bytes):
-            request_str = request_str.decode("utf-8")
+    @staticmethod
+    def _get_codec(dispatcher, codec=None):
+        """ Codec to use with dispatcher.
 
+        :return jsonrpc.codec.JSONCodec:
+
+        .. versionadded: 1.16.0
+
+        """
+        if codec is None:
+            codec = getattr(dispatcher, "codec", None)
+        return get_codec(codec)
+
+    @staticmethod
+    def _parse_request(request_str, codec):
+        """ Parse request, build error response if it is not valid.
+
+        :return tuple: (request, None) or (None, error response).
+
+        .. versionadded: 1.16.0
+
+        """
         try:
-            data = json.loads(request_str)
+            data = codec.loads(request_str)
         except (TypeError, ValueError):
-            return JSONRPC20Response(error=JSONRPCParseError()._data)
+            response = JSONRPC20Response._from_error(
+                JSONRPCParseError.cached_data())
+            response.serialize = codec.dumps
+            return None, response
 
         try:
-            request = JSONRPCRequest.from_data(data)
+            return JSONRPCRequest.from_data(data), None
         except JSONRPCInvalidRequestException:
-            return JSONRPC20Response(error=JSONRPCInvalidRequest()._data)
+            response = JSONRPC20Response._from_error(
+                JSONRPCInvalidRequest.cached_data())
+            response.serialize = codec.dumps
+            return None, response
 
-        return cls.handle_request(request, dispatcher, context)
+    @classmethod
+    def handle(cls, request_str, dispatcher, context=None, codec=None,
+               executor=None, max_workers=None, deadline=None,
+               notifications=None, deduplicate=False):
+        codec = cls._get_codec(dispatcher, codec)
+        request, response = cls._parse_request(request_str, codec)
+        if request is None:
+            return response
+
+        return cls.handle_request(
+            request, dispatcher, context, codec=codec, executor=executor,
+            max_workers=max_workers, deadline=deadline,
+            notifications=notifications, deduplicate=deduplicate)
 
     @classmethod
-    def handle_request(cls, request, dispatcher, context=None):
+    def handle_bytes(cls, request_bytes, dispatcher, context=None,
+                     codec=None, executor=None, max_workers=None,
+                     deadline=None, notifications=None, deduplicate=False):
+        """ Handle binary request, return binary response.
+
+        Request is passed to the codec as is, without decoding it to str
+        first, and response is encoded directly to bytes. Codecs which work
+        with bytes natively (orjson) do not make intermediate text copies.
+        Other options are the same as of :meth:`handle_request`.
+
+        :param request_bytes: utf-8 encoded request.
+        :type request_bytes: bytes or bytearray or memoryview
+        :return bytes: utf-8 encoded response, empty for notifications.
+
+        .. versionadded: 1.16.0
+
+        """
+        codec = cls._get_codec(dispatcher, codec)
+        response = cls.handle(
+            request_bytes, dispatcher, context, codec=codec, executor=executor,
+            max_workers=max_workers, deadline=deadline,
+            notifications=notifications, deduplicate=deduplicate)
+        if response is None:
+            return b""
+        return response.encode(codec)
+
+    @classmethod
+    def handle_stream(cls, stream, dispatcher, context=None, codec=None,
+                      chunk_size=ITER_CHUNK_SIZE):
+        """ Handle request read from file-like object, incrementally.
+
+        Batch request is parsed element by element and every request is
+        dispatched as soon as it is parsed, its response is encoded and
+        yielded in chunks of at least ``chunk_size`` bytes. Neither whole
+        batch nor whole response is kept in memory.
+
+        Since earlier requests are already executed when a batch turns out to
+        be malformed, errors are reported per element: invalid element gets
+        Invalid Request error and malformed json ends response array with a
+        Parse error. Not batch requests are handled with
+        :meth:`handle_bytes`.
+
+        Batch elements are parsed with standard library json decoder, codec
+        is used to encode response.
+
+        :param stream: object with ``read(size)`` method, e.g. file, WSGI
+            input or socket file.
+        :return iterator(bytes): utf-8 encoded response chunks, nothing for
+            notifications.
+
+        .. versionadded: 1.16.0
+
+        """
+        codec = cls._get_codec(dispatcher, codec)
+        reader = JSONArrayStream(stream)
+        try:
+            is_array = reader.is_array
+            request_str = None if is_array else reader.read()
+        except ValueError:
+            # Input is not valid utf-8.
+            response = JSONRPC20Response._from_error(
+                JSONRPCParseError.cached_data())
+            yield response.encode(codec)
+            return
+
+        if not is_array:
+            response = cls.handle_bytes(request_str, dispatcher, context,
+                                        codec=codec)
+            if response:
+                yield response
+            return
+
+        dumps_bytes = codec.dumps_bytes
+        parse = get_request_parser(JSONRPC20Request)
+        elements = iter(reader)
+        # Response array is opened with the first chunk, it is not sent at
+        # all if batch consists of notifications only.
+        prefix = b"["
+        buffer = []
+        size = 0
+        is_empty = True
+        while True:
+            try:
+                data = next(elements)
+            except StopIteration:
+                break
+            except ValueError:
+                is_empty = False
+                response = JSONRPC20Response._from_error(
+                    JSONRPCParseError.cached_data())
+                buffer.append(response._encode(dumps_bytes))
+                break
+
+            is_empty = False
+            try:
+                requests = [parse(data)]
+            except JSONRPCInvalidRequestException:
+                response = JSONRPC20Response._from_error(
+                    JSONRPCInvalidRequest.cached_data())
+                buffer.append(response._encode(dumps_bytes))
+                size += len(buffer[-1])
+                requests = []
+
+            for response in cls._get_responses(
+                    requests, dispatcher, context, codec):
+                buffer.append(response._encode(dumps_bytes))
+                size += len(buffer[-1])
+
+            if size >= chunk_size:
+                yield prefix + b",".join(buffer)
+                prefix = b","
+                buffer = []
+                size = 0
+
+        if is_empty:
+            response = JSONRPC20Response._from_error(
+                JSONRPCInvalidRequest.cached_data())
+            yield response.encode(codec)
+        elif buffer:
+            yield prefix + b",".join(buffer) + b"]"
+        elif prefix == b",":
+            yield b"]"
+
+    @classmethod
+    def handle_request(cls, request, dispatcher, context=None, codec=None,
+                       executor=None, max_workers=None, deadline=None,
+                       notifications=None, deduplicate=False):
         """ Handle request data.
 
         At this moment request has correct jsonrpc format.
 
+        Members of a batch request are executed one by one, unless
+        ``executor`` or ``max_workers`` is given. Then they are executed in
+        parallel, in the executor or in a thread pool with ``max_workers``
+        threads created for this batch, and every member gets its own copy
+        of the context. Responses are returned in order of requests.
+
+        Requests received after the ``deadline`` are not executed. Calls in
+        executors (parallel batch members and methods with executor or
+        timeout) are not waited for after the deadline, Request timeout
+        error is returned instead.
+
         :param dict request: data parsed from request_str.
         :param jsonrpc.dispatcher.Dispatcher dispatcher:
+        :param executor: :class:`concurrent.futures.Executor` to execute
+            batch members in.
+        :param int max_workers: size of the thread pool to execute batch
+            members in, if executor is not given.
+        :param float deadline: time (as returned by :func:`time.time`) to
+            respond before, e.g. from a transport header.
+        :param notifications: :class:`~jsonrpc.notifications.NotificationQueue`
+            to execute notifications in background, they are executed before
+            the response otherwise.
+        :param bool deduplicate: execute identical calls (same method and
+            params) of idempotent methods in a batch once, their response is
+            copied to every call with its id.
+        :raises jsonrpc.notifications.NotificationQueueFull: queue rejected
+            notifications of the request. None of them is enqueued and other
+            requests are not executed, so the request could be retried.
 
         .. versionadded: 1.8.0
 
+        .. versionchanged: 1.16.0
+          Batch members could be executed in parallel, deadline,
+          notifications and deduplicate are added.
+
+        """
+        codec = cls._get_codec(dispatcher, codec)
+        is_batch = isinstance(request, JSONRPC20BatchRequest)
+        rs = request.requests if is_batch else [request]
+        if notifications is not None:
+            rs = cls._enqueue_notifications(
+                rs, dispatcher, notifications, context, codec)
+
+        calls, duplicates = rs, None
+        if is_batch and deduplicate:
+            rs, duplicates = cls._deduplicate(rs, dispatcher)
+
+        parallel = executor is not None or max_workers is not None
+        if not (is_batch and parallel and len(rs) > 1):
+            responses = cls._get_responses(
+                rs, dispatcher, context, codec, deadline)
+        elif executor is not None:
+            responses = cls._get_responses_parallel(
+                rs, dispatcher, executor, context, codec, deadline)
+        else:
+            if ThreadPoolExecutor is None:
+                raise ValueError(
+                    "max_workers requires concurrent.futures, install "
+                    "futures package on python 2")
+            executor = ThreadPoolExecutor(max_workers)
+            try:
+                responses = cls._get_responses_parallel(
+                    rs, dispatcher, executor, context, codec, deadline)
+            finally:
+                # Calls abandoned after the deadline are not waited for.
+                executor.shutdown(wait=False)
+
+        if duplicates:
+            responses = cls._copy_responses(calls, responses, duplicates)
+        return cls._join_responses(request, responses, codec)
+
+    @classmethod
+    def _deduplicate(cls, requests, dispatcher):
+        """ Exclude repeated calls of idempotent methods.
+
+        Only methods added to :class:`~jsonrpc.dispatcher.Dispatcher` with
+        ``idempotent=True`` are deduplicated. Notifications are executed as
+        usual.
+
+        :return tuple: requests to execute and dict id(request) -> first
+            identical request, for excluded requests.
+
+        .. versionadded: 1.16.0
+
+        """
+        dispatcher_plans = cls._get_dispatcher_plans(dispatcher)
+        if dispatcher_plans is None:
+            return requests, None
+
+        first_calls = dict()
+        duplicates = dict()
+        unique = []
+        for request in requests:
+            plan = dispatcher_plans.get(request.method)
+            if plan is None or not plan.idempotent or \
+                    request.is_notification:
+                unique.append(request)
+                continue
+
+            params_key = get_params_key(request.args, request.kwargs)
+            if params_key is None:
+                unique.append(request)
+                continue
+
+            first = first_calls.setdefault(
+                (request.method, params_key), request)
+            if first is request:
+                unique.append(request)
+            else:
+                duplicates[id(request)] = first
+        return unique, duplicates
+
+    @classmethod
+    def _copy_responses(cls, requests, responses, duplicates):
+        """ Responses to all requests, excluded duplicates get a copy of
+        the first identical request's response with their own id.
+
+        :return list: responses in order of requests, without notifications.
+
+        .. versionadded: 1.16.0
+
+        """
+        by_request = dict(
+            (id(r.request), r) for r in responses if r is not None)
+        result = []
+        for request in requests:
+            if request.is_notification:
+                continue
+            first = duplicates.get(id(request))
+            if first is None:
+                result.append(by_request[id(request)])
+                continue
+
+            result.append(cls._copy_response(by_request[id(first)], request))
+        return result
+
+    @classmethod
+    def _copy_response(cls, response, request):
+        """ Response to the request with result or error of response to
+        an identical request.
+
+        .. versionadded: 1.16.0
+
+        """
+        if response.request is request:
+            return response
+        return cls._make_response(
+            request, response.serialize, result=response._result,
+            error=response._error)
+
+    @classmethod
+    def _enqueue_notifications(cls, requests, dispatcher, notifications,
+                               context, codec):
+        """ Submit notifications to the queue.
+
+        Notifications are submitted together with
+        :meth:`~jsonrpc.notifications.NotificationQueue.submit_all`, queue
+        which rejects them does not enqueue any.
+
+        :return list: other requests.
+
+        .. versionadded: 1.16.0
+
+        """
+        serialize = get_codec(codec).dumps
+        dispatcher_plans = cls._get_dispatcher_plans(dispatcher)
+        calls = []
+        queued = []
+        for request in requests:
+            if not request.is_notification:
+                calls.append(request)
+                continue
+
+            # Notification is executed after the context is reused by the
+            # next request.
+            queued.append(functools.partial(
+                cls._get_response, request, dispatcher, dispatcher_plans,
+                dict(), dict(context) if context is not None else None,
+                serialize))
+        notifications.submit_all(queued)
+        return calls
+
+    @staticmethod
+    def _join_responses(request, responses, codec):
+        """ Response to the request from responses to its members.
+
+        :return: response, batch response or None for notifications.
+
+        .. versionadded: 1.16.0
+
         """
-        rs = request if isinstance(request, JSONRPC20BatchRequest) \
-            else [request]
-        responses = [r for r in cls._get_responses(rs, dispatcher, context)
-                     if r is not None]
+        responses = [r for r in responses if r is not None]
 
         # notifications
         if not responses:
@@ -82,12 +442,255 @@ class JSONRPCResponseManager(object):
         if isinstance(request, JSONRPC20BatchRequest):
             response = JSONRPC20BatchResponse(*responses)
             response.request = request
+            response.serialize = codec.dumps
             return response
         else:
             return responses[0]
 
+    @staticmethod
+    def _get_params_error_data(error):
+        """ Invalid params error data for params rejected before the call.
+
+        .. versionadded: 1.16.0
+
+        """
+        data = {
+            "type": error.__class__.__name__,
+            "args": error.args,
+            "message": str(error),
+        }
+        if isinstance(error, SchemaValidationError):
+            data["path"] = error.path
+        return data
+
+    @staticmethod
+    def _get_dispatcher_plans(dispatcher):
+        """ Dispatcher.plan_for_method, if methods could be looked up there
+        directly, otherwise None.
+
+        Subclasses of Dispatcher, which override ``__getitem__`` (e.g. to
+        check access or to load methods lazily), are asked for every method.
+
+        .. versionadded: 1.16.0
+
+        """
+        if isinstance(dispatcher, Dispatcher) and \
+                type(dispatcher).__getitem__ is Dispatcher.__getitem__:
+            return dispatcher.plan_for_method
+        return None
+
+    @staticmethod
+    def _get_plan(dispatcher, method_name, dispatcher_plans, plans):
+        """ Call plan of the method.
+
+        Methods of plain dict dispatchers (and methods set to
+        Dispatcher.method_map directly) get a plan without params checker,
+        TypeError raised by such method is inspected instead. Such plans are
+        stored in `plans`, which should live only as long as the batch.
+
+        :param dict dispatcher_plans: result of _get_dispatcher_plans.
+        :param dict plans: method name -> plan, for other methods.
+        :raises KeyError: method is not found.
+
+        .. versionadded: 1.16.0
+
+        """
+        if dispatcher_plans is not None:
+            plan = dispatcher_plans.get(method_name)
+            if plan is not None:
+                return plan
+
+        try:
+            return plans[method_name]
+        except KeyError:
+            method = dispatcher[method_name]
+            # Method returned by overridden __getitem__ keeps its options,
+            # if it is the added one.
+            plan = getattr(dispatcher, "plan_for_method", {}).get(
+                method_name)
+            if plan is None or plan.method is not method:
+                plan = MethodPlan(method, check_params=False)
+            plans[method_name] = plan
+            return plan
+
     @classmethod
-    def _get_responses(cls, requests, dispatcher, context=None):
+    def _make_response(cls, request, serialize, result=NOT_SET, error=None):
+        """ Response to the request, None for notifications.
+
+        .. versionadded: 1.16.0
+
+        """
+        # Notifications are not answered, so response is not created.
+        if request.is_notification:
+            return None
+
+        # Values are valid by construction, validating setters are skipped.
+        response_class = cls.RESPONSE_CLASS_MAP[request.JSONRPC_VERSION]
+        if error is None:
+            response = response_class._from_result(result, request._id)
+        else:
+            response = response_class._from_error(error, request._id)
+        response.request = request
+        response.serialize = serialize
+        return response
+
+    @classmethod
+    def _get_exception_error(cls, e, request, plan):
+        """ Error data for exception raised by the method.
+
+        .. versionadded: 1.16.0
+
+        """
+        if isinstance(e, JSONRPCDispatchException):
+            return e.error._data
+
+        data = {
+            "type": e.__class__.__name__,
+            "args": e.args,
+            "message": str(e),
+        }
+
+        logger.exception("API Exception: {0}".format(data))
+
+        if isinstance(e, TypeError) and plan.check_params is None and \
+                is_invalid_params(
+                    plan.method, *request.args, **request.kwargs):
+            return JSONRPCInvalidParams(data=data)._data
+        return JSONRPCServerError(data=data)._data
+
+    @staticmethod
+    def _get_cache_key(plan, request):
+        """ Key of the call in method's cache, None if it is not cached.
+
+        Key is built before params are bound, so context is not its part.
+
+        .. versionadded: 1.16.0
+
+        """
+        if plan.cache is None:
+            return None
+        return plan.cache.make_key(request.method, request.args,
+                                   request.kwargs)
+
+    @staticmethod
+    def _get_flight_key(plan, request):
+        """ Key of the call in method's single flight, None if concurrent
+        calls are not coalesced.
+
+        Notifications are not coalesced, leader's response is needed.
+
+        .. versionadded: 1.16.0
+
+        """
+        if plan.single_flight is None or request.is_notification:
+            return None
+        return get_params_key(request.args, request.kwargs)
+
+    @staticmethod
+    def _get_timeout(plan, deadline):
+        """ Seconds to wait for the call, None if it is not limited.
+
+        .. versionadded: 1.16.0
+
+        """
+        timeout = plan.timeout
+        if deadline is not None:
+            remaining = deadline - time.time()
+            if timeout is None or remaining < timeout:
+                timeout = remaining
+        return timeout
+
+    @classmethod
+    def _get_response(cls, request, dispatcher, dispatcher_plans, plans,
+                      context, serialize, deadline=None):
+        """ Response to a single JSON-RPC Request, None for notifications.
+
+        .. versionadded: 1.16.0
+
+        """
+        try:
+            plan = cls._get_plan(
+                dispatcher, request.method, dispatcher_plans, plans)
+        except KeyError:
+            return cls._make_response(
+                request, serialize, error=JSONRPCMethodNotFound.cached_data())
+
+        cache_key = cls._get_cache_key(plan, request)
+        if cache_key is not None:
+            result = plan.cache.get(cache_key)
+            if result is not NOT_SET:
+                return cls._make_response(request, serialize, result=result)
+
+        flight_key = cls._get_flight_key(plan, request)
+        if flight_key is None:
+            return cls._execute(
+                request, plan, cache_key, context, serialize, deadline)
+
+        response = plan.single_flight.do(
+            flight_key, cls._execute, request, plan, cache_key, context,
+            serialize, deadline)
+        return cls._copy_response(response, request)
+
+    @classmethod
+    def _execute(cls, request, plan, cache_key, context, serialize,
+                 deadline=None):
+        """ Response to the request, method is called.
+
+        .. versionadded: 1.16.0
+
+        """
+        timeout = cls._get_timeout(plan, deadline)
+        if timeout is not None and timeout <= 0:
+            return cls._make_response(
+                request, serialize, error=JSONRPCRequestTimeout.cached_data())
+
+        try:
+            # Plan's bind raises TypeError and ValueError only for invalid
+            # params.
+            args, kwargs = plan.bind(request, context)
+        except (TypeError, ValueError) as e:
+            return cls._make_response(
+                request, serialize, error=JSONRPCInvalidParams(
+                    data=cls._get_params_error_data(e))._data)
+
+        bulkhead = plan.bulkhead
+        if bulkhead is not None and not bulkhead.acquire():
+            return cls._make_response(request, serialize, error=bulkhead.error)
+
+        try:
+            if plan.executor is None:
+                result = plan.method(*args, **kwargs)
+            else:
+                future = plan.executor.submit(plan.method, *args, **kwargs)
+                try:
+                    result = future.result(timeout)
+                except FuturesTimeoutError:
+                    # Method itself could raise TimeoutError.
+                    if future.done():
+                        result = future.result()
+                    else:
+                        if not future.cancel() and bulkhead is not None:
+                            # Abandoned call keeps its slot until finished.
+                            bulkhead.release_when_done(future)
+                            bulkhead = None
+                        return cls._make_response(
+                            request, serialize,
+                            error=JSONRPCRequestTimeout.cached_data())
+        except Exception as e:
+            return cls._make_response(
+                request, serialize,
+                error=cls._get_exception_error(e, request, plan))
+        finally:
+            if bulkhead is not None:
+                bulkhead.release()
+
+        if cache_key is not None:
+            plan.cache.set(cache_key, result)
+        return cls._make_response(request, serialize, result=result)
+
+    @classmethod
+    def _get_responses(cls, requests, dispatcher, context=None, codec=None,
+                       deadline=None):
         """ Response to each single JSON-RPC Request.
 
         :return iterator(JSONRPC20Response):
@@ -96,48 +699,55 @@ class JSONRPCResponseManager(object):
           TypeError inside the function is distinguished from Invalid Params.
 
         """
+        serialize = get_codec(codec).dumps
+        dispatcher_plans = cls._get_dispatcher_plans(dispatcher)
+        plans = dict()
         for request in requests:
-            def make_response(**kwargs):
-                response = cls.RESPONSE_CLASS_MAP[request.JSONRPC_VERSION](
-                    _id=request._id, **kwargs)
-                response.request = request
-                return response
+            response = cls._get_response(
+                request, dispatcher, dispatcher_plans, plans, context,
+                serialize, deadline)
+            if not request.is_notification:
+                yield response
 
-            output = None
+    @classmethod
+    def _get_responses_parallel(cls, requests, dispatcher, executor,
+                                context=None, codec=None, deadline=None):
+        """ Response to each single JSON-RPC Request, requests are executed
+        in the executor.
+
+        Every request gets its own copy of the context, so parallel calls
+        do not overwrite each other's context["request"]. Requests, which
+        are not completed before the deadline, get Request timeout error.
+
+        :return list: responses in order of requests, without notifications.
+
+        .. versionadded: 1.16.0
+
+        """
+        serialize = get_codec(codec).dumps
+        dispatcher_plans = cls._get_dispatcher_plans(dispatcher)
+        plans = dict()
+        futures = [
+            executor.submit(
+                cls._get_response, request, dispatcher, dispatcher_plans,
+                plans, dict(context) if context is not None else None,
+                serialize, deadline)
+            for request in requests
+        ]
+
+        responses = []
+        for request, future in zip(requests, futures):
+            if request.is_notification:
+                continue
+            if deadline is None:
+                responses.append(future.result())
+                continue
             try:
-                method = dispatcher[request.method]
-            except KeyError:
-                output = make_response(error=JSONRPCMethodNotFound()._data)
-            else:
-                try:
-                    kwargs = request.kwargs
-                    if context is not None:
-                        context_arg = dispatcher.context_arg_for_method.get(
-                            request.method)
-                        if context_arg:
-                            context["request"] = request
-                            kwargs[context_arg] = context
-                    result = method(*request.args, **kwargs)
-                except JSONRPCDispatchException as e:
-                    output = make_response(error=e.error._data)
-                except Exception as e:
-                    data = {
-                        "type": e.__class__.__name__,
-                        "args": e.args,
-                        "message": str(e),
-                    }
-
-                    logger.exception("API Exception: {0}".format(data))
-
-                    if isinstance(e, TypeError) and is_invalid_params(
-                            method, *request.args, **request.kwargs):
-                        output = make_response(
-                            error=JSONRPCInvalidParams(data=data)._data)
-                    else:
-                        output = make_response(
-                            error=JSONRPCServerError(data=data)._data)
-                else:
-                    output = make_response(result=result)
-            finally:
-                if not request.is_notification:
-                    yield output
+                responses.append(
+                    future.result(max(deadline - time.time(), 0)))
+            except FuturesTimeoutError:
+                future.cancel()
+                responses.append(cls._make_response(
+                    request, serialize,
+                    error=JSONRPCRequestTimeout.cached_data()))
+        return responses
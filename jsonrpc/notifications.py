@@ -0,0 +1,191 @@
+""" Background execution of notifications.
+
+Notifications are not answered, so there is no need to execute them before
+the response is sent. Given :class:`NotificationQueue`,
+:class:`~jsonrpc.manager.JSONRPCResponseManager` enqueues notifications
+and returns at once, they are executed by background worker threads:
+
+    >>> notifications = NotificationQueue(max_workers=4, max_queue=1000)
+    >>> JSONRPCResponseManager.handle(
+    ...     request_str, dispatcher, notifications=notifications)
+
+.. versionadded: 1.16.0
+
+"""
+import logging
+import threading
+
+from .exceptions import JSONRPCException
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+logger = logging.getLogger(__name__)
+
+BLOCK = "block"
+DROP = "drop"
+REJECT = "reject"
+
+
+class NotificationQueueFull(JSONRPCException):
+
+    """ Notification is rejected, queue is full."""
+
+    pass
+
+
+class NotificationQueue(object):
+
+    """ Bounded queue of notifications executed by worker threads.
+
+    :param int max_workers: number of worker threads, started on first
+        notification.
+    :param int max_queue: number of notifications waiting for a worker.
+    :param str on_full: what to do with a notification if queue is full:
+
+        * "block" - wait for a free place;
+        * "drop" - do not execute it, only log and count it;
+        * "reject" - raise :class:`NotificationQueueFull`, so transport
+          could respond with an error (e.g. HTTP 503).
+
+    """
+
+    def __init__(self, max_workers=1, max_queue=1000, on_full=BLOCK):
+        if on_full not in (BLOCK, DROP, REJECT):
+            raise ValueError("Unknown on_full {0!r}".format(on_full))
+        if max_workers < 1:
+            raise ValueError("max_workers should be positive")
+
+        self.max_workers = max_workers
+        self.on_full = on_full
+        self.submitted = 0
+        self.dropped = 0
+        self.rejected = 0
+        self._queue = queue.Queue(max_queue)
+        self._workers = []
+        self._lock = threading.Lock()
+        # Serializes not blocking puts, so free places checked by
+        # submit_all are not taken by other threads.
+        self._put_lock = threading.Lock()
+
+    def _start_workers(self):
+        with self._lock:
+            while len(self._workers) < self.max_workers:
+                worker = threading.Thread(
+                    target=self._work, name="jsonrpc-notifications-{0}".format(
+                        len(self._workers)))
+                worker.daemon = True
+                worker.start()
+                self._workers.append(worker)
+
+    def _work(self):
+        while True:
+            call = self._queue.get()
+            try:
+                if call is None:
+                    return
+                call()
+            except Exception:
+                logger.exception("Notification failed")
+            finally:
+                self._queue.task_done()
+
+    def submit(self, call):
+        """ Enqueue call of a notification.
+
+        :param callable call: function without arguments.
+        :return bool: False if notification is dropped.
+        :raises NotificationQueueFull: queue is full and on_full is
+            "reject".
+
+        """
+        if len(self._workers) < self.max_workers:
+            self._start_workers()
+
+        if self.on_full == BLOCK:
+            self._queue.put(call)
+        else:
+            try:
+                with self._put_lock:
+                    self._queue.put_nowait(call)
+            except queue.Full:
+                return self._full(1)
+
+        with self._lock:
+            self.submitted += 1
+        return True
+
+    def submit_all(self, calls):
+        """ Enqueue calls of notifications of one request.
+
+        With on_full "reject" either all calls are enqueued or none of them,
+        so a rejected request could be retried without executing some of
+        its notifications twice. Otherwise calls are submitted one by one.
+
+        :param list calls: functions without arguments.
+        :raises NotificationQueueFull: queue has no place for all calls and
+            on_full is "reject".
+
+        """
+        if self.on_full != REJECT or not calls:
+            for call in calls:
+                self.submit(call)
+            return
+
+        if len(self._workers) < self.max_workers:
+            self._start_workers()
+
+        with self._put_lock:
+            maxsize = self._queue.maxsize
+            # Workers only take calls from the queue, so free places are
+            # not taken until the lock is released.
+            if maxsize > 0 and maxsize - self._queue.qsize() < len(calls):
+                self._full(len(calls))
+            for call in calls:
+                self._queue.put_nowait(call)
+
+        with self._lock:
+            self.submitted += len(calls)
+
+    def _full(self, count):
+        """ Drop or reject count notifications."""
+        with self._lock:
+            if self.on_full == DROP:
+                self.dropped += count
+            else:
+                self.rejected += count
+        if self.on_full == DROP:
+            logger.warning("Notification queue is full, dropped")
+            return False
+        raise NotificationQueueFull("Notification queue is full")
+
+    def join(self):
+        """ Wait until all enqueued notifications are executed."""
+        self._queue.join()
+
+    def shutdown(self, wait=True):
+        """ Stop workers after enqueued notifications are executed."""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for _ in workers:
+            self._queue.put(None)
+        if wait:
+            for worker in workers:
+                worker.join()
+
+    def stats(self):
+        """ Counters of the queue.
+
+        :return dict: submitted, dropped, rejected notifications and size
+            of the queue.
+
+        """
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "dropped": self.dropped,
+                "rejected": self.rejected,
+                "queue_size": self._queue.qsize(),
+            }
@@ -0,0 +1,417 @@
+""" JSON Schema validation of method params.
+
+Methods added with ``Dispatcher.add_method(params_schema=...)`` get their
+params validated before the call, invalid params are rejected with Invalid
+params error, which data contains path to the invalid value.
+
+Schema is compiled to a validator function once. `fastjsonschema`_ is used
+if installed, otherwise a subset of JSON Schema is compiled by this module:
+type, enum, const, properties, required, additionalProperties, items,
+minItems, maxItems, minLength, maxLength, pattern, minimum, maximum,
+exclusiveMinimum, exclusiveMaximum, allOf, anyOf and oneOf.
+
+.. _fastjsonschema: https://pypi.org/project/fastjsonschema/
+
+.. versionadded: 1.16.0
+
+"""
+import json
+import re
+
+from . import six
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+_validators = dict()
+
+# Keywords without effect on validation.
+ANNOTATIONS = frozenset([
+    "$schema", "$id", "id", "$comment", "title", "description", "default",
+    "examples", "format",
+])
+
+
+class SchemaValidationError(ValueError):
+
+    """ Value does not match schema.
+
+    :param str message: error description.
+    :param list path: keys and indexes of invalid value in params.
+
+    """
+
+    def __init__(self, message, path=()):
+        self.path = list(path)
+        super(SchemaValidationError, self).__init__(
+            "{0} {1}".format(format_path(self.path), message))
+
+
+def format_path(path):
+    """ Format path to value as in params.a[0]."""
+    return "params" + "".join(
+        "[{0}]".format(key) if isinstance(key, six.integer_types)
+        else ".{0}".format(key)
+        for key in path)
+
+
+def _is_integer(value):
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, six.integer_types) or \
+        isinstance(value, float) and value.is_integer()
+
+
+def _is_number(value):
+    return not isinstance(value, bool) and \
+        isinstance(value, six.integer_types + (float,))
+
+
+TYPES = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, (list, tuple)),
+    "string": lambda value: isinstance(value, six.string_types),
+    "integer": _is_integer,
+    "number": _is_number,
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+
+def _compile_type(schema):
+    types = schema["type"]
+    if isinstance(types, six.string_types):
+        types = [types]
+    try:
+        checks = [TYPES[t] for t in types]
+    except KeyError as e:
+        raise ValueError("Unknown type {0}".format(e))
+    message = "must be {0}".format(" or ".join(types))
+
+    def check(value, path):
+        for is_type in checks:
+            if is_type(value):
+                return
+        raise SchemaValidationError(message, path)
+
+    return check
+
+
+def _compile_enum(schema):
+    values = list(schema["enum"])
+    message = "must be one of {0}".format(json.dumps(values))
+
+    def check(value, path):
+        for v in values:
+            if value == v and type(value) is type(v) or \
+                    _is_number(value) and _is_number(v) and value == v:
+                return
+        raise SchemaValidationError(message, path)
+
+    return check
+
+
+def _compile_const(schema):
+    return _compile_enum({"enum": [schema["const"]]})
+
+
+def _compile_properties(schema):
+    properties = [
+        (name, _compile(subschema))
+        for name, subschema in schema.get("properties", {}).items()
+    ]
+    required = list(schema.get("required", ()))
+    additional = schema.get("additionalProperties", True)
+    known = frozenset(schema.get("properties", {}))
+    check_additional = None
+    if additional is not True:
+        check_additional = _compile(additional) \
+            if isinstance(additional, dict) else None
+
+    def check(value, path):
+        if not isinstance(value, dict):
+            return
+
+        for name in required:
+            if name not in value:
+                raise SchemaValidationError(
+                    "must contain {0!r} property".format(name), path)
+
+        for name, check_property in properties:
+            if name in value:
+                check_property(value[name], path + [name])
+
+        if additional is True:
+            return
+
+        for name in value:
+            if name in known:
+                continue
+            if check_additional is None:
+                raise SchemaValidationError(
+                    "must not contain {0!r} property".format(name), path)
+            check_additional(value[name], path + [name])
+
+    return check
+
+
+def _compile_items(schema):
+    items = schema["items"]
+    if isinstance(items, list):
+        checks = [_compile(subschema) for subschema in items]
+
+        def check(value, path):
+            if isinstance(value, (list, tuple)):
+                for index, (item, check_item) in enumerate(
+                        zip(value, checks)):
+                    check_item(item, path + [index])
+
+        return check
+
+    check_item = _compile(items)
+
+    def check(value, path):
+        if isinstance(value, (list, tuple)):
+            for index, item in enumerate(value):
+                check_item(item, path + [index])
+
+    return check
+
+
+def _compile_limit(keyword, applies, measure, compare, message):
+    def compile_limit(schema):
+        limit = schema[keyword]
+        text = message.format(limit)
+
+        def check(value, path):
+            if applies(value) and not compare(measure(value), limit):
+                raise SchemaValidationError(text, path)
+
+        return check
+
+    return compile_limit
+
+
+def _identity(value):
+    return value
+
+
+def _is_array(value):
+    return isinstance(value, (list, tuple))
+
+
+def _is_string(value):
+    return isinstance(value, six.string_types)
+
+
+def _compile_minimum(schema):
+    # Draft 4 defines exclusiveMinimum as boolean modifier of minimum.
+    exclusive = schema.get("exclusiveMinimum") is True
+    return _compile_limit(
+        "minimum", _is_number, _identity,
+        (lambda a, b: a > b) if exclusive else (lambda a, b: a >= b),
+        "must be bigger than {0}" if exclusive
+        else "must be bigger than or equal to {0}")(schema)
+
+
+def _compile_maximum(schema):
+    exclusive = schema.get("exclusiveMaximum") is True
+    return _compile_limit(
+        "maximum", _is_number, _identity,
+        (lambda a, b: a < b) if exclusive else (lambda a, b: a <= b),
+        "must be smaller than {0}" if exclusive
+        else "must be smaller than or equal to {0}")(schema)
+
+
+def _compile_exclusive(keyword, compare, message):
+    compile_limit = _compile_limit(
+        keyword, _is_number, _identity, compare, message)
+
+    def compile_exclusive(schema):
+        if isinstance(schema[keyword], bool):
+            # Draft 4 modifier, handled with minimum/maximum.
+            return None
+        return compile_limit(schema)
+
+    return compile_exclusive
+
+
+def _compile_pattern(schema):
+    pattern = re.compile(schema["pattern"])
+    message = "must match pattern {0}".format(schema["pattern"])
+
+    def check(value, path):
+        if isinstance(value, six.string_types) and not pattern.search(value):
+            raise SchemaValidationError(message, path)
+
+    return check
+
+
+def _compile_all_of(schema):
+    checks = [_compile(subschema) for subschema in schema["allOf"]]
+
+    def check(value, path):
+        for check_subschema in checks:
+            check_subschema(value, path)
+
+    return check
+
+
+def _count_valid(checks, value, path):
+    count = 0
+    for check_subschema in checks:
+        try:
+            check_subschema(value, path)
+        except SchemaValidationError:
+            pass
+        else:
+            count += 1
+    return count
+
+
+def _compile_any_of(schema):
+    checks = [_compile(subschema) for subschema in schema["anyOf"]]
+
+    def check(value, path):
+        for check_subschema in checks:
+            try:
+                check_subschema(value, path)
+            except SchemaValidationError:
+                pass
+            else:
+                return
+        raise SchemaValidationError("must be valid by any of schemas", path)
+
+    return check
+
+
+def _compile_one_of(schema):
+    checks = [_compile(subschema) for subschema in schema["oneOf"]]
+
+    def check(value, path):
+        if _count_valid(checks, value, path) != 1:
+            raise SchemaValidationError(
+                "must be valid exactly by one of schemas", path)
+
+    return check
+
+
+KEYWORDS = {
+    "type": _compile_type,
+    "enum": _compile_enum,
+    "const": _compile_const,
+    "properties": _compile_properties,
+    "required": _compile_properties,
+    "additionalProperties": _compile_properties,
+    "items": _compile_items,
+    "minItems": _compile_limit(
+        "minItems", _is_array, len, lambda a, b: a >= b,
+        "must contain at least {0} items"),
+    "maxItems": _compile_limit(
+        "maxItems", _is_array, len, lambda a, b: a <= b,
+        "must contain at most {0} items"),
+    "minLength": _compile_limit(
+        "minLength", _is_string, len, lambda a, b: a >= b,
+        "must be at least {0} characters long"),
+    "maxLength": _compile_limit(
+        "maxLength", _is_string, len, lambda a, b: a <= b,
+        "must be at most {0} characters long"),
+    "pattern": _compile_pattern,
+    "minimum": _compile_minimum,
+    "maximum": _compile_maximum,
+    "exclusiveMinimum": _compile_exclusive(
+        "exclusiveMinimum", lambda a, b: a > b, "must be bigger than {0}"),
+    "exclusiveMaximum": _compile_exclusive(
+        "exclusiveMaximum", lambda a, b: a < b, "must be smaller than {0}"),
+    "allOf": _compile_all_of,
+    "anyOf": _compile_any_of,
+    "oneOf": _compile_one_of,
+}
+
+
+def _compile(schema):
+    """ Compile schema to check(value, path) function."""
+    if schema is True or schema == {}:
+        return lambda value, path: None
+    if schema is False:
+        def check_false(value, path):
+            raise SchemaValidationError("must not be present", path)
+        return check_false
+    if not isinstance(schema, dict):
+        raise ValueError("Schema should be dict or bool")
+
+    compilers = []
+    for keyword in schema:
+        if keyword in ANNOTATIONS:
+            continue
+        try:
+            compile_keyword = KEYWORDS[keyword]
+        except KeyError:
+            raise ValueError(
+                "Schema keyword {0!r} is not supported".format(keyword))
+        # Some keywords (properties, required, ...) share a compiler.
+        if compile_keyword not in compilers:
+            compilers.append(compile_keyword)
+
+    checks = [
+        check for check in (compile_keyword(schema)
+                            for compile_keyword in compilers)
+        if check is not None
+    ]
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def check(value, path):
+        for check_keyword in checks:
+            check_keyword(value, path)
+
+    return check
+
+
+def _compile_fastjsonschema(schema):
+    validate = fastjsonschema.compile(schema)
+
+    def validator(value):
+        try:
+            validate(value)
+        except fastjsonschema.JsonSchemaValueException as e:
+            # Path and message start with name of validated variable, "data".
+            name = getattr(e, "name", "data")
+            message = e.message
+            if message.startswith(name + " "):
+                message = message[len(name) + 1:]
+            raise SchemaValidationError(message, list(e.path)[1:])
+
+    return validator
+
+
+def compile_schema(schema):
+    """ Compile JSON Schema to a validator function.
+
+    Validators are cached, the same schema is compiled only once.
+
+    :param dict schema: JSON Schema of params.
+    :return function: params -> None, raises :class:`SchemaValidationError`.
+    :raises ValueError: schema uses not supported keyword (only without
+        fastjsonschema).
+
+    """
+    key = json.dumps(schema, sort_keys=True)
+    try:
+        return _validators[key]
+    except KeyError:
+        pass
+
+    if fastjsonschema is not None:
+        validator = _compile_fastjsonschema(schema)
+    else:
+        check = _compile(schema)
+
+        def validator(value):
+            check(value, [])
+
+    _validators[key] = validator
+    return validator
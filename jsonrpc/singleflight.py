@@ -0,0 +1,123 @@
+""" Coalescing of concurrent identical calls.
+
+Methods added with ``Dispatcher.add_method(single_flight=True)`` are
+executed once for concurrent calls with the same params: the first call
+(leader) is executed, calls arriving while it runs (followers) wait for it
+and get its result or error with their own id. Calls arriving after the
+leader is finished are executed again, use a cache (see :mod:`jsonrpc.cache`)
+to keep results longer.
+
+Calls of threads (:class:`~jsonrpc.manager.JSONRPCResponseManager`) and of
+asyncio tasks (:class:`~jsonrpc.async_manager.AsyncJSONRPCResponseManager`)
+are coalesced separately. Followers get the response of the leader, so
+methods with ``context_arg`` could not be coalesced, ``add_method`` raises
+ValueError. Followers wait as long as the leader runs, their own deadline
+is not checked.
+
+.. versionadded: 1.16.0
+
+"""
+import functools
+import threading
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+
+class _Call(object):
+
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight(object):
+
+    """ Execute concurrent calls with the same key once.
+
+    Exception raised by the leader is raised in every follower.
+
+    """
+
+    def __init__(self):
+        self.executed = 0
+        self.shared = 0
+        # key -> _Call of a running leader.
+        self._calls = dict()
+        # (loop, key) -> future of a running leader.
+        self._futures = dict()
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args, **kwargs):
+        """ Result of ``func(*args, **kwargs)``, which is shared by threads
+        calling with the same key while it is executed.
+
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                is_leader = True
+            else:
+                self.shared += 1
+                is_leader = False
+
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.value
+
+    def do_async(self, key, func, *args, **kwargs):
+        """ Awaitable result of coroutine ``func(*args, **kwargs)``, which
+        is shared by tasks of the event loop calling with the same key while
+        it is executed.
+
+        Leader is executed in its own task, cancellation of a waiting task
+        does not cancel it.
+
+        """
+        loop = asyncio.get_event_loop()
+        key = loop, key
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                future = self._futures[key] = asyncio.ensure_future(
+                    func(*args, **kwargs))
+                future.add_done_callback(
+                    functools.partial(self._forget, key))
+                self.executed += 1
+            else:
+                self.shared += 1
+        return asyncio.shield(future)
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+
+    def stats(self):
+        """ Counters of calls.
+
+        :return dict: executed (leaders) and shared (followers) calls.
+
+        """
+        with self._lock:
+            return {"executed": self.executed, "shared": self.shared}
@@ -0,0 +1,168 @@
+""" Incremental json reader.
+
+Used to parse huge batch requests element by element, while they are still
+being read from a file-like object (file, WSGI input, socket file).
+
+.. versionadded: 1.16.0
+
+"""
+import codecs
+import json
+import re
+
+from . import six
+
+READ_CHUNK_SIZE = 64 * 1024
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+NUMBER_TYPES = six.integer_types + (float,)
+
+
+class JSONArrayStream(object):
+
+    """ Reader of json array from a file-like object.
+
+    Array elements are parsed and returned one by one, only not yet parsed
+    part of the input is kept in memory. Elements are decoded with standard
+    library decoder, which is able to parse a value at the given position.
+
+    :param stream: object with ``read(size)`` method, returning bytes (utf-8
+        encoded) or str.
+    :param int chunk_size: size of a single read.
+
+    Usage:
+
+        >>> reader = JSONArrayStream(io.BytesIO(b'[1, {"a": 2}]'))
+        >>> reader.is_array
+        True
+        >>> list(reader)
+        [1, {'a': 2}]
+
+    """
+
+    def __init__(self, stream, chunk_size=READ_CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.eof = False
+        self._buffer = u""
+        self._pos = 0
+        self._decoder = None
+        self._raw_decode = json.JSONDecoder().raw_decode
+
+    def _read(self, size):
+        """ Append up to size characters to buffer, return False on eof.
+
+        :raises ValueError: input is not valid utf-8.
+
+        """
+        if self.eof:
+            return False
+
+        while True:
+            chunk = self.stream.read(size)
+            if not chunk:
+                self.eof = True
+                if self._decoder is not None:
+                    # Incomplete character at the end raises ValueError.
+                    self._decoder.decode(b"", final=True)
+                return False
+
+            if isinstance(chunk, (six.binary_type, bytearray)):
+                if self._decoder is None:
+                    self._decoder = codecs.getincrementaldecoder("utf-8")()
+                chunk = self._decoder.decode(bytes(chunk))
+            # Read could end in the middle of a multi-byte character.
+            if chunk:
+                break
+
+        # Drop parsed part of the buffer only when it is extended, so it is
+        # not copied after every element.
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self):
+        """ Skip whitespaces and return next character, empty on eof."""
+        while True:
+            self._pos = WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read(self.chunk_size):
+                return u""
+
+    @property
+    def is_array(self):
+        """ Whether input starts with an array.
+
+        :return bool:
+
+        """
+        return self._peek() == u"["
+
+    def read(self):
+        """ Read the rest of input, which was not parsed yet.
+
+        :return str:
+
+        """
+        while self._read(self.chunk_size):
+            pass
+        rest = self._buffer[self._pos:]
+        self._buffer, self._pos = u"", 0
+        return rest
+
+    def _decode(self):
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self._raw_decode(self._buffer, self._pos)
+            except ValueError:
+                if self._read(size):
+                    # Grow reads for long values, so they are not re-parsed
+                    # chunk by chunk.
+                    size = max(size, len(self._buffer))
+                    continue
+                raise
+
+            # Number at the end of the buffer could be incomplete, e.g. "1.5"
+            # is parsed as 1 from "1." and as 1.5 from "1.5e".
+            buffer_end = len(self._buffer)
+            if isinstance(value, NUMBER_TYPES) and \
+                    NUMBER_TAIL.match(self._buffer, end).end() == buffer_end:
+                if self._read(size):
+                    continue
+            elif end == buffer_end and self._read(size):
+                continue
+
+            self._pos = end
+            return value
+
+    def __iter__(self):
+        """ Parse array elements one by one.
+
+        :raises ValueError: input is not a valid json array.
+
+        """
+        if self._peek() != u"[":
+            raise ValueError("Expecting '['")
+        self._pos += 1
+
+        if self._peek() == u"]":
+            self._pos += 1
+            if self._peek():
+                raise ValueError("Extra data")
+            return
+
+        while True:
+            yield self._decode()
+
+            char = self._peek()
+            self._pos += 1
+            if char == u"]":
+                if self._peek():
+                    raise ValueError("Extra data")
+                return
+            if char != u",":
+                raise ValueError("Expecting ',' delimiter or ']'")
+            if self._peek() == u"]":
+                raise ValueError("Expecting value")
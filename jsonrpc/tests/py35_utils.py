@@ -1,7 +1,79 @@
 # Python3.5+ code.
 # This won't even parse in earlier versions, so it's kept in a separate file
 # and imported when needed.
+import asyncio
+import datetime
+import decimal
+import uuid
+from typing import Dict, List, Optional
 
 
 def distance(a: float, b: float) -> float:
     return (a ** 2 + b ** 2) ** 0.5
+
+
+def book(day: datetime.date, amount: decimal.Decimal, rooms: List[int],
+         guest: uuid.UUID = None, *, until: Optional[datetime.datetime] = None,
+         note: str = "", prices: Dict[str, float] = None):
+    return {
+        "day": day, "amount": amount, "rooms": rooms, "guest": guest,
+        "until": until, "note": note, "prices": prices,
+    }
+
+
+def not_annotated(a, b=None):
+    return a
+
+
+def weekday(day: datetime.date):
+    return day.weekday()
+
+
+async def async_echo(value, delay=0):
+    await asyncio.sleep(delay)
+    return value
+
+
+async def async_error():
+    raise KeyError("async_error_explanation")
+
+
+async def async_context_id(context):
+    await asyncio.sleep(0)
+    return context["request"]._id
+
+
+def make_rendezvous():
+    """ Coroutines "wait" and "release", "wait" returns only after "release"
+    is called, so both complete only if they are executed concurrently."""
+    state = {}
+
+    def get_event():
+        if "event" not in state:
+            state["event"] = asyncio.Event()
+        return state["event"]
+
+    async def wait():
+        await get_event().wait()
+        return "released"
+
+    async def release():
+        get_event().set()
+        return "released"
+
+    return wait, release
+
+
+def make_sleeper():
+    """ Coroutine, which sleeps and records whether it was cancelled."""
+    state = {"cancelled": False}
+
+    async def sleep(delay):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+        return delay
+
+    return sleep, state
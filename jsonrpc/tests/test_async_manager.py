@@ -0,0 +1,284 @@
+""" Test asyncio response manager."""
+import json
+import sys
+import threading
+import time
+
+from ..dispatcher import Dispatcher
+from ..exceptions import JSONRPCDispatchException
+from ..jsonrpc1 import JSONRPC10Request, JSONRPC10Response
+from ..jsonrpc2 import (
+    JSONRPC20BatchRequest,
+    JSONRPC20BatchResponse,
+    JSONRPC20Request,
+    JSONRPC20Response,
+)
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+
+if sys.version_info < (3, 5):
+    raise unittest.SkipTest("Test Py3.5+ functionality")
+
+import asyncio  # noqa
+from concurrent.futures import ThreadPoolExecutor  # noqa
+from unittest import mock  # noqa
+from ..async_manager import AsyncJSONRPCResponseManager  # noqa
+from .py35_utils import (  # noqa
+    async_context_id, async_echo, async_error, make_rendezvous, make_sleeper,
+)
+
+
+class TestAsyncJSONRPCResponseManager(unittest.TestCase):
+
+    """ Test AsyncJSONRPCResponseManager functionality."""
+
+    def setUp(self):
+        def raise_(e):
+            raise e
+
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.dispatcher = Dispatcher()
+        self.dispatcher["echo"] = async_echo
+        self.dispatcher["async_error"] = async_error
+        self.dispatcher["multiply"] = lambda a, b: a * b
+        self.dispatcher["thread"] = lambda: threading.current_thread().name
+        self.dispatcher["dispatch_error"] = lambda: raise_(
+            JSONRPCDispatchException(code=4000, message="error"))
+        self.dispatcher["wait"], self.dispatcher["release"] = \
+            make_rendezvous()
+        self.dispatcher.add_method(async_context_id, name="context_id",
+                                   context_arg="context")
+
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def handle(self, request, *args, **kwargs):
+        return self.loop.run_until_complete(
+            AsyncJSONRPCResponseManager.handle(
+                request.json, self.dispatcher, *args, **kwargs))
+
+    def test_coroutine_method_is_awaited(self):
+        response = self.handle(JSONRPC20Request("echo", ["value"], _id=0))
+        self.assertTrue(isinstance(response, JSONRPC20Response))
+        self.assertEqual(response.result, "value")
+
+    def test_function_method(self):
+        response = self.handle(JSONRPC20Request("multiply", [2, 3], _id=0))
+        self.assertEqual(response.result, 6)
+
+    def test_function_method_is_called_inline(self):
+        response = self.handle(JSONRPC20Request("thread", _id=0))
+        self.assertEqual(response.result, threading.current_thread().name)
+
+    def test_function_method_is_called_in_executor(self):
+        with ThreadPoolExecutor(
+                1, thread_name_prefix="jsonrpc-test") as executor:
+            response = self.handle(
+                JSONRPC20Request("thread", _id=0), executor=executor)
+        self.assertTrue(response.result.startswith("jsonrpc-test"))
+
+    def test_function_method_is_called_in_method_executor(self):
+        with ThreadPoolExecutor(
+                1, thread_name_prefix="jsonrpc-method") as executor:
+            self.dispatcher.add_method(
+                lambda: threading.current_thread().name, name="method_thread",
+                executor=executor)
+            response = self.handle(JSONRPC20Request("method_thread", _id=0))
+        self.assertTrue(response.result.startswith("jsonrpc-method"))
+
+    def test_concurrency_limit(self):
+        self.dispatcher.add_method(
+            async_echo, name="limited", max_concurrency=1)
+        self.dispatcher.add_method(
+            async_echo, name="queued", max_concurrency=1, max_queue=1)
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("limited", [1, 0.01], _id=0),
+            JSONRPC20Request("limited", [2, 0.01], _id=1),
+            JSONRPC20Request("queued", [3, 0.01], _id=2),
+            JSONRPC20Request("queued", [4, 0.01], _id=3),
+        )
+        response = list(self.handle(request))
+        self.assertEqual(response[0].result, 1)
+        self.assertEqual(response[1].error["code"], -32001)
+        self.assertEqual([r.result for r in response[2:]], [3, 4])
+        for name in ["limited", "queued"]:
+            self.assertEqual(
+                self.dispatcher.plan_for_method[name].bulkhead.running, 0)
+
+    def test_coroutine_method_error(self):
+        response = self.handle(JSONRPC20Request("async_error", _id=0))
+        self.assertEqual(response.error["message"], "Server error")
+        self.assertEqual(response.error["data"]["type"], "KeyError")
+
+    def test_dispatch_error(self):
+        response = self.handle(JSONRPC20Request("dispatch_error", _id=0))
+        self.assertEqual(response.error["code"], 4000)
+
+    def test_invalid_params(self):
+        response = self.handle(JSONRPC20Request("echo", _id=0))
+        self.assertEqual(response.error["message"], "Invalid params")
+
+    def test_method_not_found(self):
+        response = self.handle(JSONRPC20Request("unknown", _id=0))
+        self.assertEqual(response.error["message"], "Method not found")
+
+    def test_parse_error(self):
+        response = self.loop.run_until_complete(
+            AsyncJSONRPCResponseManager.handle("{", self.dispatcher))
+        self.assertEqual(response.error["message"], "Parse error")
+
+    def test_notification(self):
+        response = self.handle(
+            JSONRPC20Request("echo", ["value"], is_notification=True))
+        self.assertEqual(response, None)
+
+    def test_rpc10(self):
+        response = self.handle(JSONRPC10Request("echo", ["value"], _id=0))
+        self.assertTrue(isinstance(response, JSONRPC10Response))
+        self.assertEqual(response.result, "value")
+
+    def test_batch_is_executed_concurrently(self):
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("wait", _id=0),
+            JSONRPC20Request("release", _id=1),
+        )
+        response = self.loop.run_until_complete(asyncio.wait_for(
+            AsyncJSONRPCResponseManager.handle(request.json, self.dispatcher),
+            timeout=5))
+        self.assertTrue(isinstance(response, JSONRPC20BatchResponse))
+        self.assertEqual(
+            [r.result for r in response], ["released", "released"])
+
+    def test_batch_errors_per_element(self):
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("echo", [1, 0.01], _id=0),
+            JSONRPC20Request("unknown", _id=1),
+            JSONRPC20Request("echo", _id=2),
+            JSONRPC20Request("async_error", _id=3),
+            JSONRPC20Request("echo", [2], is_notification=True),
+            JSONRPC20Request("multiply", [2, 3], _id=4),
+        )
+        response = list(self.handle(request))
+        self.assertEqual([r._id for r in response], [0, 1, 2, 3, 4])
+        self.assertEqual(response[0].result, 1)
+        self.assertEqual(response[1].error["code"], -32601)
+        self.assertEqual(response[2].error["code"], -32602)
+        self.assertEqual(response[3].error["code"], -32000)
+        self.assertEqual(response[4].result, 6)
+
+    def test_batch_context_is_not_shared(self):
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("context_id", _id=0),
+            JSONRPC20Request("context_id", _id=1),
+        )
+        response = self.handle(request, context={})
+        self.assertEqual([r.result for r in response], [0, 1])
+
+    def test_handle_bytes(self):
+        response = self.loop.run_until_complete(
+            AsyncJSONRPCResponseManager.handle_bytes(
+                b'{"jsonrpc": "2.0", "method": "echo", "params": [1], '
+                b'"id": 0}', self.dispatcher))
+        self.assertEqual(json.loads(response.decode("utf-8")), {
+            "jsonrpc": "2.0", "result": 1, "id": 0})
+
+    def test_dict_dispatcher(self):
+        response = self.loop.run_until_complete(
+            AsyncJSONRPCResponseManager.handle(
+                JSONRPC20Request("echo", [1], _id=0).json,
+                {"echo": async_echo}))
+        self.assertEqual(response.result, 1)
+
+    def test_coroutine_timeout_cancels(self):
+        sleep, state = make_sleeper()
+        self.dispatcher.add_method(sleep, timeout=0.01)
+        response = self.handle(JSONRPC20Request("sleep", [5], _id=0))
+        self.assertEqual(response.error, {
+            "code": -32002, "message": "Request timeout"})
+        self.assertTrue(state["cancelled"])
+
+    def test_deadline(self):
+        sleep, state = make_sleeper()
+        self.dispatcher.add_method(sleep, timeout=5)
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("sleep", [0], _id=0),
+            JSONRPC20Request("sleep", [5], _id=1),
+        )
+        response = list(self.handle(request, deadline=time.time() + 0.05))
+        self.assertEqual(response[0].result, 0)
+        self.assertEqual(response[1].error["code"], -32002)
+        self.assertTrue(state["cancelled"])
+
+    def test_deadline_passed(self):
+        sleep, state = make_sleeper()
+        self.dispatcher.add_method(sleep)
+        response = self.handle(JSONRPC20Request("sleep", [0], _id=0),
+                               deadline=time.time() - 1)
+        self.assertEqual(response.error["code"], -32002)
+
+    def test_function_timeout(self):
+        event = threading.Event()
+        self.addCleanup(event.set)
+        self.dispatcher.add_method(
+            lambda: event.wait(5), name="slow", timeout=0.01)
+        response = self.handle(JSONRPC20Request("slow", _id=0))
+        self.assertEqual(response.error["code"], -32002)
+
+    def test_timeout_error_without_timeout(self):
+        def timeout():
+            raise asyncio.TimeoutError()
+
+        self.dispatcher.add_method(timeout)
+        response = self.handle(JSONRPC20Request("timeout", _id=0))
+        self.assertEqual(response.error["code"], -32000)
+
+    def test_batch_deduplicate(self):
+        self.dispatcher.add_method(
+            async_echo, name="idempotent_echo", idempotent=True)
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("idempotent_echo", [1], _id=0),
+            JSONRPC20Request("idempotent_echo", [1], _id=1),
+            JSONRPC20Request("idempotent_echo", [2], _id=2),
+        )
+        with mock.patch.object(
+                AsyncJSONRPCResponseManager, "_get_response",
+                wraps=AsyncJSONRPCResponseManager._get_response) as get:
+            response = list(self.handle(request, deduplicate=True))
+        self.assertEqual(get.call_count, 2)
+        self.assertEqual([r._id for r in response], [0, 1, 2])
+        self.assertEqual([r.result for r in response], [1, 1, 2])
+
+    def test_single_flight(self):
+        self.dispatcher.add_method(
+            async_echo, name="single_echo", single_flight=True)
+        self.dispatcher.add_method(
+            async_error, name="single_error", single_flight=True)
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("single_echo", [1, 0.01], _id=0),
+            JSONRPC20Request("single_echo", [1, 0.01], _id=1),
+            JSONRPC20Request("single_error", _id=2),
+            JSONRPC20Request("single_error", _id=3),
+        )
+        response = list(self.handle(request))
+        self.assertEqual([r._id for r in response], [0, 1, 2, 3])
+        self.assertEqual([r.result for r in response[:2]], [1, 1])
+        self.assertEqual(response[2].error, response[3].error)
+        for name in ["single_echo", "single_error"]:
+            plan = self.dispatcher.plan_for_method[name]
+            self.assertEqual(plan.single_flight.stats(), {
+                "executed": 1, "shared": 1})
+
+    def test_timeout_error_with_timeout(self):
+        async def timeout():
+            raise asyncio.TimeoutError("upstream timed out")
+
+        self.dispatcher.add_method(timeout, timeout=5)
+        response = self.handle(JSONRPC20Request("timeout", _id=0))
+        self.assertEqual(response.error["code"], -32000)
+        self.assertEqual(
+            response.error["data"]["message"], "upstream timed out")
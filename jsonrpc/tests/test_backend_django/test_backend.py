@@ -10,6 +10,7 @@ except ImportError:
     raise unittest.SkipTest('Django not found for testing')
 
 from ...backend.django import JSONRPCAPI, api
+from ...utils import RawJSON
 import json
 
 
@@ -108,6 +109,10 @@ class TestDjangoBackend(TestCase):
         self.assertEqual(type(custom_api.dispatcher), SubDispatcher)
         self.assertEqual(id(custom_api.dispatcher), id(custom_dispatcher))
 
+    def test_deduplicate(self):
+        self.assertFalse(api.deduplicate)
+        self.assertTrue(JSONRPCAPI(deduplicate=True).deduplicate)
+
     def test_batch_request(self):
         @api.dispatcher.add_method
         def upper(request, name):
@@ -130,6 +135,26 @@ class TestDjangoBackend(TestCase):
             content_type='application/json',
         )
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.content.decode('utf8'))
+        self.assertTrue(response.streaming)
+        data = json.loads(
+            b''.join(response.streaming_content).decode('utf8'))
         self.assertEqual(len(data), len(json_data))
         self.assertEqual(data[0]['result'], json_data[0]['params'][0].upper())
+
+    def test_raw_json(self):
+        @api.dispatcher.add_method
+        def raw(request):
+            return RawJSON('{"a": [1, 2]}')
+
+        json_data = {
+            "id": "0",
+            "jsonrpc": "2.0",
+            "method": "raw",
+        }
+        response = self.client.post(
+            '',
+            json.dumps(json_data),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'"result":{"a": [1, 2]}', response.content)
@@ -1,10 +1,12 @@
+import decimal
 import json
 import sys
+import uuid
 
 if sys.version_info < (3, 3):
-    from mock import patch
+    from mock import MagicMock, patch
 else:
-    from unittest.mock import patch
+    from unittest.mock import MagicMock, patch
 
 if sys.version_info < (2, 7):
     import unittest2 as unittest
@@ -19,6 +21,9 @@ if sys.version_info < (3, 0) or sys.version_info >= (3, 3):
         raise unittest.SkipTest('Flask not found for testing')
 
     from ...backend.flask import JSONRPCAPI, api
+    from ...codec import JSONCodec
+    from ...notifications import NotificationQueue, NotificationQueueFull
+    from ...utils import RawJSON
 
     @api.dispatcher.add_method
     def dummy():
@@ -180,3 +185,120 @@ class TestFlaskBackend(unittest.TestCase):
         custom_api = JSONRPCAPI(custom_dispatcher)
         self.assertEqual(type(custom_api.dispatcher), SubDispatcher)
         self.assertEqual(id(custom_api.dispatcher), id(custom_dispatcher))
+
+    def test_codec_batch_decimal(self):
+        api = JSONRPCAPI(codec="orjson")
+        api.dispatcher["half"] = lambda: decimal.Decimal("0.5")
+        client = self._get_test_client(api)
+        response = client.post(
+            '/',
+            data=json.dumps([
+                {"jsonrpc": "2.0", "method": "half", "id": 1},
+                {"jsonrpc": "2.0", "method": "dummy", "id": 2},
+            ]),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data.decode('utf8'))
+        self.assertEqual([r['result'] for r in data], [0.5, ''])
+
+    def test_codec_own_default(self):
+        def uuid_default(o):
+            if isinstance(o, uuid.UUID):
+                return str(o)
+            raise TypeError(o)
+
+        api = JSONRPCAPI(codec=JSONCodec(default=uuid_default))
+        api.dispatcher["values"] = lambda: [
+            uuid.UUID(int=1), decimal.Decimal("0.5")]
+        client = self._get_test_client(api)
+        response = client.post(
+            '/',
+            data=json.dumps({"jsonrpc": "2.0", "method": "values", "id": 1}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data.decode('utf8'))
+        self.assertEqual(
+            data['result'], ["00000000-0000-0000-0000-000000000001", 0.5])
+
+    def test_codec_resolved_once(self):
+        api = JSONRPCAPI(codec="json")
+        codec = api._get_codec()
+        self.assertIs(api._get_codec(), codec)
+        api.codec = JSONCodec()
+        self.assertIsNot(api._get_codec(), codec)
+
+    def test_batch_streamed(self):
+        response = self.client.post(
+            '/',
+            data=json.dumps([
+                {"jsonrpc": "2.0", "method": "dummy", "id": i}
+                for i in range(5000)
+            ]),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        data = json.loads(response.data.decode('utf8'))
+        self.assertEqual([r['id'] for r in data], list(range(5000)))
+
+    def test_raw_json(self):
+        api = JSONRPCAPI()
+        api.dispatcher["raw"] = lambda: RawJSON('{"a": [1, 2]}')
+        client = self._get_test_client(api)
+        response = client.post(
+            '/',
+            data=self.REQUEST.replace('dummy', 'raw'),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'"result":{"a": [1, 2]}', response.data)
+
+    def test_notifications_queue(self):
+        calls = []
+        notifications = NotificationQueue()
+        self.addCleanup(notifications.shutdown)
+        api = JSONRPCAPI(notifications=notifications)
+        api.dispatcher["append"] = calls.append
+        client = self._get_test_client(api)
+        response = client.post(
+            '/',
+            data=json.dumps(
+                {"jsonrpc": "2.0", "method": "append", "params": [1]}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.data, b'')
+        notifications.join()
+        self.assertEqual(calls, [1])
+
+    def test_notifications_queue_full(self):
+        api = JSONRPCAPI(notifications=MagicMock(
+            submit_all=MagicMock(side_effect=NotificationQueueFull)))
+        client = self._get_test_client(api)
+        response = client.post(
+            '/',
+            data=json.dumps({"jsonrpc": "2.0", "method": "dummy"}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 503)
+        data = json.loads(response.data.decode('utf8'))
+        self.assertEqual(data['error']['code'], -32001)
+
+    def test_deduplicate(self):
+        get = MagicMock(return_value=1)
+        api = JSONRPCAPI(deduplicate=True)
+        api.dispatcher.add_method(get, name="get", idempotent=True)
+        client = self._get_test_client(api)
+        response = client.post(
+            '/',
+            data=json.dumps([
+                {"jsonrpc": "2.0", "method": "get", "id": 0},
+                {"jsonrpc": "2.0", "method": "get", "id": 1},
+            ]),
+            content_type='application/json',
+        )
+        data = json.loads(response.data.decode('utf8'))
+        self.assertEqual([r['id'] for r in data], [0, 1])
+        self.assertEqual(get.call_count, 1)
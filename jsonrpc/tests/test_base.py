@@ -23,6 +23,12 @@ class TestJSONRPCBaseRequest(unittest.TestCase):
         with self.assertRaises(ValueError):
             request.data = None
 
+    def test_slots(self):
+        request = JSONRPCBaseRequest()
+        self.assertFalse(hasattr(request, "__dict__"))
+        with self.assertRaises(AttributeError):
+            request.extra = 1
+
 
 class TestJSONRPCBaseResponse(unittest.TestCase):
 
@@ -37,3 +43,28 @@ class TestJSONRPCBaseResponse(unittest.TestCase):
 
         with self.assertRaises(ValueError):
             response.data = None
+
+    def test_slots(self):
+        response = JSONRPCBaseResponse(result="")
+        self.assertFalse(hasattr(response, "__dict__"))
+        with self.assertRaises(AttributeError):
+            response.extra = 1
+
+    def test_serialize_override(self):
+        response = JSONRPCBaseResponse(result="")
+        self.assertEqual(response.json, "{}")
+        response.serialize = lambda data: "serialized"
+        self.assertEqual(response.json, "serialized")
+
+    def test_from_result(self):
+        response = JSONRPCBaseResponse._from_result("", 1)
+        self.assertEqual((response.result, response.error, response._id),
+                         ("", None, 1))
+        self.assertEqual(response.request, None)
+
+    def test_from_error(self):
+        error = {"code": 0, "message": ""}
+        response = JSONRPCBaseResponse._from_error(error)
+        self.assertEqual((response.result, response.error, response._id),
+                         (None, error, None))
+        self.assertEqual(response.request, None)
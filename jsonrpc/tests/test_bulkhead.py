@@ -0,0 +1,149 @@
+""" Test concurrency limits of methods."""
+import sys
+import threading
+
+from ..bulkhead import Bulkhead
+from ..dispatcher import Dispatcher
+from ..exceptions import JSONRPCError, JSONRPCServerBusy
+from ..jsonrpc2 import JSONRPC20BatchRequest, JSONRPC20Request
+from ..manager import JSONRPCResponseManager, ThreadPoolExecutor
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+
+class TestBulkhead(unittest.TestCase):
+
+    """ Test Bulkhead functionality."""
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            Bulkhead(0)
+        with self.assertRaises(ValueError):
+            Bulkhead(1, -1)
+
+    def test_acquire_release(self):
+        bulkhead = Bulkhead(2)
+        self.assertTrue(bulkhead.acquire())
+        self.assertTrue(bulkhead.acquire())
+        self.assertFalse(bulkhead.acquire())
+        bulkhead.release()
+        self.assertTrue(bulkhead.acquire())
+        self.assertEqual(bulkhead.stats(), {
+            "running": 2, "waiting": 0, "rejected": 1})
+
+    def test_queue(self):
+        bulkhead = Bulkhead(1, max_queue=1)
+        self.assertTrue(bulkhead.acquire())
+        acquired = []
+        thread = threading.Thread(
+            target=lambda: acquired.append(bulkhead.acquire()))
+        thread.start()
+        while not bulkhead.waiting:
+            thread.join(0.001)
+
+        # Queue is full.
+        self.assertFalse(bulkhead.acquire())
+
+        bulkhead.release()
+        thread.join(5)
+        self.assertEqual(acquired, [True])
+        self.assertEqual(bulkhead.stats(), {
+            "running": 1, "waiting": 0, "rejected": 1})
+
+    def test_error(self):
+        self.assertEqual(
+            Bulkhead(1).error, JSONRPCServerBusy.cached_data())
+        self.assertEqual(
+            Bulkhead(1, error=JSONRPCError(-32050, "Too many reports")).error,
+            {"code": -32050, "message": "Too many reports"})
+        with self.assertRaises(ValueError):
+            Bulkhead(1, error="busy")
+
+    @unittest.skipIf(asyncio is None, "asyncio is not available")
+    def test_acquire_async(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        bulkhead = Bulkhead(1, max_queue=2)
+
+        first = bulkhead.acquire_async(loop)
+        self.assertTrue(first.done())
+        second = bulkhead.acquire_async(loop)
+        third = bulkhead.acquire_async(loop)
+        self.assertEqual(bulkhead.acquire_async(loop), None)
+        self.assertFalse(second.done())
+
+        # Cancelled waiter leaves the queue.
+        bulkhead.cancel(second)
+        self.assertEqual(bulkhead.waiting, 1)
+
+        bulkhead.release()
+        self.assertTrue(loop.run_until_complete(third))
+        self.assertEqual(bulkhead.running, 1)
+
+        # Slot of waiter cancelled after hand over is released.
+        bulkhead.cancel(third)
+        self.assertEqual(bulkhead.running, 0)
+
+
+@unittest.skipIf(ThreadPoolExecutor is None, "futures is not installed")
+class TestManagerBulkhead(unittest.TestCase):
+
+    """ Test concurrency limits in JSONRPCResponseManager."""
+
+    def setUp(self):
+        self.event = threading.Event()
+        self.dispatcher = Dispatcher()
+        self.dispatcher.add_method(
+            lambda: self.event.wait(5), name="slow", max_concurrency=1)
+        self.dispatcher.add_method(
+            lambda: self.event.wait(5), name="queued", max_concurrency=1,
+            max_queue=1)
+        self.dispatcher.add_method(
+            lambda: self.event.set() or True, name="release")
+
+    def test_over_limit_is_rejected(self):
+        bulkhead = self.dispatcher.plan_for_method["slow"].bulkhead
+        request = JSONRPC20Request("slow", _id=0)
+        bulkhead.acquire()
+        response = JSONRPCResponseManager.handle(
+            request.json, self.dispatcher)
+        self.assertEqual(response.error, {
+            "code": -32001, "message": "Server busy"})
+
+        bulkhead.release()
+        self.event.set()
+        response = JSONRPCResponseManager.handle(
+            request.json, self.dispatcher)
+        self.assertEqual(response.result, True)
+        self.assertEqual(bulkhead.stats(), {
+            "running": 0, "waiting": 0, "rejected": 1})
+
+    def test_queued_call_waits(self):
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("queued", _id=0),
+            JSONRPC20Request("queued", _id=1),
+            JSONRPC20Request("release", _id=2),
+        )
+        response = JSONRPCResponseManager.handle(
+            request.json, self.dispatcher, max_workers=3)
+        self.assertEqual([r.result for r in response], [True, True, True])
+
+    def test_busy_error(self):
+        self.dispatcher.add_method(
+            lambda: self.event.wait(5), name="report", max_concurrency=1,
+            busy_error=JSONRPCError(-32050, "Too many reports"))
+        bulkhead = self.dispatcher.plan_for_method["report"].bulkhead
+        bulkhead.acquire()
+        response = JSONRPCResponseManager.handle(
+            JSONRPC20Request("report", _id=0).json, self.dispatcher)
+        self.assertEqual(response.error["code"], -32050)
+        bulkhead.release()
+        self.assertEqual(bulkhead.running, 0)
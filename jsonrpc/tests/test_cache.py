@@ -0,0 +1,326 @@
+""" Test memoization of method results."""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from decimal import Decimal
+
+from .. import cache
+from ..base import NOT_SET
+from ..cache import (
+    EncodedResultCache, SQLiteCache, TTLCache, get_params_key)
+from ..codec import get_codec
+from ..dispatcher import Dispatcher
+from ..jsonrpc2 import JSONRPC20BatchRequest, JSONRPC20Request
+from ..manager import JSONRPCResponseManager
+from ..utils import RawJSON
+
+if sys.version_info < (3, 3):
+    from mock import MagicMock, patch
+else:
+    from unittest.mock import MagicMock, patch
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+
+
+class TestParamsKey(unittest.TestCase):
+
+    """ Test get_params_key functionality."""
+
+    def test_canonical(self):
+        self.assertEqual(
+            get_params_key((), {"b": 1, "a": [1, 2]}),
+            get_params_key([], {"a": [1, 2], "b": 1}))
+        self.assertNotEqual(
+            get_params_key((1, 2), {}), get_params_key((2, 1), {}))
+        self.assertNotEqual(
+            get_params_key((), {"a": 1}), get_params_key((1,), {}))
+
+    def test_not_json(self):
+        self.assertEqual(get_params_key((), {"request": object()}), None)
+
+
+class TestTTLCache(unittest.TestCase):
+
+    """ Test TTLCache functionality."""
+
+    def setUp(self):
+        self.time = 100
+        patcher = patch.object(cache, "timer", lambda: self.time)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_invalid_maxsize(self):
+        with self.assertRaises(ValueError):
+            TTLCache(maxsize=0)
+
+    def test_get_set(self):
+        ttl_cache = TTLCache()
+        key = ttl_cache.make_key("sum", [1, 2], {})
+        self.assertIs(ttl_cache.get(key), NOT_SET)
+        ttl_cache.set(key, None)
+        self.assertEqual(ttl_cache.get(key), None)
+        self.assertEqual(ttl_cache.stats(), {
+            "hits": 1, "misses": 1, "size": 1})
+
+    def test_ttl(self):
+        ttl_cache = TTLCache(ttl=10)
+        ttl_cache.set("key", 1)
+        self.time += 9
+        self.assertEqual(ttl_cache.get("key"), 1)
+        self.time += 1
+        self.assertIs(ttl_cache.get("key"), NOT_SET)
+        self.assertEqual(len(ttl_cache), 0)
+
+    def test_lru(self):
+        ttl_cache = TTLCache(maxsize=2)
+        ttl_cache.set("a", 1)
+        ttl_cache.set("b", 2)
+        ttl_cache.get("a")
+        ttl_cache.set("c", 3)
+        self.assertIs(ttl_cache.get("b"), NOT_SET)
+        self.assertEqual(ttl_cache.get("a"), 1)
+        self.assertEqual(ttl_cache.get("c"), 3)
+
+    def test_invalidate(self):
+        ttl_cache = TTLCache()
+        for method, args, kwargs in [
+                ("a", [1], {}), ("a", [], {"x": 1}), ("a", [], {}),
+                ("b", [1], {})]:
+            ttl_cache.set(ttl_cache.make_key(method, args, kwargs), True)
+
+        ttl_cache.invalidate("a", [1])
+        self.assertEqual(len(ttl_cache), 3)
+        ttl_cache.invalidate("a", None)
+        self.assertEqual(len(ttl_cache), 2)
+        ttl_cache.invalidate("a")
+        self.assertEqual(len(ttl_cache), 1)
+        self.assertTrue(ttl_cache.get(ttl_cache.make_key("b", [1], {})))
+
+        ttl_cache.clear()
+        self.assertEqual(len(ttl_cache), 0)
+
+
+class TestManagerCache(unittest.TestCase):
+
+    """ Test cached methods in JSONRPCResponseManager."""
+
+    def setUp(self):
+        self.method = MagicMock(side_effect=lambda a, b=0: {"sum": a + b})
+        self.cache = TTLCache()
+        self.dispatcher = Dispatcher()
+        self.dispatcher.add_method(self.method, name="sum", cache=self.cache)
+
+    def handle(self, *requests):
+        request = JSONRPC20BatchRequest(*requests)
+        return list(JSONRPCResponseManager.handle(
+            request.json, self.dispatcher))
+
+    def test_result_is_cached(self):
+        response = self.handle(
+            JSONRPC20Request("sum", [1, 2], _id=0),
+            JSONRPC20Request("sum", [1, 2], _id=1),
+            JSONRPC20Request("sum", {"b": 2, "a": 1}, _id=2),
+            JSONRPC20Request("sum", {"a": 1, "b": 2}, _id=3),
+        )
+        self.assertEqual([r.result for r in response], [{"sum": 3}] * 4)
+        self.assertEqual([r._id for r in response], [0, 1, 2, 3])
+        self.assertEqual(self.method.call_count, 2)
+        self.assertEqual(self.cache.stats(), {
+            "hits": 2, "misses": 2, "size": 2})
+
+    def test_errors_are_not_cached(self):
+        response = self.handle(
+            JSONRPC20Request("sum", ["a", 1], _id=0),
+            JSONRPC20Request("sum", ["a", 1], _id=1),
+        )
+        self.assertEqual([r.error["code"] for r in response], [-32000] * 2)
+        self.assertEqual(self.method.call_count, 2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_context_arg_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.dispatcher.add_method(
+                lambda ctx: ctx["user"], name="balance", context_arg="ctx",
+                cache=self.cache)
+        self.assertNotIn("balance", self.dispatcher)
+
+    def test_invalidate(self):
+        self.handle(JSONRPC20Request("sum", [1], _id=0))
+        self.dispatcher.invalidate("sum", [1])
+        self.handle(JSONRPC20Request("sum", [1], _id=0))
+        self.assertEqual(self.method.call_count, 2)
+
+        self.dispatcher.invalidate("sum")
+        self.dispatcher.invalidate("unknown")
+        self.handle(JSONRPC20Request("sum", [1], _id=0))
+        self.assertEqual(self.method.call_count, 3)
+
+
+class TestEncodedResultCache(unittest.TestCase):
+
+    """ Test EncodedResultCache functionality."""
+
+    def test_get_set(self):
+        encoded_cache = EncodedResultCache()
+        key = encoded_cache.make_key("sum", [1, 2], {})
+        encoded_cache.set(key, {"sum": 3})
+        self.assertEqual(encoded_cache.get(key), RawJSON(b'{"sum": 3}'))
+        self.assertEqual(encoded_cache.get(key).loads(), {"sum": 3})
+        self.assertEqual(encoded_cache.stats(), {
+            "hits": 2, "misses": 0, "size": 1,
+            "bytes": len('{"sum": 3}') + len("sum") + len(key[1])})
+
+    def test_not_encodable(self):
+        encoded_cache = EncodedResultCache()
+        encoded_cache.set(("a", "[[],{}]"), object())
+        self.assertEqual(len(encoded_cache), 0)
+
+    def test_maxbytes(self):
+        # Each entry is 10 bytes: value, method and params key.
+        encoded_cache = EncodedResultCache(maxbytes=25)
+        for value in range(3):
+            encoded_cache.set(("a", "[[{0}],{{}}]".format(value)), value)
+        self.assertEqual(len(encoded_cache), 2)
+        self.assertEqual(encoded_cache.stats()["bytes"], 20)
+        self.assertIs(encoded_cache.get(("a", "[[0],{}]")), NOT_SET)
+
+        encoded_cache.set(("a", "[[3],{}]"), "x" * 30)
+        self.assertEqual(len(encoded_cache), 2)
+
+        encoded_cache.invalidate("a")
+        self.assertEqual(encoded_cache.stats()["bytes"], 0)
+
+    def test_codec(self):
+        codec = get_codec().with_default(str)
+        encoded_cache = EncodedResultCache(codec=codec)
+        encoded_cache.set(("a", "[[],{}]"), {"value": Decimal("1.5")})
+        self.assertEqual(
+            encoded_cache.get(("a", "[[],{}]")), RawJSON(b'{"value": "1.5"}'))
+
+    def test_manager(self):
+        method = MagicMock(return_value={"sum": 3})
+        dispatcher = Dispatcher()
+        dispatcher.add_method(method, name="sum", cache=EncodedResultCache())
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("sum", [1, 2], _id=0),
+            JSONRPC20Request("sum", [1, 2], _id="a"),
+        )
+        response = JSONRPCResponseManager.handle_request(request, dispatcher)
+        self.assertEqual(method.call_count, 1)
+        self.assertEqual(json.loads(response.encode()), [
+            {"jsonrpc": "2.0", "result": {"sum": 3}, "id": 0},
+            {"jsonrpc": "2.0", "result": {"sum": 3}, "id": "a"},
+        ])
+        self.assertEqual(
+            [r.data["result"] for r in response.responses], [{"sum": 3}] * 2)
+
+
+class TestSQLiteCache(unittest.TestCase):
+
+    """ Test SQLiteCache functionality."""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "cache.db")
+        self.time = 100
+        patcher = patch.object(cache.time, "time", lambda: self.time)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_set(self):
+        sqlite_cache = SQLiteCache(self.path)
+        key = sqlite_cache.make_key("sum", [1, 2], {})
+        self.assertIs(sqlite_cache.get(key), NOT_SET)
+        sqlite_cache.set(key, {"sum": 3})
+        sqlite_cache.set(("a", "[[],{}]"), object())
+        self.assertEqual(sqlite_cache.get(key), RawJSON(b'{"sum": 3}'))
+        self.assertEqual(sqlite_cache.stats(), {
+            "hits": 1, "misses": 1, "size": 1,
+            "bytes": len('{"sum": 3}') + len("sum") + len(key[1])})
+
+    def test_shared(self):
+        key = ("a", "[[],{}]")
+        SQLiteCache(self.path).set(key, 1)
+        sqlite_cache = SQLiteCache(self.path)
+        self.assertEqual(sqlite_cache.get(key), RawJSON(b"1"))
+
+        # Other threads use own connections.
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(sqlite_cache.get(key)))
+        thread.start()
+        thread.join()
+        self.assertEqual(results, [RawJSON(b"1")])
+
+    def test_ttl(self):
+        sqlite_cache = SQLiteCache(self.path, ttl=10)
+        sqlite_cache.set(("a", "[[],{}]"), 1)
+        self.time += 10
+        self.assertIs(sqlite_cache.get(("a", "[[],{}]")), NOT_SET)
+        sqlite_cache.set(("a", "[[1],{}]"), 1)
+        self.assertEqual(len(sqlite_cache), 1)
+
+    def test_maxbytes(self):
+        # Each entry is 10 bytes, ones expiring first are evicted.
+        sqlite_cache = SQLiteCache(self.path, maxbytes=25)
+        for value in range(3):
+            self.time += 1
+            sqlite_cache.set(("a", "[[{0}],{{}}]".format(value)), value)
+        self.assertEqual(sqlite_cache.stats()["bytes"], 20)
+        self.assertIs(sqlite_cache.get(("a", "[[0],{}]")), NOT_SET)
+        self.assertEqual(sqlite_cache.get(("a", "[[2],{}]")), RawJSON(b"2"))
+
+        sqlite_cache.set(("a", "[[3],{}]"), "x" * 30)
+        self.assertEqual(len(sqlite_cache), 2)
+
+    def test_invalidate(self):
+        sqlite_cache = SQLiteCache(self.path)
+        for method, args in [("a", [1]), ("a", [2]), ("b", [1])]:
+            sqlite_cache.set(sqlite_cache.make_key(method, args, {}), True)
+
+        sqlite_cache.invalidate("a", [1])
+        self.assertEqual(len(sqlite_cache), 2)
+        sqlite_cache.invalidate("a")
+        self.assertEqual(len(sqlite_cache), 1)
+        self.assertEqual(
+            sqlite_cache.stats()["bytes"], len("true" "b" "[[1],{}]"))
+        sqlite_cache.clear()
+        self.assertEqual(len(sqlite_cache), 0)
+        self.assertEqual(sqlite_cache.stats()["bytes"], 0)
+
+    def test_size_total(self):
+        sqlite_cache = SQLiteCache(self.path, ttl=10)
+        key = ("a", "[[],{}]")
+        sqlite_cache.set(key, 1)
+        sqlite_cache.set(key, 12)
+        sqlite_cache.set(("a", "[[1],{}]"), 1)
+        self.assertEqual(sqlite_cache.stats()["bytes"], 10 + 10)
+
+        # Total is kept in the database, expired entries are subtracted.
+        self.time += 10
+        other = SQLiteCache(self.path)
+        other.set(("b", "[[],{}]"), 1)
+        self.assertEqual(sqlite_cache.stats(), {
+            "hits": 0, "misses": 0, "size": 1, "bytes": 9})
+
+    def test_manager(self):
+        method = MagicMock(return_value={"sum": 3})
+        dispatcher = Dispatcher()
+        dispatcher.add_method(
+            method, name="sum", cache=SQLiteCache(self.path))
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("sum", [1, 2], _id=0),
+            JSONRPC20Request("sum", [1, 2], _id=1),
+        )
+        response = JSONRPCResponseManager.handle_request(request, dispatcher)
+        self.assertEqual(method.call_count, 1)
+        self.assertEqual(
+            [r["result"] for r in json.loads(response.encode())],
+            [{"sum": 3}] * 2)
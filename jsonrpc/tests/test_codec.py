@@ -0,0 +1,144 @@
+""" Test json codecs."""
+import datetime
+import decimal
+import json
+import sys
+
+from ..codec import (
+    CODECS,
+    JSONCodec,
+    get_codec,
+    register_codec,
+    set_default_codec,
+)
+from ..dispatcher import Dispatcher
+from ..jsonrpc2 import JSONRPC20Request, JSONRPC20Response
+from ..manager import JSONRPCResponseManager
+from ..utils import JSONSerializable, datetime_decimal_default
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+
+
+class TestGetCodec(unittest.TestCase):
+
+    """ Test codec registry."""
+
+    def tearDown(self):
+        set_default_codec(None)
+
+    def test_default(self):
+        self.assertTrue(type(get_codec()) is JSONCodec)
+
+    def test_instance(self):
+        codec = JSONCodec()
+        self.assertTrue(get_codec(codec) is codec)
+
+    def test_name(self):
+        self.assertEqual(get_codec("json").name, "json")
+        self.assertTrue(get_codec("json") is get_codec("json"))
+
+    def test_unknown_name(self):
+        with self.assertRaises(ValueError):
+            get_codec("yaml")
+
+    def test_not_installed_fallback(self):
+        class MissingCodec(JSONCodec):
+            name = "missing"
+            available = False
+
+        register_codec(MissingCodec)
+        try:
+            self.assertTrue(type(get_codec("missing")) is JSONCodec)
+        finally:
+            del CODECS["missing"]
+
+    def test_set_default_codec(self):
+        codec = JSONCodec()
+        set_default_codec(codec)
+        self.assertTrue(get_codec() is codec)
+        set_default_codec(None)
+        self.assertFalse(get_codec() is codec)
+
+    def test_default_codec_used_for_serialize(self):
+        class UpperCodec(JSONCodec):
+            def dumps(self, obj):
+                return super(UpperCodec, self).dumps(obj).upper()
+
+        set_default_codec(UpperCodec())
+        self.assertEqual(JSONSerializable.serialize({"a": "b"}), '{"A": "B"}')
+
+
+class TestCodecs(unittest.TestCase):
+
+    """ Test every available codec."""
+
+    def test_loads_dumps(self):
+        for name in CODECS:
+            codec = get_codec(name)
+            data = {"jsonrpc": "2.0", "params": [1, u"\u0444"], "id": None}
+            self.assertEqual(json.loads(codec.dumps(data)), data)
+            self.assertEqual(
+                json.loads(codec.dumps_bytes(data).decode("utf-8")), data)
+            encoded = json.dumps(data).encode("utf-8")
+            for s in [encoded.decode("utf-8"), encoded, bytearray(encoded),
+                      memoryview(encoded)]:
+                self.assertEqual(codec.loads(s), data)
+
+    def test_loads_error(self):
+        for name in CODECS:
+            with self.assertRaises(ValueError):
+                get_codec(name).loads('{"jsonrpc": ')
+
+    def test_with_default(self):
+        value = {"d": decimal.Decimal("0.5"), "dt": datetime.date(2020, 1, 2)}
+        for name in CODECS:
+            codec = get_codec(name).with_default(datetime_decimal_default)
+            self.assertEqual(json.loads(codec.dumps(value)), {
+                "d": 0.5, "dt": "2020-01-02"})
+            self.assertTrue(get_codec(name).default is None)
+
+
+class TestManagerCodec(unittest.TestCase):
+
+    """ Test codec selection in JSONRPCResponseManager."""
+
+    def setUp(self):
+        self.calls = []
+        test = self
+
+        class RecordingCodec(JSONCodec):
+            def loads(self, s):
+                test.calls.append("loads")
+                return super(RecordingCodec, self).loads(s)
+
+            def dumps(self, obj):
+                test.calls.append("dumps")
+                return super(RecordingCodec, self).dumps(obj)
+
+        self.codec = RecordingCodec()
+        self.dispatcher = Dispatcher({"add": lambda a, b: a + b})
+
+    def test_dispatcher_codec(self):
+        self.dispatcher.codec = self.codec
+        request = JSONRPC20Request("add", [1, 2], _id=0)
+        response = JSONRPCResponseManager.handle(request.json, self.dispatcher)
+        self.assertEqual(json.loads(response.json)["result"], 3)
+        self.assertEqual(self.calls, ["loads", "dumps"])
+
+    def test_explicit_codec(self):
+        request = JSONRPC20Request("add", [1, 2], _id=0)
+        response = JSONRPCResponseManager.handle(
+            "[{0}]".format(request.json), {"add": lambda a, b: a + b},
+            codec=self.codec)
+        self.assertEqual(json.loads(response.json)[0]["result"], 3)
+        self.assertEqual(self.calls, ["loads", "dumps"])
+
+    def test_parse_error(self):
+        response = JSONRPCResponseManager.handle(
+            "{", self.dispatcher, codec=self.codec)
+        self.assertTrue(isinstance(response, JSONRPC20Response))
+        self.assertEqual(json.loads(response.json)["error"]["code"], -32700)
+        self.assertEqual(self.calls, ["loads", "dumps"])
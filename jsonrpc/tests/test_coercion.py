@@ -0,0 +1,137 @@
+""" Test params coercion according to annotations."""
+import datetime
+import decimal
+import json
+import sys
+import uuid
+
+from ..coercion import CoercionError, compile_coercer, compile_converter
+from ..dispatcher import Dispatcher
+from ..jsonrpc2 import JSONRPC20Request
+from ..manager import JSONRPCResponseManager
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+
+if sys.version_info < (3, 5):
+    raise unittest.SkipTest("Test Py3.5+ functionality")
+
+from typing import Dict, List, Optional  # noqa
+from .py35_utils import book, not_annotated, weekday  # noqa
+
+GUEST = "12345678-1234-5678-1234-567812345678"
+
+
+class TestCompileConverter(unittest.TestCase):
+
+    """ Test compile_converter functionality."""
+
+    def test_scalars(self):
+        for annotation, value, expected in [
+                (int, 1, 1),
+                (int, "2", 2),
+                (int, 3.0, 3),
+                (float, 1, 1.0),
+                (float, "0.5", 0.5),
+                (decimal.Decimal, 0.1, decimal.Decimal("0.1")),
+                (decimal.Decimal, "1.10", decimal.Decimal("1.10")),
+                (datetime.date, "2020-01-02", datetime.date(2020, 1, 2)),
+                (datetime.datetime, "2020-01-02T03:04:05",
+                 datetime.datetime(2020, 1, 2, 3, 4, 5)),
+                (uuid.UUID, GUEST, uuid.UUID(GUEST))]:
+            self.assertEqual(compile_converter(annotation)(value), expected)
+
+    def test_invalid(self):
+        for annotation, value in [
+                (int, True), (int, 1.5), (int, "a"), (int, None),
+                (float, "a"), (float, [1]),
+                (decimal.Decimal, "a"), (decimal.Decimal, {}),
+                (datetime.date, "2020-13-01"), (datetime.date, 20200101),
+                (datetime.datetime, "noon"), (uuid.UUID, "guest"),
+                (List[int], 1), (Dict[str, int], [])]:
+            with self.assertRaises((TypeError, ValueError)):
+                compile_converter(annotation)(value)
+
+    def test_containers(self):
+        self.assertEqual(compile_converter(List[datetime.date])(
+            ["2020-01-02"]), [datetime.date(2020, 1, 2)])
+        self.assertEqual(compile_converter(Dict[str, decimal.Decimal])(
+            {"a": "1"}), {"a": decimal.Decimal("1")})
+        self.assertEqual(compile_converter(Optional[int])(None), None)
+        self.assertEqual(compile_converter(Optional[int])("1"), 1)
+
+    def test_not_supported(self):
+        for annotation in [None, str, list, dict, List[str], Optional[str],
+                           "int", [int]]:
+            self.assertEqual(compile_converter(annotation), None)
+
+
+class TestCompileCoercer(unittest.TestCase):
+
+    """ Test compile_coercer functionality."""
+
+    def test_coerce(self):
+        coerce = compile_coercer(book)
+        params = {"amount": "9.99", "until": "2020-01-03T12:00:00",
+                  "note": "late"}
+        args, kwargs = coerce(("2020-01-02",), params)
+        self.assertEqual(args, [datetime.date(2020, 1, 2)])
+        self.assertEqual(kwargs, {
+            "amount": decimal.Decimal("9.99"),
+            "until": datetime.datetime(2020, 1, 3, 12),
+            "note": "late",
+        })
+        # Request params are not modified.
+        self.assertEqual(params["amount"], "9.99")
+
+    def test_error(self):
+        coerce = compile_coercer(book)
+        with self.assertRaises(CoercionError) as context:
+            coerce(("2020-01-02", "1", ["x"]), {})
+        self.assertTrue(str(context.exception).startswith(
+            "Parameter 'rooms': "))
+
+    def test_not_annotated(self):
+        self.assertEqual(compile_coercer(not_annotated), None)
+        self.assertEqual(compile_coercer(len), None)
+
+
+class TestManagerCoercion(unittest.TestCase):
+
+    """ Test coercion of params by JSONRPCResponseManager."""
+
+    def setUp(self):
+        self.dispatcher = Dispatcher()
+        self.dispatcher.add_method(book, coerce=True)
+        self.dispatcher.add_method(book, name="book_raw")
+
+    def handle(self, method, params):
+        request = JSONRPC20Request(method, params, _id=0)
+        return JSONRPCResponseManager.handle(request.json, self.dispatcher)
+
+    def test_coerce(self):
+        response = self.handle("book", ["2020-01-02", 10, [1, "2"], GUEST])
+        self.assertEqual(response.result["day"], datetime.date(2020, 1, 2))
+        self.assertEqual(response.result["amount"], decimal.Decimal(10))
+        self.assertEqual(response.result["rooms"], [1, 2])
+        self.assertEqual(response.result["guest"], uuid.UUID(GUEST))
+
+    def test_not_coerced(self):
+        response = self.handle("book_raw", ["2020-01-02", 10, [1]])
+        self.assertEqual(response.result["day"], "2020-01-02")
+
+    def test_decorator(self):
+        self.dispatcher.add_method(coerce=True)(weekday)
+        self.assertEqual(self.handle("weekday", ["2020-01-06"]).result, 0)
+
+    def test_invalid_params(self):
+        response = self.handle("book", {
+            "day": "2020-01-02", "amount": "1", "rooms": [],
+            "prices": {"a": "cheap"}})
+        self.assertEqual(response.error["code"], -32602)
+        self.assertEqual(response.error["data"]["type"], "CoercionError")
+        self.assertTrue(response.error["data"]["message"].startswith(
+            "Parameter 'prices': "))
+        json.loads(response.json)
@@ -1,4 +1,4 @@
-from ..dispatcher import Dispatcher
+from ..dispatcher import Dispatcher, MethodPlan
 import sys
 if sys.version_info < (2, 7):
     import unittest2 as unittest
@@ -63,6 +63,35 @@ class TestDispatcher(unittest.TestCase):
 
         self.assertEqual(d.context_arg_for_method["x_plus_id"], "context")
 
+    def test_set_context_arg_for_method(self):
+        d = Dispatcher()
+        d["x_plus_id"] = lambda x, context: x + context["id"]
+        d["one"] = lambda: 1
+
+        d.context_arg_for_method["x_plus_id"] = "context"
+        self.assertEqual(d.context_arg_for_method, {"x_plus_id": "context"})
+        self.assertEqual(d.plan_for_method["x_plus_id"].context_arg, "context")
+
+        del d.context_arg_for_method["x_plus_id"]
+        self.assertEqual(d.context_arg_for_method, {})
+        self.assertIsNone(d.plan_for_method["x_plus_id"].context_arg)
+
+        d.context_arg_for_method = {"x_plus_id": "context"}
+        self.assertEqual(dict(d.context_arg_for_method), {
+            "x_plus_id": "context"})
+
+        with self.assertRaises(KeyError):
+            d.context_arg_for_method["unknown"] = "context"
+        with self.assertRaises(KeyError):
+            del d.context_arg_for_method["one"]
+
+    def test_set_context_arg_for_method_with_cache(self):
+        d = Dispatcher()
+        d.add_method(lambda: 1, name="one", single_flight=True)
+
+        with self.assertRaises(ValueError):
+            d.context_arg_for_method["one"] = "context"
+
     def test_add_class(self):
         d = Dispatcher()
         d.add_class(Math)
@@ -105,6 +134,39 @@ class TestDispatcher(unittest.TestCase):
 
         del d["method"]
         self.assertNotIn("method", d)
+        self.assertNotIn("method", d.plan_for_method)
+
+    def test_params_checker(self):
+        d = Dispatcher()
+
+        @d.add_method
+        def add(x, y):
+            return x + y
+
+        d["sub"] = lambda x, y: x - y
+        self.assertEqual(
+            d.plan_for_method["add"].check_params((1, 2), {}), None)
+        self.assertTrue(d.plan_for_method["sub"].check_params((1,), {}))
+
+    def test_plan(self):
+        d = Dispatcher()
+
+        @d.add_method(name="one", context_arg="context")
+        def one(x, context):
+            return x
+
+        plan = d.plan_for_method["one"]
+        self.assertTrue(isinstance(plan, MethodPlan))
+        self.assertTrue(plan.method is one)
+        self.assertEqual(plan.context_arg, "context")
+        self.assertEqual(plan.coerce_params, None)
+        self.assertEqual(plan.validate_params, None)
+
+    def test_add_plan(self):
+        d = Dispatcher()
+        d.add_plan("sum", MethodPlan(sum, check_params=False))
+        self.assertEqual(d["sum"]([1, 2]), 3)
+        self.assertEqual(d.plan_for_method["sum"].check_params, None)
 
     def test_to_dict(self):
         d = Dispatcher()
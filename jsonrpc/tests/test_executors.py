@@ -0,0 +1,151 @@
+""" Test per method executors."""
+import math
+import sys
+import threading
+
+from .. import executors
+from ..dispatcher import Dispatcher
+from ..executors import (
+    TrackedExecutor,
+    ThreadPoolExecutor,
+    check_picklable,
+    get_executor,
+    get_executor_stats,
+)
+from ..jsonrpc2 import JSONRPC20BatchRequest, JSONRPC20Request
+from ..manager import JSONRPCResponseManager
+
+if sys.version_info < (3, 3):
+    from mock import patch
+else:
+    from unittest.mock import patch
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+
+if ThreadPoolExecutor is None:
+    raise unittest.SkipTest("futures is not installed")
+
+
+def current_thread_name():
+    return threading.current_thread().name
+
+
+class TestGetExecutor(unittest.TestCase):
+
+    """ Test get_executor and executor tracking."""
+
+    def setUp(self):
+        patcher = patch.object(executors, "_executors", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_inline(self):
+        self.assertEqual(get_executor(None), None)
+        self.assertEqual(get_executor("inline"), None)
+
+    def test_shared_thread_pool(self):
+        tracked = get_executor("thread")
+        self.assertTrue(isinstance(tracked, TrackedExecutor))
+        self.assertTrue(isinstance(tracked.executor, ThreadPoolExecutor))
+        self.assertIs(get_executor("thread"), tracked)
+        self.assertIs(get_executor(tracked), tracked)
+
+    def test_executor_instance(self):
+        with ThreadPoolExecutor(1) as executor:
+            tracked = get_executor(executor)
+            self.assertIs(tracked.executor, executor)
+            self.assertIs(get_executor(executor), tracked)
+            self.assertEqual(list(get_executor_stats()), [tracked.name])
+
+    def test_unknown_executor(self):
+        for executor in ["threads", 1, object()]:
+            with self.assertRaises(ValueError):
+                get_executor(executor)
+
+    def test_stats(self):
+        event = threading.Event()
+        with ThreadPoolExecutor(1) as executor:
+            tracked = get_executor(executor)
+            future = tracked.submit(event.wait, 5)
+            self.assertEqual(tracked.queue_depth, 1)
+            self.assertEqual(get_executor_stats(), {tracked.name: {
+                "submitted": 1, "completed": 0, "queue_depth": 1}})
+            event.set()
+            future.result()
+
+        self.assertEqual(tracked.stats(), {
+            "submitted": 1, "completed": 1, "queue_depth": 0})
+
+    def test_check_picklable(self):
+        check_picklable(math.factorial)
+        check_picklable(current_thread_name)
+        with self.assertRaises(ValueError):
+            check_picklable(lambda: None)
+
+
+class TestMethodExecutor(unittest.TestCase):
+
+    """ Test calling methods in their executors."""
+
+    def setUp(self):
+        patcher = patch.object(executors, "_executors", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Shared pools created by the test are not reused.
+        self.addCleanup(lambda: [
+            tracked.executor.shutdown()
+            for tracked in executors._executors.values()
+        ])
+
+        self.dispatcher = Dispatcher()
+        self.executor = ThreadPoolExecutor(
+            2, thread_name_prefix="jsonrpc-test") \
+            if sys.version_info >= (3, 6) else ThreadPoolExecutor(2)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_inline_by_default(self):
+        self.dispatcher.add_method(current_thread_name)
+        response = JSONRPCResponseManager.handle(
+            JSONRPC20Request("current_thread_name", _id=0).json,
+            self.dispatcher)
+        self.assertEqual(response.result, threading.current_thread().name)
+
+    def test_executor_instance(self):
+        self.dispatcher.add_method(current_thread_name,
+                                   executor=self.executor)
+        response = JSONRPCResponseManager.handle(
+            JSONRPC20Request("current_thread_name", _id=0).json,
+            self.dispatcher)
+        self.assertNotEqual(
+            response.result, threading.current_thread().name)
+        stats = get_executor_stats()[
+            self.dispatcher.plan_for_method["current_thread_name"]
+            .executor.name]
+        self.assertEqual(stats["submitted"], 1)
+
+    def test_errors(self):
+        self.dispatcher.add_method(
+            lambda a: a["missing"], name="error", executor=self.executor)
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("error", [{}], _id=0),
+            JSONRPC20Request("error", [], _id=1),
+        )
+        response = JSONRPCResponseManager.handle(
+            request.json, self.dispatcher)
+        self.assertEqual(
+            [r.error["code"] for r in response], [-32000, -32602])
+
+    def test_process_pool(self):
+        self.dispatcher.add_method(math.factorial, executor="process")
+        response = JSONRPCResponseManager.handle(
+            JSONRPC20Request("factorial", [5], _id=0).json, self.dispatcher)
+        self.assertEqual(response.result, 120)
+
+    def test_process_pool_not_picklable(self):
+        with self.assertRaises(ValueError):
+            self.dispatcher.add_method(
+                lambda: None, name="local", executor="process")
+        self.assertNotIn("local", self.dispatcher)
@@ -1,7 +1,11 @@
 import json
 import sys
 
-from ..exceptions import JSONRPCInvalidRequestException
+from ..exceptions import (
+    JSONRPCInvalidRequestException,
+    JSONRPCMethodNotFound,
+)
+from ..utils import RawJSON
 from ..jsonrpc2 import (
     JSONRPC20Request,
     JSONRPC20BatchRequest,
@@ -490,6 +494,14 @@ class TestJSONRPC20Request(unittest.TestCase):
         with self.assertRaises(ValueError):
             request.data = None
 
+    def test_data_setter_fields(self):
+        request = JSONRPC20Request(**self.request_params)
+        request.data = {"jsonrpc": "2.0", "method": "mul", "params": [3]}
+        self.assertEqual(request.method, "mul")
+        self.assertEqual(request.params, [3])
+        self.assertEqual(request.args, (3,))
+        self.assertEqual(request._id, None)
+
 
 class TestJSONRPC20BatchRequest(unittest.TestCase):
 
@@ -547,6 +559,39 @@ class TestJSONRPC20BatchRequest(unittest.TestCase):
             self.assertTrue(isinstance(request, JSONRPC20Request))
             self.assertEqual(request.method, "devide")
 
+    def test_from_data_batch_same_as_constructor(self):
+        requests = JSONRPC20Request.from_data([
+            {"method": "add", "params": [1, 2], "jsonrpc": "2.0", "id": 1},
+            {"method": "add", "params": {"a": 1}, "jsonrpc": "2.0"},
+            {"method": "add", "params": (1, 2), "jsonrpc": "2.0", "id": "x"},
+        ])
+        expected = [
+            JSONRPC20Request("add", [1, 2], _id=1, is_notification=False),
+            JSONRPC20Request("add", {"a": 1}, is_notification=True),
+            JSONRPC20Request("add", [1, 2], _id="x", is_notification=False),
+        ]
+        for request, expected_request in zip(requests, expected):
+            self.assertEqual(request.data, expected_request.data)
+            self.assertEqual(request.is_notification,
+                             expected_request.is_notification)
+            self.assertEqual(request.args, expected_request.args)
+            self.assertEqual(request.kwargs, expected_request.kwargs)
+
+    def test_from_data_batch_invalid_element(self):
+        valid = {"method": "add", "jsonrpc": "2.0", "id": 1}
+        for invalid in [
+                1,
+                [],
+                {"method": "add"},
+                {"method": "add", "jsonrpc": "2.0", "extra": 1},
+                {"method": 1, "jsonrpc": "2.0"},
+                {"method": "rpc.add", "jsonrpc": "2.0"},
+                {"method": "add", "jsonrpc": "2.0", "params": "a"},
+                {"method": "add", "jsonrpc": "2.0", "id": 0.5},
+                {"method": "add", "jsonrpc": "2.0", "id": []}]:
+            with self.assertRaises(JSONRPCInvalidRequestException):
+                JSONRPC20Request.from_data([valid, invalid])
+
 
 class TestJSONRPC20Response(unittest.TestCase):
 
@@ -691,6 +736,53 @@ class TestJSONRPC20Response(unittest.TestCase):
         with self.assertRaises(ValueError):
             response.data = None
 
+    def test_data_setter_fields(self):
+        response = JSONRPC20Response(**self.response_success_params)
+        response.data = {"jsonrpc": "2.0", "error": {"code": 0,
+                         "message": ""}, "id": 2}
+        self.assertEqual(response.result, None)
+        self.assertEqual(response.error, {"code": 0, "message": ""})
+        self.assertEqual(response._id, 2)
+        self.assertEqual(json.loads(response.json), response.data)
+
+    def test_encode(self):
+        responses = [
+            JSONRPC20Response(result="", _id=0),
+            JSONRPC20Response(result=None, _id="id"),
+            JSONRPC20Response(result=[1, {"a": u"\u0444"}]),
+            JSONRPC20Response(error={"code": 0, "message": ""}, _id=1),
+            JSONRPC20Response(error={"code": 0, "message": ""}),
+        ]
+        for response in responses:
+            encoded = response.encode()
+            self.assertTrue(isinstance(encoded, bytes))
+            self.assertEqual(json.loads(encoded.decode("utf-8")),
+                             response.data)
+
+        self.assertEqual(
+            JSONRPC20Response(result=1, _id=2).encode(),
+            b'{"jsonrpc":"2.0","result":1,"id":2}')
+
+    def test_raw_json_result(self):
+        response = JSONRPC20Response(result=RawJSON('{"a":  [1]}'), _id=1)
+        self.assertEqual(response.result, RawJSON('{"a":  [1]}'))
+        self.assertEqual(response.data["result"], {"a": [1]})
+        self.assertEqual(json.loads(response.json)["result"], {"a": [1]})
+        self.assertEqual(
+            response.encode(),
+            b'{"jsonrpc":"2.0","result":{"a":  [1]},"id":1}')
+
+    def test_cached_error(self):
+        error = JSONRPCMethodNotFound.cached_data()
+        response = JSONRPC20Response._from_error(error, "x")
+        self.assertTrue(response.error is error)
+        self.assertEqual(response.data, {
+            "jsonrpc": "2.0", "error": error, "id": "x"})
+        self.assertEqual(
+            response.encode(),
+            b'{"jsonrpc":"2.0","error":' + error.encoded + b',"id":"x"}')
+        self.assertEqual(json.loads(response.json), response.data)
+
 
 class TestJSONRPC20BatchResponse(unittest.TestCase):
 
@@ -726,3 +818,74 @@ class TestJSONRPC20BatchResponse(unittest.TestCase):
             {"id": 2, "jsonrpc": "2.0", "result": "result"},
             {"id": None, "jsonrpc": "2.0", "result": "result"},
         ])
+
+    def test_batch_response_encode(self):
+        response = JSONRPC20BatchResponse(
+            JSONRPC20Response(result={"a": [1, None]}, _id=1),
+            JSONRPC20Response(error={"code": 0, "message": ""}, _id="2"),
+            JSONRPC20Response(result=None),
+        )
+        for codec in ["json", "orjson"]:
+            encoded = response.encode(codec)
+            self.assertTrue(isinstance(encoded, bytes))
+            self.assertEqual(json.loads(encoded.decode("utf-8")),
+                             response.data)
+
+    def test_batch_response_encode_spliced(self):
+        class SplicedResponse(JSONRPC20Response):
+            __slots__ = ()
+
+            def _has_encoded_parts(self):
+                return True
+
+        response = JSONRPC20BatchResponse(
+            JSONRPC20Response(result=1, _id=1),
+            SplicedResponse(result=2, _id=2),
+            JSONRPC20Response(result=3, _id=3),
+            JSONRPC20Response(result=4, _id=4),
+            SplicedResponse(result=5, _id=5),
+        )
+        self.assertEqual(json.loads(response.encode().decode("utf-8")),
+                         response.data)
+
+    def test_batch_response_encode_raw_json(self):
+        response = JSONRPC20BatchResponse(
+            JSONRPC20Response(result=1, _id=1),
+            JSONRPC20Response(result=RawJSON(b'{"b" : 2}'), _id=2),
+            JSONRPC20Response(result=3, _id=3),
+        )
+        encoded = response.encode()
+        self.assertIn(b'"result":{"b" : 2}', encoded)
+        self.assertEqual(json.loads(encoded.decode("utf-8")), response.data)
+
+    def test_batch_response_iter_bytes(self):
+        response = JSONRPC20BatchResponse(*[
+            JSONRPC20Response(
+                result=RawJSON(b'[1]') if i % 100 == 0 else {"i": i}, _id=i)
+            for i in range(1000)
+        ])
+        chunks = list(response.iter_bytes(chunk_size=1024))
+        self.assertTrue(len(chunks) > 1)
+        for chunk in chunks[:-1]:
+            self.assertTrue(len(chunk) >= 1024)
+        self.assertEqual(json.loads(b"".join(chunks).decode("utf-8")),
+                         response.data)
+
+    def test_batch_response_iter_json(self):
+        response = JSONRPC20BatchResponse(
+            JSONRPC20Response(result=u"\u0444", _id=1),
+            JSONRPC20Response(error={"code": 1, "message": ""}, _id=2),
+        )
+        self.assertEqual(json.loads("".join(response.iter_json())),
+                         response.data)
+        self.assertEqual(list(JSONRPC20BatchResponse().iter_json()), ["[]"])
+
+    def test_batch_response_encode_cached_error(self):
+        error = JSONRPCMethodNotFound.cached_data()
+        response = JSONRPC20BatchResponse(
+            JSONRPC20Response(result=1, _id=1),
+            JSONRPC20Response._from_error(error, 2),
+        )
+        encoded = response.encode()
+        self.assertIn(error.encoded, encoded)
+        self.assertEqual(json.loads(encoded.decode("utf-8")), response.data)
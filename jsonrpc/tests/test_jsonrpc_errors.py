@@ -1,8 +1,10 @@
+import copy
 import json
 import sys
 
 from ..exceptions import (
     JSONRPCError,
+    JSONRPCErrorData,
     JSONRPCInternalError,
     JSONRPCInvalidParams,
     JSONRPCInvalidRequest,
@@ -141,6 +143,37 @@ class TestJSONRPCMethodNotFound(unittest.TestCase):
         self.assertEqual(error.data, None)
 
 
+class TestJSONRPCErrorCachedData(unittest.TestCase):
+    def test_cached_data(self):
+        for error_class in [JSONRPCParseError, JSONRPCInvalidRequest,
+                            JSONRPCMethodNotFound, JSONRPCInvalidParams,
+                            JSONRPCInternalError, JSONRPCServerError]:
+            data = error_class.cached_data()
+            self.assertTrue(data is error_class.cached_data())
+            self.assertEqual(data, error_class()._data)
+            self.assertEqual(json.loads(data.encoded.decode("utf-8")), data)
+
+    def test_encoded(self):
+        self.assertEqual(JSONRPCParseError.cached_data().encoded,
+                         b'{"code":-32700,"message":"Parse error"}')
+
+    def test_read_only(self):
+        data = JSONRPCErrorData(code=1, message="")
+        for modify in [lambda: data.__setitem__("data", 1),
+                       lambda: data.update(data=1),
+                       lambda: data.pop("code"),
+                       data.clear]:
+            with self.assertRaises(TypeError):
+                modify()
+        self.assertEqual(data, {"code": 1, "message": ""})
+
+    def test_copy(self):
+        data = copy.deepcopy(JSONRPCParseError.cached_data())
+        data["data"] = 1
+        self.assertEqual(type(data), dict)
+        self.assertNotIn("data", JSONRPCParseError.cached_data())
+
+
 class TestJSONRPCDispatchException(unittest.TestCase):
     def test_code_message(self):
         error = JSONRPCDispatchException(message="message",
@@ -1,7 +1,16 @@
+import functools
+import io
+import json
 import sys
+import threading
+import time
 
 from ..dispatcher import Dispatcher
-from ..manager import JSONRPCResponseManager
+from ..manager import (
+    FuturesTimeoutError,
+    JSONRPCResponseManager,
+    ThreadPoolExecutor,
+)
 from ..jsonrpc2 import (
     JSONRPC20BatchRequest,
     JSONRPC20BatchResponse,
@@ -10,11 +19,12 @@ from ..jsonrpc2 import (
 )
 from ..jsonrpc1 import JSONRPC10Request, JSONRPC10Response
 from ..exceptions import JSONRPCDispatchException
+from ..utils import RawJSON
 
 if sys.version_info < (3, 3):
-    from mock import MagicMock
+    from mock import MagicMock, patch
 else:
-    from unittest.mock import MagicMock
+    from unittest.mock import MagicMock, patch
 
 if sys.version_info < (2, 7):
     import unittest2 as unittest
@@ -38,6 +48,7 @@ class TestJSONRPCResponseManager(unittest.TestCase):
         self.dispatcher["type_error"] = lambda: raise_(
             TypeError("TypeError inside method"))
         self.dispatcher["long_time_method"] = self.long_time_method
+        self.dispatcher["raw"] = lambda: RawJSON(b'{"cached": true}')
         self.dispatcher["dispatch_error"] = lambda x: raise_(
             JSONRPCDispatchException(code=4000, message="error",
                                      data={"param": 1}))
@@ -70,6 +81,21 @@ class TestJSONRPCResponseManager(unittest.TestCase):
         response = JSONRPCResponseManager.handle(request.json, self.dispatcher)
         self.assertTrue(isinstance(response, JSONRPC10Response))
 
+    def test_notification_rpc10(self):
+        request = JSONRPC10Request("multiply", [2, 3], is_notification=True)
+        response = JSONRPCResponseManager.handle(request.json, self.dispatcher)
+        self.assertEqual(response, None)
+
+    def test_response_not_validated(self):
+        request = JSONRPC20Request("multiply", [2, 3], _id=0)
+        with patch("jsonrpc.jsonrpc2.JSONRPCError") as error_class:
+            response = JSONRPCResponseManager.handle(
+                request.json, self.dispatcher)
+        self.assertEqual(response.result, 6)
+        self.assertEqual(response._id, 0)
+        self.assertTrue(response.request is not None)
+        self.assertFalse(error_class.called)
+
     def test_parse_error(self):
         req = '{"jsonrpc": "2.0", "method": "foobar, "params": "bar", "baz]'
         response = JSONRPCResponseManager.handle(req, self.dispatcher)
@@ -173,6 +199,95 @@ class TestJSONRPCResponseManager(unittest.TestCase):
         self.assertEqual(
             response.error["data"]['message'], 'TypeError inside method')
 
+    def test_invalid_params_method_not_called(self):
+        calls = []
+
+        @self.dispatcher.add_method
+        def append(value):
+            calls.append(value)
+
+        request = JSONRPC20Request("append", [1, 2], _id=0)
+        response = JSONRPCResponseManager.handle(request.json, self.dispatcher)
+        self.assertEqual(response.error["code"], -32602)
+        self.assertEqual(response.error["data"]["message"],
+                         "append() takes 1 positional arguments but 2 were "
+                         "given")
+        self.assertEqual(calls, [])
+
+    def test_type_error_inside_method_with_params(self):
+        @self.dispatcher.add_method
+        def call(f):
+            return f()
+
+        # Called with valid params, so TypeError is not Invalid params.
+        request = JSONRPC20Request("call", [1], _id=0)
+        response = JSONRPCResponseManager.handle(request.json, self.dispatcher)
+        self.assertEqual(response.error["code"], -32000)
+        self.assertEqual(response.error["data"]["type"], "TypeError")
+
+    def test_method_map_without_plan(self):
+        self.dispatcher.method_map["plain"] = lambda a: a
+        request = JSONRPC20Request("plain", [1], _id=0)
+        response = JSONRPCResponseManager.handle(request.json, self.dispatcher)
+        self.assertEqual(response.result, 1)
+
+        request = JSONRPC20Request("plain", [1, 2], _id=0)
+        response = JSONRPCResponseManager.handle(request.json, self.dispatcher)
+        self.assertEqual(response.error["code"], -32602)
+
+    def test_dict_dispatcher_context(self):
+        request = JSONRPC20Request("multiply", [2, 3], _id=0)
+        response = JSONRPCResponseManager.handle(
+            request.json, {"multiply": lambda a, b: a * b}, context={})
+        self.assertEqual(response.result, 6)
+
+    def test_dispatcher_subclass_getitem(self):
+        class GatedDispatcher(Dispatcher):
+            def __getitem__(self, key):
+                if key == "secret":
+                    raise KeyError(key)
+                return super(GatedDispatcher, self).__getitem__(key)
+
+        dispatcher = GatedDispatcher()
+        dispatcher["secret"] = MagicMock(return_value=1)
+        dispatcher.add_method(lambda a, b: a * b, name="multiply")
+        response = JSONRPCResponseManager.handle(
+            JSONRPC20Request("secret", _id=0).json, dispatcher)
+        self.assertEqual(response.error["code"], -32601)
+        self.assertFalse(dispatcher.method_map["secret"].called)
+
+        # Methods returned by __getitem__ keep their plans.
+        response = JSONRPCResponseManager.handle(
+            JSONRPC20Request("multiply", ["a"], _id=0).json, dispatcher)
+        self.assertEqual(response.error["code"], -32602)
+
+    @unittest.skipIf(sys.version_info < (3, 8), "Test Py3.8+ functionality")
+    def test_positional_only_params(self):
+        namespace = {}
+        exec("def first(a, /, **kw): return a", namespace)
+        self.dispatcher.add_method(namespace["first"])
+        response = JSONRPCResponseManager.handle(
+            JSONRPC20Request("first", {"a": 1}, _id=0).json, self.dispatcher)
+        self.assertEqual(response.error["code"], -32602)
+
+    def test_wrapped_method(self):
+        def with_user(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                return func("alice", *args, **kwargs)
+            return wrapper
+
+        @self.dispatcher.add_method
+        @with_user
+        def greet(user, greeting):
+            return "{0} {1}".format(greeting, user)
+
+        for params in [["hi"], {"greeting": "hi"}]:
+            response = JSONRPCResponseManager.handle(
+                JSONRPC20Request("greet", params, _id=0).json,
+                self.dispatcher)
+            self.assertEqual(response.result, "hi alice")
+
     def test_invalid_params_before_dispatcher_error(self):
         request = JSONRPC20Request(
             "dispatch_error", ["invalid", "params"], _id=0)
@@ -186,3 +301,319 @@ class TestJSONRPCResponseManager(unittest.TestCase):
         response = JSONRPCResponseManager.handle(request.json, self.dispatcher,
                                                  context={})
         self.assertEqual(response.data["result"], 42)
+
+    def test_set_context_arg_for_method(self):
+        self.dispatcher["request_id"] = lambda context: context["request"]._id
+        self.dispatcher.context_arg_for_method["request_id"] = "context"
+        request = JSONRPC20Request("request_id", _id=42)
+        response = JSONRPCResponseManager.handle(request.json, self.dispatcher,
+                                                 context={})
+        self.assertEqual(response.data["result"], 42)
+
+    def test_handle_bytes(self):
+        request = JSONRPC20Request("multiply", [2, 3], _id=0)
+        encoded = request.json.encode("utf-8")
+        for request_bytes in [encoded, bytearray(encoded),
+                              memoryview(encoded)]:
+            response = JSONRPCResponseManager.handle_bytes(
+                request_bytes, self.dispatcher)
+            self.assertTrue(isinstance(response, bytes))
+            self.assertEqual(json.loads(response.decode("utf-8")), {
+                "jsonrpc": "2.0", "result": 6, "id": 0})
+
+    def test_handle_bytes_batch(self):
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("multiply", [2, 3], _id=0),
+            JSONRPC20Request("multiply", [2, 3], is_notification=True),
+            JSONRPC20Request("does_not_exist", _id=1),
+        )
+        response = JSONRPCResponseManager.handle_bytes(
+            request.json.encode("utf-8"), self.dispatcher, codec="orjson")
+        data = json.loads(response.decode("utf-8"))
+        self.assertEqual(len(data), 2)
+        self.assertEqual(data[0]["result"], 6)
+        self.assertEqual(data[1]["error"]["code"], -32601)
+
+    def test_handle_bytes_notification(self):
+        request = JSONRPC20Request("long_time_method", is_notification=True)
+        response = JSONRPCResponseManager.handle_bytes(
+            request.json.encode("utf-8"), self.dispatcher)
+        self.assertEqual(response, b"")
+
+    def test_handle_bytes_parse_error(self):
+        response = JSONRPCResponseManager.handle_bytes(
+            b'{"jsonrpc": "2.0", "method": \xff}', self.dispatcher)
+        data = json.loads(response.decode("utf-8"))
+        self.assertEqual(data["error"]["code"], -32700)
+
+    def test_handle_bytes_raw_json(self):
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("raw", _id=0),
+            JSONRPC20Request("multiply", [2, 3], _id=1),
+        )
+        response = JSONRPCResponseManager.handle_bytes(
+            request.json.encode("utf-8"), self.dispatcher)
+        self.assertEqual(
+            response,
+            b'[{"jsonrpc":"2.0","result":{"cached": true},"id":0},'
+            b'{"jsonrpc": "2.0", "result": 6, "id": 1}]')
+
+    def test_handle_stream(self):
+        request = JSONRPC20BatchRequest(*[
+            JSONRPC20Request("multiply", [i, 2], _id=i) for i in range(100)
+        ] + [JSONRPC20Request("multiply", [1, 2], is_notification=True)])
+        stream = io.BytesIO(request.json.encode("utf-8"))
+        chunks = list(JSONRPCResponseManager.handle_stream(
+            stream, self.dispatcher, chunk_size=512))
+        self.assertTrue(len(chunks) > 1)
+        data = json.loads(b"".join(chunks).decode("utf-8"))
+        self.assertEqual([r["result"] for r in data],
+                         [i * 2 for i in range(100)])
+
+    def test_handle_stream_dispatch_while_reading(self):
+        calls = []
+        self.dispatcher["append"] = calls.append
+        request = JSONRPC20BatchRequest(*[
+            JSONRPC20Request("append", [i], _id=i) for i in range(1000)
+        ])
+        stream = io.BytesIO(request.json.encode("utf-8"))
+        chunks = JSONRPCResponseManager.handle_stream(
+            stream, self.dispatcher, chunk_size=1)
+        next(chunks)
+        self.assertEqual(calls, [0])
+        self.assertTrue(stream.tell() < len(stream.getvalue()))
+
+    def test_handle_stream_invalid_elements(self):
+        stream = io.BytesIO(
+            b'[1, {"jsonrpc": "2.0", "method": "multiply", "params": [2, 3],'
+            b' "id": 1}, {"jsonrpc": "2.0", "method": "rpc.x", "id": 2}]')
+        data = json.loads(b"".join(JSONRPCResponseManager.handle_stream(
+            stream, self.dispatcher)).decode("utf-8"))
+        self.assertEqual(data[0]["error"]["code"], -32600)
+        self.assertEqual(data[1]["result"], 6)
+        self.assertEqual(data[2]["error"]["code"], -32600)
+
+    def test_handle_stream_parse_error(self):
+        stream = io.BytesIO(
+            b'[{"jsonrpc": "2.0", "method": "multiply", "params": [2, 3],'
+            b' "id": 1}, {"jsonrpc": ')
+        data = json.loads(b"".join(JSONRPCResponseManager.handle_stream(
+            stream, self.dispatcher)).decode("utf-8"))
+        self.assertEqual(data[0]["result"], 6)
+        self.assertEqual(data[1]["error"]["code"], -32700)
+
+    def test_handle_stream_invalid_utf8(self):
+        for request_bytes in [b"\xff[1]", b"\xff{}"]:
+            response = b"".join(JSONRPCResponseManager.handle_stream(
+                io.BytesIO(request_bytes), self.dispatcher))
+            self.assertEqual(
+                json.loads(response.decode("utf-8"))["error"]["code"],
+                -32700)
+
+    def test_handle_stream_notifications(self):
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("multiply", [1, 2], is_notification=True))
+        stream = io.BytesIO(request.json.encode("utf-8"))
+        self.assertEqual(list(JSONRPCResponseManager.handle_stream(
+            stream, self.dispatcher)), [])
+
+    def test_handle_stream_empty_batch(self):
+        response = b"".join(JSONRPCResponseManager.handle_stream(
+            io.BytesIO(b"[]"), self.dispatcher))
+        self.assertEqual(
+            json.loads(response.decode("utf-8"))["error"]["code"], -32600)
+
+    def test_handle_stream_single_request(self):
+        request = JSONRPC20Request("multiply", [2, 3], _id=0)
+        stream = io.BytesIO(request.json.encode("utf-8"))
+        response = b"".join(JSONRPCResponseManager.handle_stream(
+            stream, self.dispatcher))
+        self.assertEqual(json.loads(response.decode("utf-8"))["result"], 6)
+
+    def test_handle_bytes_method_not_found(self):
+        request = JSONRPC20Request("does_not_exist", _id=7)
+        response = JSONRPCResponseManager.handle_bytes(
+            request.json.encode("utf-8"), self.dispatcher)
+        self.assertEqual(response, b'{"jsonrpc":"2.0","error":{"code":-32601,'
+                         b'"message":"Method not found"},"id":7}')
+
+    def test_handle_bytes_parse_error_cached(self):
+        response = JSONRPCResponseManager.handle_bytes(b"{", self.dispatcher)
+        self.assertEqual(response, b'{"jsonrpc":"2.0","error":{"code":-32700,'
+                         b'"message":"Parse error"},"id":null}')
+
+    @unittest.skipIf(ThreadPoolExecutor is None, "futures is not installed")
+    def test_batch_max_workers_parallel(self):
+        event = threading.Event()
+        self.dispatcher["wait"] = lambda: event.wait(5)
+        self.dispatcher["release"] = lambda: event.set() or True
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("wait", _id=0),
+            JSONRPC20Request("release", _id=1),
+        )
+        response = JSONRPCResponseManager.handle(
+            request.json, self.dispatcher, max_workers=2)
+        self.assertEqual([r.result for r in response], [True, True])
+
+    @unittest.skipIf(ThreadPoolExecutor is None, "futures is not installed")
+    def test_batch_executor_order_and_errors(self):
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("multiply", [2, 3], _id=0),
+            JSONRPC20Request("long_time_method", is_notification=True),
+            JSONRPC20Request("does_not_exist", _id=1),
+            JSONRPC20Request("multiply", [1], _id=2),
+            JSONRPC20Request("error", _id=3),
+        )
+        pool = ThreadPoolExecutor(4)
+        executor = MagicMock(wraps=pool)
+        try:
+            response = JSONRPCResponseManager.handle(
+                request.json, self.dispatcher, executor=executor)
+        finally:
+            pool.shutdown()
+        self.assertEqual(executor.submit.call_count, 5)
+        self.assertTrue(self.long_time_method.called)
+        response = list(response)
+        self.assertEqual([r._id for r in response], [0, 1, 2, 3])
+        self.assertEqual(response[0].result, 6)
+        self.assertEqual(
+            [r.error["code"] for r in response[1:]], [-32601, -32602, -32000])
+
+    @unittest.skipIf(ThreadPoolExecutor is None, "futures is not installed")
+    def test_batch_executor_context_per_request(self):
+        context = {"user": "admin"}
+        request = JSONRPC20BatchRequest(*[
+            JSONRPC20Request("return_json_rpc_id", _id=i) for i in range(20)
+        ])
+        response = JSONRPCResponseManager.handle(
+            request.json, self.dispatcher, context=context, max_workers=4)
+        self.assertEqual([r.result for r in response], list(range(20)))
+        self.assertEqual(context, {"user": "admin"})
+
+    def test_single_request_executor_inline(self):
+        executor = MagicMock()
+        request = JSONRPC20Request("multiply", [2, 3], _id=0)
+        response = JSONRPCResponseManager.handle(
+            request.json, self.dispatcher, executor=executor)
+        self.assertEqual(response.result, 6)
+        self.assertFalse(executor.submit.called)
+
+    def test_deadline_passed(self):
+        request = JSONRPC20Request("long_time_method", _id=0)
+        response = JSONRPCResponseManager.handle(
+            request.json, self.dispatcher, deadline=time.time() - 1)
+        self.assertEqual(response.error, {
+            "code": -32002, "message": "Request timeout"})
+        self.assertFalse(self.long_time_method.called)
+
+    @unittest.skipIf(ThreadPoolExecutor is None, "futures is not installed")
+    def test_method_timeout(self):
+        event = threading.Event()
+        self.addCleanup(event.set)
+        self.dispatcher.add_method(
+            lambda: event.wait(5), name="slow", timeout=0.01,
+            max_concurrency=1)
+        plan = self.dispatcher.plan_for_method["slow"]
+        self.assertEqual(plan.executor.name, "thread")
+
+        response = JSONRPCResponseManager.handle(
+            JSONRPC20Request("slow", _id=0).json, self.dispatcher)
+        self.assertEqual(response.error["code"], -32002)
+        # Abandoned call keeps its slot until it is finished.
+        self.assertEqual(plan.bulkhead.running, 1)
+        event.set()
+        wait_until = time.time() + 5
+        while plan.bulkhead.running and time.time() < wait_until:
+            time.sleep(0.001)
+        self.assertEqual(plan.bulkhead.running, 0)
+
+    @unittest.skipIf(ThreadPoolExecutor is None, "futures is not installed")
+    def test_method_timeout_error_raised_by_method(self):
+        def timeout():
+            raise FuturesTimeoutError("method timeout")
+
+        self.dispatcher.add_method(timeout, timeout=5)
+        response = JSONRPCResponseManager.handle(
+            JSONRPC20Request("timeout", _id=0).json, self.dispatcher)
+        self.assertEqual(response.error["code"], -32000)
+
+    @unittest.skipIf(ThreadPoolExecutor is None, "futures is not installed")
+    def test_batch_deadline_parallel(self):
+        event = threading.Event()
+        self.addCleanup(event.set)
+        self.dispatcher["slow"] = lambda: event.wait(5)
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("multiply", [2, 3], _id=0),
+            JSONRPC20Request("slow", _id=1),
+        )
+        response = list(JSONRPCResponseManager.handle(
+            request.json, self.dispatcher, max_workers=2,
+            deadline=time.time() + 0.05))
+        self.assertEqual(response[0].result, 6)
+        self.assertEqual(response[1].error["code"], -32002)
+
+    def test_batch_deduplicate(self):
+        def fail(value):
+            raise ValueError(value)
+
+        get = MagicMock(side_effect=lambda user_id: {"id": user_id})
+        self.dispatcher.add_method(get, name="get", idempotent=True)
+        self.dispatcher.add_method(fail, idempotent=True)
+        append = MagicMock(return_value=None)
+        self.dispatcher.add_method(append, name="append")
+
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("get", [1], _id=0),
+            JSONRPC20Request("append", [1], _id=1),
+            JSONRPC20Request("get", {"user_id": 1}, _id=2),
+            JSONRPC20Request("get", [1], is_notification=True),
+            JSONRPC20Request("append", [1], _id=3),
+            JSONRPC20Request("get", [1], _id="a"),
+            JSONRPC20Request("fail", ["x"], _id=4),
+            JSONRPC20Request("fail", ["x"], _id=5),
+        )
+        response = list(JSONRPCResponseManager.handle(
+            request.json, self.dispatcher, deduplicate=True))
+        self.assertEqual(
+            [r._id for r in response], [0, 1, 2, 3, "a", 4, 5])
+        self.assertEqual(
+            [r.result for r in response[:5]],
+            [{"id": 1}, None, {"id": 1}, None, {"id": 1}])
+        self.assertEqual(response[5].error, response[6].error)
+        self.assertEqual(response[6].error["data"]["type"], "ValueError")
+        # Named and positional params are different calls, notification is
+        # executed as usual, not idempotent methods are not deduplicated.
+        self.assertEqual(get.call_count, 3)
+        self.assertEqual(append.call_count, 2)
+
+    def test_batch_deduplicate_parallel(self):
+        get = MagicMock(side_effect=lambda user_id: {"id": user_id})
+        self.dispatcher.add_method(get, name="get", idempotent=True)
+        request = JSONRPC20BatchRequest(*[
+            JSONRPC20Request("get", [i % 2], _id=i) for i in range(6)])
+        response = list(JSONRPCResponseManager.handle(
+            request.json, self.dispatcher, deduplicate=True, max_workers=2))
+        self.assertEqual([r._id for r in response], list(range(6)))
+        self.assertEqual(
+            [r.result["id"] for r in response], [0, 1, 0, 1, 0, 1])
+        self.assertEqual(get.call_count, 2)
+
+    def test_handle_bytes_options(self):
+        get = MagicMock(return_value=1)
+        self.dispatcher.add_method(get, name="get", idempotent=True)
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("get", _id=0), JSONRPC20Request("get", _id=1))
+        response = JSONRPCResponseManager.handle_bytes(
+            request.json.encode("utf-8"), self.dispatcher, deduplicate=True,
+            max_workers=2)
+        self.assertEqual(
+            [r["id"] for r in json.loads(response.decode("utf-8"))], [0, 1])
+        self.assertEqual(get.call_count, 1)
+
+    def test_batch_deduplicate_disabled(self):
+        get = MagicMock(return_value=1)
+        self.dispatcher.add_method(get, name="get", idempotent=True)
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("get", _id=0), JSONRPC20Request("get", _id=1))
+        JSONRPCResponseManager.handle(request.json, self.dispatcher)
+        self.assertEqual(get.call_count, 2)
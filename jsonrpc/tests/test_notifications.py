@@ -0,0 +1,173 @@
+""" Test background execution of notifications."""
+import sys
+import threading
+
+from ..dispatcher import Dispatcher
+from ..jsonrpc2 import JSONRPC20BatchRequest, JSONRPC20Request
+from ..manager import JSONRPCResponseManager
+from ..notifications import NotificationQueue, NotificationQueueFull
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+
+
+class TestNotificationQueue(unittest.TestCase):
+
+    """ Test NotificationQueue functionality."""
+
+    def setUp(self):
+        self.event = threading.Event()
+        self.addCleanup(self.event.set)
+        self.calls = []
+
+    def make_queue(self, **kwargs):
+        notifications = NotificationQueue(**kwargs)
+        self.addCleanup(notifications.shutdown)
+        # Worker is busy until the event is set.
+        notifications.submit(lambda: self.event.wait(5))
+        return notifications
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            NotificationQueue(on_full="ignore")
+        with self.assertRaises(ValueError):
+            NotificationQueue(max_workers=0)
+
+    def test_submit(self):
+        notifications = self.make_queue()
+        notifications.submit(lambda: self.calls.append(1))
+        self.event.set()
+        notifications.join()
+        self.assertEqual(self.calls, [1])
+        self.assertEqual(notifications.stats(), {
+            "submitted": 2, "dropped": 0, "rejected": 0, "queue_size": 0})
+
+    def test_error_is_logged(self):
+        notifications = self.make_queue()
+        notifications.submit(lambda: 1 / 0)
+        notifications.submit(lambda: self.calls.append(1))
+        self.event.set()
+        notifications.join()
+        self.assertEqual(self.calls, [1])
+
+    def test_drop(self):
+        notifications = self.make_queue(max_queue=1, on_full="drop")
+        while notifications.stats()["queue_size"]:
+            self.event.wait(0.001)
+        self.assertTrue(notifications.submit(lambda: self.calls.append(1)))
+        self.assertFalse(notifications.submit(lambda: self.calls.append(2)))
+        self.event.set()
+        notifications.join()
+        self.assertEqual(self.calls, [1])
+        self.assertEqual(notifications.stats()["dropped"], 1)
+
+    def test_reject(self):
+        notifications = self.make_queue(max_queue=1, on_full="reject")
+        while notifications.stats()["queue_size"]:
+            self.event.wait(0.001)
+        notifications.submit(lambda: self.calls.append(1))
+        with self.assertRaises(NotificationQueueFull):
+            notifications.submit(lambda: self.calls.append(2))
+        self.event.set()
+        notifications.join()
+        self.assertEqual(self.calls, [1])
+        self.assertEqual(notifications.stats()["rejected"], 1)
+
+    def test_submit_all_reject(self):
+        notifications = self.make_queue(max_queue=2, on_full="reject")
+        while notifications.stats()["queue_size"]:
+            self.event.wait(0.001)
+        notifications.submit(lambda: self.calls.append(1))
+        with self.assertRaises(NotificationQueueFull):
+            notifications.submit_all([
+                lambda: self.calls.append(2), lambda: self.calls.append(3)])
+        notifications.submit_all([lambda: self.calls.append(4)])
+        self.event.set()
+        notifications.join()
+        self.assertEqual(self.calls, [1, 4])
+        self.assertEqual(notifications.stats()["rejected"], 2)
+
+    def test_submit_all_drop(self):
+        notifications = self.make_queue(max_queue=1, on_full="drop")
+        while notifications.stats()["queue_size"]:
+            self.event.wait(0.001)
+        notifications.submit_all([
+            lambda: self.calls.append(1), lambda: self.calls.append(2)])
+        self.event.set()
+        notifications.join()
+        self.assertEqual(self.calls, [1])
+        self.assertEqual(notifications.stats()["dropped"], 1)
+
+
+class TestManagerNotifications(unittest.TestCase):
+
+    """ Test notifications in JSONRPCResponseManager."""
+
+    def setUp(self):
+        self.event = threading.Event()
+        self.addCleanup(self.event.set)
+        self.calls = []
+        self.dispatcher = Dispatcher()
+        self.dispatcher["wait"] = lambda: self.event.wait(5)
+        self.dispatcher["append"] = self.calls.append
+        self.dispatcher.add_method(
+            lambda value, context: self.calls.append(
+                (value, context["request"].params)),
+            name="context", context_arg="context")
+        self.notifications = NotificationQueue()
+        self.addCleanup(self.notifications.shutdown)
+
+    def test_notifications_are_not_waited_for(self):
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("wait", is_notification=True),
+            JSONRPC20Request("append", [1], is_notification=True),
+        )
+        response = JSONRPCResponseManager.handle(
+            request.json, self.dispatcher, notifications=self.notifications)
+        self.assertEqual(response, None)
+        self.assertEqual(self.calls, [])
+
+        self.event.set()
+        self.notifications.join()
+        self.assertEqual(self.calls, [1])
+
+    def test_batch_with_calls(self):
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("append", [1], is_notification=True),
+            JSONRPC20Request("append", [2], _id=0),
+            JSONRPC20Request("unknown", is_notification=True),
+        )
+        response = JSONRPCResponseManager.handle(
+            request.json, self.dispatcher, notifications=self.notifications)
+        self.notifications.join()
+        self.assertEqual([r._id for r in response], [0])
+        self.assertEqual(sorted(self.calls), [1, 2])
+
+    def test_context_per_notification(self):
+        context = {}
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("context", [1], is_notification=True),
+            JSONRPC20Request("context", [2], is_notification=True),
+        )
+        JSONRPCResponseManager.handle(
+            request.json, self.dispatcher, context=context,
+            notifications=self.notifications)
+        self.notifications.join()
+        self.assertEqual(self.calls, [(1, [1]), (2, [2])])
+        self.assertEqual(context, {})
+
+    def test_rejected_batch_is_not_enqueued(self):
+        notifications = NotificationQueue(max_queue=1, on_full="reject")
+        self.addCleanup(notifications.shutdown)
+        request = JSONRPC20BatchRequest(
+            JSONRPC20Request("append", [1], is_notification=True),
+            JSONRPC20Request("append", [2], is_notification=True),
+            JSONRPC20Request("append", [3], _id=0),
+        )
+        with self.assertRaises(NotificationQueueFull):
+            JSONRPCResponseManager.handle(
+                request.json, self.dispatcher, notifications=notifications)
+        notifications.join()
+        self.assertEqual(self.calls, [])
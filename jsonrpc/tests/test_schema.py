@@ -0,0 +1,150 @@
+""" Test JSON Schema params validation."""
+import sys
+
+from .. import schema
+from ..dispatcher import Dispatcher
+from ..jsonrpc2 import JSONRPC20Request
+from ..manager import JSONRPCResponseManager
+from ..schema import SchemaValidationError, compile_schema
+
+if sys.version_info < (3, 3):
+    from mock import patch
+else:
+    from unittest.mock import patch
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string", "minLength": 1, "pattern": "^[a-z]+$"},
+        "age": {"type": "integer", "minimum": 0, "exclusiveMaximum": 150},
+        "tags": {
+            "type": "array",
+            "items": {"enum": ["a", "b"]},
+            "maxItems": 2,
+        },
+        "score": {"anyOf": [{"type": "number"}, {"type": "null"}]},
+    },
+    "required": ["name"],
+    "additionalProperties": False,
+}
+
+
+class TestCompileSchema(unittest.TestCase):
+
+    """ Test compile_schema with built-in compiler."""
+
+    def setUp(self):
+        patcher = patch.object(schema, "fastjsonschema", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(schema, "_validators", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assertInvalid(self, validate, value, path):
+        with self.assertRaises(SchemaValidationError) as context:
+            validate(value)
+        self.assertEqual(context.exception.path, path)
+        return str(context.exception)
+
+    def test_valid(self):
+        validate = compile_schema(SCHEMA)
+        validate({"name": "a"})
+        validate({"name": "bob", "age": 1, "tags": ["a", "b"],
+                  "score": None})
+        validate({"name": "bob", "score": 0.5})
+
+    def test_invalid(self):
+        validate = compile_schema(SCHEMA)
+        for value, path in [
+                ([], []),
+                ({}, []),
+                ({"name": "a", "extra": 1}, []),
+                ({"name": ""}, ["name"]),
+                ({"name": "Bob"}, ["name"]),
+                ({"name": "a", "age": -1}, ["age"]),
+                ({"name": "a", "age": 150}, ["age"]),
+                ({"name": "a", "age": True}, ["age"]),
+                ({"name": "a", "tags": ["a", "c"]}, ["tags", 1]),
+                ({"name": "a", "tags": ["a", "a", "a"]}, ["tags"]),
+                ({"name": "a", "score": "1"}, ["score"])]:
+            self.assertInvalid(validate, value, path)
+
+    def test_message(self):
+        message = self.assertInvalid(
+            compile_schema(SCHEMA), {"name": "a", "tags": [1]}, ["tags", 0])
+        self.assertEqual(message, 'params.tags[0] must be one of ["a", "b"]')
+
+    def test_positional(self):
+        validate = compile_schema({
+            "type": "array",
+            "items": [{"type": "integer"}, {"type": "string"}],
+            "minItems": 1,
+        })
+        validate([1, "a"])
+        self.assertInvalid(validate, [], [])
+        self.assertInvalid(validate, [1, 2], [1])
+
+    def test_one_of(self):
+        validate = compile_schema({"oneOf": [
+            {"type": "integer"}, {"type": "number", "minimum": 1}]})
+        validate(0)
+        validate(1.5)
+        self.assertInvalid(validate, 2, [])
+
+    def test_not_supported_keyword(self):
+        with self.assertRaises(ValueError):
+            compile_schema({"type": "object", "dependencies": {}})
+
+    def test_cached(self):
+        self.assertTrue(compile_schema(SCHEMA) is compile_schema(SCHEMA))
+
+
+class TestManagerSchema(unittest.TestCase):
+
+    """ Test params validation by JSONRPCResponseManager."""
+
+    def setUp(self):
+        self.calls = []
+        self.dispatcher = Dispatcher()
+
+        @self.dispatcher.add_method(params_schema=SCHEMA)
+        def greet(name, age=None, tags=None, score=None):
+            self.calls.append(name)
+            return "hello " + name
+
+    def handle(self, params):
+        request = JSONRPC20Request("greet", params, _id=0)
+        return JSONRPCResponseManager.handle(request.json, self.dispatcher)
+
+    def test_valid(self):
+        self.assertEqual(self.handle({"name": "bob"}).result, "hello bob")
+
+    def test_invalid(self):
+        response = self.handle({"name": "bob", "age": "old"})
+        self.assertEqual(response.error["code"], -32602)
+        self.assertEqual(response.error["data"]["path"], ["age"])
+        self.assertEqual(response.error["data"]["type"],
+                         "SchemaValidationError")
+        self.assertEqual(self.calls, [])
+
+    def test_omitted_params(self):
+        response = self.handle(None)
+        self.assertEqual(response.error["code"], -32602)
+        self.assertEqual(response.error["data"]["path"], [])
+
+    def test_context_arg_not_validated(self):
+        @self.dispatcher.add_method(
+            params_schema=SCHEMA, context_arg="context")
+        def greet_context(name, context):
+            return context["request"]._id
+
+        request = JSONRPC20Request("greet_context", {"name": "bob"}, _id=5)
+        response = JSONRPCResponseManager.handle(
+            request.json, self.dispatcher, context={})
+        self.assertEqual(response.result, 5)
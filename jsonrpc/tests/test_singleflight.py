@@ -0,0 +1,180 @@
+""" Test coalescing of concurrent identical calls."""
+import sys
+import threading
+
+from ..dispatcher import Dispatcher
+from ..jsonrpc2 import JSONRPC20Request
+from ..manager import JSONRPCResponseManager
+from ..singleflight import SingleFlight, asyncio
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    """ Test SingleFlight functionality."""
+
+    def setUp(self):
+        self.event = threading.Event()
+        self.addCleanup(self.event.set)
+        self.single_flight = SingleFlight()
+        self.calls = []
+
+    def run_threads(self, func, count=3):
+        """ Call func in count threads at the same time, return results
+        or exceptions in order of threads."""
+        results = [None] * count
+
+        def target(i):
+            try:
+                results[i] = self.single_flight.do("key", func, i)
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=target, args=(i,))
+                   for i in range(count)]
+        threads[0].start()
+        while not self.calls:
+            self.event.wait(0.001)
+        for thread in threads[1:]:
+            thread.start()
+        while self.single_flight.stats()["shared"] < count - 1:
+            self.event.wait(0.001)
+
+        self.event.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_do(self):
+        def func(i):
+            self.calls.append(i)
+            self.event.wait(5)
+            return i
+
+        self.assertEqual(self.run_threads(func), [0, 0, 0])
+        self.assertEqual(self.calls, [0])
+        self.assertEqual(self.single_flight.stats(), {
+            "executed": 1, "shared": 2})
+
+        # Calls after the leader is finished are executed again.
+        self.assertEqual(self.single_flight.do("key", func, 3), 3)
+        self.assertEqual(self.calls, [0, 3])
+
+    def test_error(self):
+        def func(i):
+            self.calls.append(i)
+            self.event.wait(5)
+            raise ValueError(i)
+
+        results = self.run_threads(func)
+        self.assertTrue(all(isinstance(e, ValueError) for e in results))
+        self.assertEqual([e.args for e in results], [(0,)] * 3)
+        self.assertEqual(self.calls, [0])
+
+    def test_different_keys(self):
+        self.assertEqual(self.single_flight.do("a", lambda: 1), 1)
+        self.assertEqual(self.single_flight.do("b", lambda: 2), 2)
+        self.assertEqual(self.single_flight.stats()["executed"], 2)
+
+    @unittest.skipIf(asyncio is None, "asyncio is not available")
+    def test_do_async(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        asyncio.set_event_loop(loop)
+        self.addCleanup(asyncio.set_event_loop, None)
+
+        def func(value):
+            self.calls.append(value)
+            return asyncio.sleep(0.01, result=value)
+
+        results = loop.run_until_complete(asyncio.gather(
+            self.single_flight.do_async("key", func, 1),
+            self.single_flight.do_async("key", func, 2),
+            self.single_flight.do_async("other", func, 3),
+        ))
+        self.assertEqual(results, [1, 1, 3])
+        self.assertEqual(self.calls, [1, 3])
+        self.assertEqual(self.single_flight._futures, {})
+
+
+class TestManagerSingleFlight(unittest.TestCase):
+
+    """ Test single flight methods in JSONRPCResponseManager."""
+
+    def setUp(self):
+        self.event = threading.Event()
+        self.addCleanup(self.event.set)
+        self.calls = []
+        self.dispatcher = Dispatcher()
+
+    def handle_concurrently(self, requests):
+        plan = self.dispatcher.plan_for_method[requests[0].method]
+        responses = [None] * len(requests)
+
+        def target(i):
+            responses[i] = JSONRPCResponseManager.handle(
+                requests[i].json, self.dispatcher)
+
+        threads = [threading.Thread(target=target, args=(i,))
+                   for i in range(len(requests))]
+        threads[0].start()
+        while not self.calls:
+            self.event.wait(0.001)
+        for thread in threads[1:]:
+            thread.start()
+        while plan.single_flight.stats()["shared"] < len(requests) - 1:
+            self.event.wait(0.001)
+
+        self.event.set()
+        for thread in threads:
+            thread.join()
+        return responses
+
+    def test_result_is_shared(self):
+        @self.dispatcher.add_method(single_flight=True)
+        def report(day):
+            self.calls.append(day)
+            self.event.wait(5)
+            return {"day": day}
+
+        responses = self.handle_concurrently([
+            JSONRPC20Request("report", [1], _id=i) for i in range(3)])
+        self.assertEqual([r._id for r in responses], [0, 1, 2])
+        self.assertEqual([r.result for r in responses], [{"day": 1}] * 3)
+        self.assertEqual(self.calls, [1])
+
+    def test_error_is_shared(self):
+        @self.dispatcher.add_method(single_flight=True)
+        def report(day):
+            self.calls.append(day)
+            self.event.wait(5)
+            raise ValueError("no report")
+
+        responses = self.handle_concurrently([
+            JSONRPC20Request("report", [1], _id=i) for i in range(3)])
+        self.assertEqual([r._id for r in responses], [0, 1, 2])
+        self.assertEqual([r.error["code"] for r in responses], [-32000] * 3)
+        self.assertEqual(
+            [r.error["data"]["message"] for r in responses],
+            ["no report"] * 3)
+        self.assertEqual(self.calls, [1])
+
+    def test_context_arg_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.dispatcher.add_method(
+                lambda ctx: ctx["user"], name="balance", context_arg="ctx",
+                single_flight=True)
+
+    def test_notification_is_not_coalesced(self):
+        self.dispatcher.add_method(
+            self.calls.append, name="append", single_flight=True)
+        JSONRPCResponseManager.handle(
+            JSONRPC20Request("append", [1], is_notification=True).json,
+            self.dispatcher)
+        self.assertEqual(self.calls, [1])
+        plan = self.dispatcher.plan_for_method["append"]
+        self.assertEqual(plan.single_flight.stats()["executed"], 0)
@@ -0,0 +1,78 @@
+""" Test incremental json reader."""
+import io
+import json
+import sys
+
+from ..stream import JSONArrayStream
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+
+
+class ChunkedStream(object):
+
+    """ Stream returning given chunks, regardless of read size."""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    def read(self, size):
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+class TestJSONArrayStream(unittest.TestCase):
+
+    """ Test JSONArrayStream functionality."""
+
+    def test_elements(self):
+        data = [1, 12345, -1.5e3, "a", u"\u0444", None, True, [], {"a": [1]}]
+        encoded = json.dumps(data).encode("utf-8")
+        for chunk_size in [1, 2, 3, 7, 1024]:
+            for stream in [io.BytesIO(encoded),
+                           io.StringIO(encoded.decode("utf-8"))]:
+                reader = JSONArrayStream(stream, chunk_size=chunk_size)
+                self.assertTrue(reader.is_array)
+                self.assertEqual(list(reader), data)
+
+    def test_whitespaces(self):
+        reader = JSONArrayStream(io.BytesIO(b" \n[ 1 ,\t2\r\n] \n"))
+        self.assertEqual(list(reader), [1, 2])
+
+    def test_empty(self):
+        self.assertEqual(list(JSONArrayStream(io.BytesIO(b"[ ]"))), [])
+
+    def test_lazy(self):
+        stream = io.BytesIO(b"[1, 2, 3, 4]")
+        elements = iter(JSONArrayStream(stream, chunk_size=4))
+        self.assertEqual(next(elements), 1)
+        self.assertTrue(stream.tell() < 12)
+
+    def test_not_array(self):
+        reader = JSONArrayStream(io.BytesIO(b' {"a": 1}'), chunk_size=2)
+        self.assertFalse(reader.is_array)
+        self.assertEqual(reader.read(), u'{"a": 1}')
+
+        with self.assertRaises(ValueError):
+            list(JSONArrayStream(io.BytesIO(b'{"a": 1}')))
+
+    def test_malformed(self):
+        for s in [b"[1, ", b"[1 2]", b"[1,]", b"[1] 2", b"[{]", b"[",
+                  b"[\xff]"]:
+            with self.assertRaises(ValueError):
+                list(JSONArrayStream(io.BytesIO(s), chunk_size=2))
+
+    def test_split_character(self):
+        reader = JSONArrayStream(
+            ChunkedStream([b'["caf', b'\xc3', b'\xa9", 1]']))
+        self.assertTrue(reader.is_array)
+        self.assertEqual(list(reader), [u"caf\xe9", 1])
+
+        encoded = u'["\u0444\u044b\u0432"]'.encode("utf-8")
+        reader = JSONArrayStream(io.BytesIO(encoded), chunk_size=1)
+        self.assertEqual(list(reader), [u"\u0444\u044b\u0432"])
+
+    def test_incomplete_character(self):
+        with self.assertRaises(ValueError):
+            list(JSONArrayStream(ChunkedStream([b'["caf\xc3'])))
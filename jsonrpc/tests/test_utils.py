@@ -1,8 +1,18 @@
 """ Test utility functionality."""
-from ..utils import JSONSerializable, DatetimeDecimalEncoder, is_invalid_params
+from ..utils import (
+    JSONSerializable,
+    DatetimeDecimalEncoder,
+    RawJSON,
+    chain_default,
+    compile_params_checker,
+    datetime_decimal_default,
+    get_datetime_decimal_codec,
+    is_invalid_params,
+)
 
 import datetime
 import decimal
+import functools
 import json
 import sys
 
@@ -48,6 +58,26 @@ class TestJSONSerializable(unittest.TestCase):
             self._class.from_json('[]')
 
 
+class TestRawJSON(unittest.TestCase):
+
+    """ Test RawJSON functionality."""
+
+    def test_encoded(self):
+        self.assertEqual(RawJSON('{"a": 1}').encoded, b'{"a": 1}')
+        self.assertEqual(RawJSON(b'{"a": 1}').encoded, b'{"a": 1}')
+        self.assertEqual(RawJSON(bytearray(b'[1]')).encoded, b'[1]')
+        self.assertEqual(RawJSON(u'"\u0444"').encoded, b'"\xd1\x84"')
+
+    def test_loads(self):
+        self.assertEqual(RawJSON('{"a": [1, null]}').loads(),
+                         {"a": [1, None]})
+
+    def test_equality(self):
+        self.assertEqual(RawJSON("[]"), RawJSON(b"[]"))
+        self.assertNotEqual(RawJSON("[]"), RawJSON("{}"))
+        self.assertNotEqual(RawJSON("[]"), "[]")
+
+
 class TestDatetimeDecimalEncoder(unittest.TestCase):
 
     """ Test DatetimeDecimalEncoder functionality."""
@@ -92,6 +122,30 @@ class TestDatetimeDecimalEncoder(unittest.TestCase):
         self.assertEqual(json_default.call_count, 1)
 
 
+class TestChainDefault(unittest.TestCase):
+
+    """ Test chain_default functionality."""
+
+    def test_chain(self):
+        def set_default(o):
+            if isinstance(o, set):
+                return sorted(o)
+            raise TypeError(o)
+
+        default = chain_default(set_default, datetime_decimal_default)
+        self.assertEqual(default({2, 1}), [1, 2])
+        self.assertEqual(default(decimal.Decimal("0.5")), 0.5)
+        with self.assertRaises(TypeError):
+            default(object())
+
+    def test_get_datetime_decimal_codec(self):
+        codec = get_datetime_decimal_codec()
+        self.assertEqual(
+            codec.loads(codec.dumps(decimal.Decimal("0.5"))), 0.5)
+        with self.assertRaises(TypeError):
+            codec.dumps(object())
+
+
 class TestUtils(unittest.TestCase):
 
     """ Test utils functions."""
@@ -128,3 +182,86 @@ class TestUtils(unittest.TestCase):
                 is_invalid_params(lambda a: None, 0)
 
         assert mock_func.call_count == 1
+
+
+class TestCompileParamsChecker(unittest.TestCase):
+
+    """ Test compile_params_checker functionality."""
+
+    def assertValid(self, func, *args, **kwargs):
+        self.assertEqual(compile_params_checker(func)(args, kwargs), None)
+
+    def assertInvalid(self, func, *args, **kwargs):
+        message = compile_params_checker(func)(args, kwargs)
+        self.assertTrue(message)
+        with self.assertRaises(TypeError):
+            func(*args, **kwargs)
+
+    def test_args(self):
+        self.assertValid(lambda: None)
+        self.assertValid(lambda a, b=0: None, 0)
+        self.assertValid(lambda a, b=0: None, 0, 0)
+        self.assertInvalid(lambda a, b: None, 0)
+        self.assertInvalid(lambda a, b: None, 0, 1, 2)
+
+    def test_kwargs(self):
+        self.assertValid(lambda a, b, c=0: None, 0, b=1)
+        self.assertInvalid(lambda a: None)
+        self.assertInvalid(lambda a: None, a=0, b=1)
+        self.assertInvalid(lambda a: None, 0, a=1)
+
+    def test_var_args(self):
+        self.assertValid(lambda *args: None, 0, 1, 2)
+        self.assertValid(lambda a, **kwargs: None, a=0, b=1)
+        self.assertInvalid(lambda a, *args: None)
+
+    def test_method(self):
+        class A(object):
+            def method(self, a):
+                pass
+
+        self.assertValid(A().method, 0)
+        self.assertInvalid(A().method)
+        self.assertInvalid(A().method, 0, 1)
+
+    def test_message(self):
+        def add(a, b):
+            return a + b
+
+        check = compile_params_checker(add)
+        self.assertEqual(check((0,), {}),
+                         "add() missing required argument: 'b'")
+        self.assertEqual(check((0, 1), {"c": 1}),
+                         "add() got an unexpected keyword argument 'c'")
+
+    @unittest.skipIf(sys.version_info < (3, 8), "Test Py3.8+ functionality")
+    def test_positional_only(self):
+        namespace = {}
+        exec("def f(a, /, b=0, **kw): return a", namespace)
+        check = compile_params_checker(namespace["f"])
+        self.assertIsNone(check((1,), {"a": 2}))
+        self.assertIsNone(check((1,), {"b": 2}))
+        self.assertEqual(
+            check((), {"a": 1}), "f() missing required argument: 'a'")
+
+    def test_wrapped(self):
+        def with_user(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                return func("alice", *args, **kwargs)
+            return wrapper
+
+        @with_user
+        def greet(user, greeting):
+            return "{0} {1}".format(greeting, user)
+
+        check = compile_params_checker(greet)
+        self.assertIsNone(check(("hi",), {}))
+        self.assertIsNone(check((), {"greeting": "hi"}))
+
+    def test_builtin(self):
+        # Signature of some builtins is not available, their TypeError is
+        # inspected after the call.
+        checker = compile_params_checker(dict)
+        if checker is not None:
+            self.assertEqual(checker((), {}), None)
@@ -7,14 +7,18 @@ import json
 import sys
 
 from . import six
+from .codec import dumps, get_codec, loads
 
 
-class JSONSerializable(six.with_metaclass(ABCMeta, object)):
+@six.add_metaclass(ABCMeta)
+class JSONSerializable(object):
 
     """ Common functionality for json serializable objects."""
 
-    serialize = staticmethod(json.dumps)
-    deserialize = staticmethod(json.loads)
+    __slots__ = ()
+
+    serialize = staticmethod(dumps)
+    deserialize = staticmethod(loads)
 
     @abstractmethod
     def json(self):
@@ -30,6 +34,53 @@ class JSONSerializable(six.with_metaclass(ABCMeta, object)):
         return cls(**data)
 
 
+class RawJSON(object):
+
+    """ Already serialized json value.
+
+    Method could return it to avoid parsing and re-serializing json it got
+    from elsewhere (cache, database, other service). Encoded value is spliced
+    into response as is, it is not validated.
+
+    >>> @dispatcher.add_method
+    ... def profile(user_id):
+    ...     return RawJSON(redis.get("profile:{0}".format(user_id)))
+
+    Only method result could be RawJSON, not a value nested into it.
+
+    :param encoded: json document.
+    :type encoded: bytes or str
+
+    .. versionadded: 1.16.0
+
+    """
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, encoded):
+        if isinstance(encoded, six.text_type):
+            encoded = encoded.encode("utf-8")
+        elif not isinstance(encoded, bytes):
+            encoded = bytes(encoded)
+        self.encoded = encoded
+
+    def __repr__(self):
+        return "RawJSON({0!r})".format(self.encoded)
+
+    def __eq__(self, other):
+        return isinstance(other, RawJSON) and self.encoded == other.encoded
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.encoded)
+
+    def loads(self):
+        """ Parse value with default codec."""
+        return loads(self.encoded)
+
+
 class DatetimeDecimalEncoder(json.JSONEncoder):
 
     """ Encoder for datetime and decimal serialization.
@@ -45,13 +96,65 @@ class DatetimeDecimalEncoder(json.JSONEncoder):
         :return str: A JSON encoded string
 
         """
-        if isinstance(o, decimal.Decimal):
-            return float(o)
+        try:
+            return datetime_decimal_default(o)
+        except TypeError:
+            return json.JSONEncoder.default(self, o)
+
+
+def datetime_decimal_default(o):
+    """ Serialize datetime and decimal, codec `default` function.
+
+    Same as :class:`DatetimeDecimalEncoder`, but could be used with any
+    :class:`~jsonrpc.codec.JSONCodec`.
+
+    .. versionadded: 1.16.0
+
+    """
+    if isinstance(o, decimal.Decimal):
+        return float(o)
 
-        if isinstance(o, (datetime.datetime, datetime.date)):
-            return o.isoformat()
+    if isinstance(o, (datetime.datetime, datetime.date)):
+        return o.isoformat()
 
-        return json.JSONEncoder.default(self, o)
+    raise TypeError(
+        "Object of type {0} is not JSON serializable".format(
+            o.__class__.__name__))
+
+
+def chain_default(*defaults):
+    """ Codec `default` function, which tries `defaults` in order.
+
+    Function raising TypeError is skipped, TypeError of the last one is
+    raised.
+
+    .. versionadded: 1.16.0
+
+    """
+    def default(o):
+        for func in defaults[:-1]:
+            try:
+                return func(o)
+            except TypeError:
+                pass
+        return defaults[-1](o)
+
+    return default
+
+
+def get_datetime_decimal_codec(codec=None):
+    """ Codec (see :func:`jsonrpc.codec.get_codec`), which also encodes
+    datetime and decimal values.
+
+    Own default function of the codec is tried first.
+
+    .. versionadded: 1.16.0
+
+    """
+    codec = get_codec(codec)
+    default = datetime_decimal_default if codec.default is None \
+        else chain_default(codec.default, datetime_decimal_default)
+    return codec.with_default(default)
 
 
 def is_invalid_params_py2(func, *args, **kwargs):
@@ -133,3 +236,132 @@ def is_invalid_params(func, *args, **kwargs):
         # In Python 3.0 - 3.2 inspect.getfullargspec is preferred but these
         # versions are almost not supported. Users should consider upgrading.
         return is_invalid_params_py2(func, *args, **kwargs)
+
+
+def _get_parameters_py2(func):
+    """ Parameters of function as (positional names, required positional
+    names, keyword names, required keyword only names, accepts *args,
+    accepts **kwargs), None if function could not be inspected.
+
+    """
+    if not (inspect.isfunction(func) or inspect.ismethod(func)):
+        return None
+
+    funcargs, varargs, varkwargs, defaults = inspect.getargspec(func)
+    if inspect.ismethod(func) and func.__self__ is not None:
+        funcargs = funcargs[1:]
+
+    positional = tuple(funcargs)
+    required = positional[:len(positional) - len(defaults or ())]
+    return (positional, required, positional, (), varargs is not None,
+            varkwargs is not None)
+
+
+def _get_parameters_py3(func):
+    # Decorated function is checked by signature of the wrapper, which is
+    # called, not of the wrapped function: wrapper could inject or change
+    # arguments.
+    try:
+        if sys.version_info >= (3, 5):
+            signature = inspect.signature(func, follow_wrapped=False)
+        elif hasattr(func, "__wrapped__"):
+            return None
+        else:
+            signature = inspect.signature(func)
+        parameters = signature.parameters.values()
+    except (TypeError, ValueError):
+        # Signature of some builtin functions is not available.
+        return None
+
+    positional, required, keyword_only, required_keyword_only = [], [], [], []
+    has_varargs = has_varkwargs = False
+    for parameter in parameters:
+        if parameter.kind in (parameter.POSITIONAL_ONLY,
+                              parameter.POSITIONAL_OR_KEYWORD):
+            positional.append(parameter)
+            if parameter.default is parameter.empty:
+                required.append(parameter.name)
+        elif parameter.kind == parameter.KEYWORD_ONLY:
+            keyword_only.append(parameter.name)
+            if parameter.default is parameter.empty:
+                required_keyword_only.append(parameter.name)
+        elif parameter.kind == parameter.VAR_POSITIONAL:
+            has_varargs = True
+        else:
+            has_varkwargs = True
+
+    return (
+        tuple(p.name for p in positional),
+        tuple(required),
+        tuple(p.name for p in positional
+              if p.kind == p.POSITIONAL_OR_KEYWORD) + tuple(keyword_only),
+        tuple(required_keyword_only),
+        has_varargs,
+        has_varkwargs,
+    )
+
+
+def compile_params_checker(func):
+    """ Build parameters checker for function, once per function.
+
+    Checker takes position and named arguments of a call and returns message
+    describing why function could not be called with them (as python would
+    in TypeError) or None, if arguments are valid. It is used to reject
+    invalid params before calling the method, so TypeError raised inside the
+    method is not mistaken for invalid params and the function signature is
+    not inspected on every call.
+
+    :param callable func: method to check params for.
+    :return function: (tuple args, dict kwargs) -> str or None; None if
+        function signature is not available (builtins), then it is not
+        possible to check params in advance.
+
+    .. versionadded: 1.16.0
+
+    """
+    if sys.version_info >= (3, 3):
+        parameters = _get_parameters_py3(func)
+    else:
+        parameters = _get_parameters_py2(func)
+
+    if parameters is None:
+        return None
+
+    positional, required, keyword, required_keyword, has_varargs, \
+        has_varkwargs = parameters
+    name = getattr(func, "__name__", func.__class__.__name__)
+    keyword = frozenset(keyword)
+    # Positional-only params given by name go to **kwargs, if any.
+    positional_only = frozenset(positional) - keyword
+    positional_count = len(positional)
+    required_count = len(required)
+
+    def check(args, kwargs):
+        args_count = len(args)
+        if args_count > positional_count and not has_varargs:
+            return "{0}() takes {1} positional arguments but {2} were " \
+                "given".format(name, positional_count, args_count)
+
+        if kwargs:
+            if not has_varkwargs:
+                for key in kwargs:
+                    if key not in keyword:
+                        return "{0}() got an unexpected keyword argument " \
+                            "'{1}'".format(name, key)
+
+            for key in positional[:args_count]:
+                if key in kwargs and key in keyword:
+                    return "{0}() got multiple values for argument " \
+                        "'{1}'".format(name, key)
+
+        for key in required[args_count:required_count]:
+            if key not in kwargs or key in positional_only:
+                return "{0}() missing required argument: '{1}'".format(
+                    name, key)
+
+        for key in required_keyword:
+            if key not in kwargs:
+                return "{0}() missing required keyword-only argument: " \
+                    "'{1}'".format(name, key)
+
+    return check